@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""
+Bake the template and report the time spent on each template file and each hook.
+
+Used by the ``profile`` make target, and by the ``bake_profiler`` test fixture.  While a
+``BakeProfiler`` is active, cookiecutter's per-file and per-hook functions are wrapped with
+timers, so every bake made in this process is profiled.  Each file's time is split into binary
+detection, Jinja compilation, and rendering (which includes writing the output); each hook's
+into rendering its script and running it.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, OrderedDict, defaultdict
+
+import cookiecutter.generate
+import cookiecutter.hooks
+from cookiecutter.main import cookiecutter as bake
+
+FILE_PHASES = ('binary', 'compile', 'render')
+HOOK_PHASES = ('render', 'run')
+
+
+class BakeProfiler:
+    """
+    Time the rendering of every template file and the running of every hook, within a with-statement.
+    """
+
+    def __init__(self):
+        """
+        Start with empty timings.
+        """
+        # Seconds spent in each phase, keyed by template file path (relative to the project template).
+        self.files = defaultdict(Counter)
+        # Seconds spent in each phase, keyed by hook name.
+        self.hooks = defaultdict(Counter)
+        self._finished_time = 0.0
+        self._current = None
+        self._originals = {}
+        self._started = None
+
+    def __enter__(self):
+        """
+        Wrap cookiecutter's functions with timers.
+        """
+        self._patch(cookiecutter.generate, 'generate_file', self._timed_generate_file)
+        self._patch(cookiecutter.generate, 'is_binary', self._timed_is_binary)
+        self._patch(cookiecutter.hooks, 'run_script_with_context', self._timed_run_script_with_context)
+        self._patch(cookiecutter.hooks, 'run_script', self._timed_run_script)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Restore cookiecutter's functions.
+        """
+        self._finished_time = self.total
+        self._started = None
+        for (module, name), original in self._originals.items():
+            setattr(module, name, original)
+        self._originals.clear()
+        return False
+
+    @property
+    def total(self):
+        """
+        Get the number of seconds spent within the with-statement so far.
+        """
+        if self._started is None:
+            return self._finished_time
+        return self._finished_time + time.perf_counter() - self._started
+
+    def _patch(self, module, name, replacement):
+        """
+        Replace a module attribute until the with-statement ends.
+        """
+        self._originals[(module, name)] = getattr(module, name)
+        setattr(module, name, replacement)
+
+    def _original(self, module, name):
+        """
+        Get the function which a timer wraps.
+        """
+        return self._originals[(module, name)]
+
+    def _timed_generate_file(self, project_dir, infile, context, env, *args, **kwargs):
+        """
+        Time ``generate_file``, attributing the time not spent in the other phases to rendering.
+        """
+        timings = self.files[os.path.normpath(infile)]
+        spent_before = sum(timings.values())
+        get_template = env.get_template
+
+        def timed_get_template(*template_args, **template_kwargs):
+            start = time.perf_counter()
+            try:
+                return get_template(*template_args, **template_kwargs)
+            finally:
+                timings['compile'] += time.perf_counter() - start
+
+        self._current = timings
+        env.get_template = timed_get_template
+        start = time.perf_counter()
+        try:
+            return self._original(cookiecutter.generate, 'generate_file')(
+                project_dir, infile, context, env, *args, **kwargs
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            del env.get_template
+            self._current = None
+            timings['render'] += elapsed - (sum(timings.values()) - spent_before)
+
+    def _timed_is_binary(self, path):
+        """
+        Time the binary file detection of the file being generated.
+        """
+        start = time.perf_counter()
+        try:
+            return self._original(cookiecutter.generate, 'is_binary')(path)
+        finally:
+            if self._current is not None:
+                self._current['binary'] += time.perf_counter() - start
+
+    def _timed_run_script_with_context(self, script_path, *args, **kwargs):
+        """
+        Time a hook, attributing the time not spent running its script to rendering it.
+        """
+        timings = self.hooks[os.path.splitext(os.path.basename(script_path))[0]]
+        spent_before = sum(timings.values())
+        self._current = timings
+        start = time.perf_counter()
+        try:
+            return self._original(cookiecutter.hooks, 'run_script_with_context')(script_path, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._current = None
+            timings['render'] += elapsed - (sum(timings.values()) - spent_before)
+
+    def _timed_run_script(self, *args, **kwargs):
+        """
+        Time the running of a rendered hook script.
+        """
+        start = time.perf_counter()
+        try:
+            return self._original(cookiecutter.hooks, 'run_script')(*args, **kwargs)
+        finally:
+            if self._current is not None:
+                self._current['run'] += time.perf_counter() - start
+
+    def report(self):
+        """
+        Get the timings as a dict which can be serialized as JSON.
+
+        Returns:
+            dict: the ``total`` seconds, and the seconds spent in each phase of each of the
+            ``files`` and ``hooks``, slowest first.
+
+        """
+        def phases(timings, names):
+            result = OrderedDict((name, timings[name]) for name in names)
+            result['total'] = sum(result.values())
+            return result
+
+        def slowest_first(items, names):
+            rows = [(name, phases(timings, names)) for name, timings in items.items()]
+            return OrderedDict(sorted(rows, key=lambda row: -row[1]['total']))
+
+        return OrderedDict([
+            ('total', self.total),
+            ('files', slowest_first(self.files, FILE_PHASES)),
+            ('hooks', slowest_first(self.hooks, HOOK_PHASES)),
+        ])
+
+    def collapsed_stacks(self):
+        """
+        Get the timings in the collapsed stack format read by flame graph tools such as ``flamegraph.pl``.
+
+        Returns:
+            list: lines of semicolon-separated frames followed by a count of microseconds.
+
+        """
+        lines = []
+        accounted = 0.0
+        for kind, items, names in (('files', self.files, FILE_PHASES), ('hooks', self.hooks, HOOK_PHASES)):
+            for name, timings in sorted(items.items()):
+                for phase in names:
+                    if timings[phase] > 0:
+                        lines.append('bake;{};{};{} {}'.format(kind, name, phase, int(timings[phase] * 1e6)))
+                        accounted += timings[phase]
+        lines.append('bake {}'.format(int(max(self.total - accounted, 0.0) * 1e6)))
+        return lines
+
+
+def main(argv=None):
+    """
+    Bake the template once with a profiler, and report the slowest files and hooks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('template', nargs='?', default='.', help='the cookiecutter template directory')
+    parser.add_argument('extra_context', nargs='*', metavar='option=value', help='options to use instead of defaults')
+    parser.add_argument('--json', help='write the full report to this JSON file')
+    parser.add_argument('--flame', help='write collapsed stacks for a flame graph to this file')
+    parser.add_argument('--top', type=int, default=10, help='the number of slowest files to print')
+    args = parser.parse_args(argv)
+
+    extra_context = dict(option.split('=', 1) for option in args.extra_context)
+    output_dir = tempfile.mkdtemp()
+    try:
+        with BakeProfiler() as profiler:
+            bake(args.template, no_input=True, extra_context=extra_context, output_dir=output_dir)
+    finally:
+        shutil.rmtree(output_dir)
+
+    report = profiler.report()
+    print('{:<70} {:>10}'.format('Baked in', '{:.1f} ms'.format(report['total'] * 1000)))
+    rows = list(report['hooks'].items()) + list(report['files'].items())[:args.top]
+    for name, timings in rows:
+        print('{:<70} {:>10}'.format(name, '{:.1f} ms'.format(timings['total'] * 1000)))
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(report, output, indent=2)
+    if args.flame:
+        with open(args.flame, 'w') as output:
+            output.write('\n'.join(profiler.collapsed_stacks()) + '\n')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
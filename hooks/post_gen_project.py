@@ -0,0 +1,73 @@
+"""Post-generation cookiecutter hook for removing the files of unselected options, and splitting up bundles."""
+
+import os
+import re
+
+MODELS = '{{ cookiecutter.models }}' != 'Comma-separated list of models'
+ASYNC_VIEWS = MODELS and '{{ cookiecutter.model_api }}' == 'yes' and '{{ cookiecutter.async_views }}' == 'yes'
+
+# Files which are only generated when an option is selected, and whether to keep them.  A list, so
+# that they are removed in order: those of a directory before its parent, which is then removed if empty.
+OPTIONAL_FILES = [
+    ('{{ cookiecutter.app_name }}/cache.py', MODELS and '{{ cookiecutter.model_cache }}' == 'yes'),
+    ('tests/test_cache.py', MODELS and '{{ cookiecutter.model_cache }}' == 'yes'),
+    ('{{ cookiecutter.app_name }}/views.py', MODELS and '{{ cookiecutter.model_api }}' == 'yes'),
+    ('tests/test_views.py', MODELS and '{{ cookiecutter.model_api }}' == 'yes'),
+    ('{{ cookiecutter.app_name }}/async_views.py', ASYNC_VIEWS),
+    ('tests/test_async_views.py', ASYNC_VIEWS),
+    ('benchmarks/asgi.py', ASYNC_VIEWS),
+    ('{{ cookiecutter.app_name }}/write_buffer.py', MODELS and '{{ cookiecutter.write_buffer }}' == 'yes'),
+    ('tests/test_write_buffer.py', MODELS and '{{ cookiecutter.write_buffer }}' == 'yes'),
+    ('{{ cookiecutter.app_name }}/routers.py', MODELS and '{{ cookiecutter.read_replicas }}' == 'yes'),
+    ('tests/test_routers.py', MODELS and '{{ cookiecutter.read_replicas }}' == 'yes'),
+    ('{{ cookiecutter.app_name }}/summaries.py', MODELS and '{{ cookiecutter.daily_summaries }}' == 'yes'),
+    ('{{ cookiecutter.app_name }}/management/commands/{{ cookiecutter.app_name }}_rebuild_summaries.py',
+        MODELS and '{{ cookiecutter.daily_summaries }}' == 'yes'),
+    ('tests/test_summaries.py', MODELS and '{{ cookiecutter.daily_summaries }}' == 'yes'),
+    ('{{ cookiecutter.app_name }}/bulk_transfer.py', MODELS),
+    ('{{ cookiecutter.app_name }}/management/commands/{{ cookiecutter.app_name }}_export.py', MODELS),
+    ('{{ cookiecutter.app_name }}/management/commands/{{ cookiecutter.app_name }}_import.py', MODELS),
+    ('{{ cookiecutter.app_name }}/management/commands/__init__.py', MODELS),
+    ('{{ cookiecutter.app_name }}/management/__init__.py', MODELS),
+    ('tests/test_bulk_transfer.py', MODELS),
+    ('{{ cookiecutter.app_name }}/templates/{{ cookiecutter.app_name }}/index.html', MODELS),
+    ('tests/test_templates.py', MODELS),
+    ('{{ cookiecutter.app_name }}/migrations/0001_initial.py', MODELS),
+    ('{{ cookiecutter.app_name }}/migrations/__init__.py', MODELS),
+]
+
+# Files which may be rendered as a bundle of several modules, for a layout which depends on the
+# options (e.g. one module per model), since a template file can only render one output file.
+BUNDLES = [
+    '{{ cookiecutter.app_name }}/models.py',
+    'tests/test_models.py',
+]
+
+# Starts each module of a bundle, giving its path relative to the bundle's directory.
+BUNDLE_MARKER = re.compile(r'^# file: (\S+)\n', re.MULTILINE)
+
+
+def split_bundle(bundle_path):
+    """
+    Replace a file rendered as a bundle with the modules marked in it; other files are left alone.
+    """
+    with open(bundle_path) as bundle:
+        parts = BUNDLE_MARKER.split(bundle.read())
+    if len(parts) == 1:
+        return
+    os.remove(bundle_path)
+    for name, content in zip(parts[1::2], parts[2::2]):
+        module = os.path.join(os.path.dirname(bundle_path), name)
+        os.makedirs(os.path.dirname(module), exist_ok=True)
+        with open(module, 'w') as output:
+            output.write(content)
+
+
+for path, keep in OPTIONAL_FILES:
+    if not keep:
+        os.remove(path)
+        if not os.listdir(os.path.dirname(path)):
+            os.rmdir(os.path.dirname(path))
+
+for path in BUNDLES:
+    split_bundle(path)
@@ -1,5 +1,6 @@
-"""Pre-generation cookiecutter hook for validation of the app_name parameter."""
+"""Pre-generation cookiecutter hook for validation of the app_name and models parameters."""
 
+import keyword
 import logging
 import re
 import sys
@@ -12,6 +13,55 @@ APP_REGEX = r'^[_a-zA-Z][_a-zA-Z0-9]+$'
 
 APP_NAME = '{{cookiecutter.app_name}}'
 
+MODEL_REGEX = r'^[A-Z][_a-zA-Z0-9]*$'
+
+# A field of a model, like "name=str", with "!idx" at the end if it gets an index.
+FIELD_REGEX = r'^([a-z][_a-z0-9]*)=(bool|date|datetime|float|int|str|text)(!idx)?$'
+
+# Fields which every generated model has already.
+RESERVED_FIELDS = ('id', 'created', 'modified', 'objects')
+
+MODELS = '{{cookiecutter.models}}'
+
+
+def models_errors(spec):
+    """
+    Get the problems with a models option like "ChocolateChip:name=str!idx,price=int,Scoop".
+
+    Each comma-separated item is a model, a model and its first field after a colon, or another
+    field of the last model.
+    """
+    errors = []
+    fields = {}
+    model = None
+    for item in spec.replace(' ', '').split(','):
+        name, _, field = item.rpartition(':') if ':' in item else ('', '', item)
+        if name or '=' not in field:
+            model = name or field
+            if not re.match(MODEL_REGEX, model):
+                errors.append('Invalid model name "{}"'.format(model))
+            fields[model] = {}
+            if not name:
+                continue
+        match = re.match(FIELD_REGEX, field)
+        if model is None or not match:
+            errors.append('Invalid field "{}"; fields are like "name=str" or "name=str!idx", and follow a model'.format(
+                field))
+            continue
+        if keyword.iskeyword(match.group(1)):
+            errors.append('Field "{}" of {} is a Python keyword'.format(match.group(1), model))
+        if match.group(1) in RESERVED_FIELDS or match.group(1) in fields[model]:
+            errors.append('Field "{}" of {} is already defined'.format(match.group(1), model))
+        fields[model][match.group(1)] = match.group(2)
+    return errors
+
+
 if not re.match(APP_REGEX, APP_NAME):
     logger.error('Invalid value for app_name "{}"'.format(APP_NAME))
     sys.exit(1)
+
+MODELS_ERRORS = models_errors(MODELS) if MODELS != 'Comma-separated list of models' else []
+for error in MODELS_ERRORS:
+    logger.error(error)
+if MODELS_ERRORS:
+    sys.exit(1)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python
+"""
+Incrementally re-render the baked project while the template is being edited.
+
+Used by the ``watch`` and ``replay`` make targets.  The Jinja environment and the cookiecutter
+context are kept in memory between saves, only the changed template files are re-rendered
+(every file is re-rendered when ``cookiecutter.json`` changes, since any path or content may
+depend on the context), and only outputs whose contents differ are written.
+"""
+
+import argparse
+import fnmatch
+import logging
+import os
+import shutil
+import sys
+import time
+from collections import OrderedDict
+
+from binaryornot.check import is_binary
+from cookiecutter.config import get_user_config
+from cookiecutter.environment import StrictEnvironment
+from cookiecutter.generate import generate_context
+from cookiecutter.hooks import run_hook
+from cookiecutter.prompt import prompt_for_config
+from cookiecutter.replay import load
+from cookiecutter.utils import work_in
+from jinja2 import FileSystemLoader
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+logger = logging.getLogger('rerender')  # pylint: disable=invalid-name
+
+# How long to wait for more changes before re-rendering, in seconds; editors often write several files per save.
+SETTLE_TIME = 0.1
+
+
+def load_context(template_dir, replay=False):
+    """
+    Get the cookiecutter context the same way ``cookiecutter --no-input`` or ``cookiecutter --replay`` would.
+
+    Args:
+        template_dir (str): the directory holding ``cookiecutter.json``.
+        replay (bool): use the context of the last bake instead of the defaults.
+
+    Returns:
+        dict: the context, with the options under the ``cookiecutter`` key.
+
+    """
+    config = get_user_config()
+    if replay:
+        return load(config['replay_dir'], os.path.basename(template_dir))
+    context = generate_context(
+        context_file=os.path.join(template_dir, 'cookiecutter.json'),
+        default_context=config['default_context'],
+    )
+    context['cookiecutter'] = prompt_for_config(context, no_input=True)
+    return context
+
+
+def find_project_template(template_dir):
+    """
+    Find the templated project directory (the one named like ``{{cookiecutter.repo_name}}``).
+    """
+    for name in sorted(os.listdir(template_dir)):
+        if 'cookiecutter' in name and '{{' in name and '}}' in name:
+            return os.path.join(template_dir, name)
+    raise ValueError('No project template found in {}'.format(template_dir))
+
+
+class IncrementalRenderer:
+    """
+    Render a cookiecutter project template file by file, remembering what has been written.
+    """
+
+    def __init__(self, template_dir, context, output_dir='.'):
+        """
+        Create the Jinja environment which is reused for every render.
+
+        Args:
+            template_dir (str): the cookiecutter template, containing ``cookiecutter.json``.
+            context (dict): the cookiecutter context to render with.
+            output_dir (str): the directory the project is baked into.
+
+        """
+        self.template_dir = os.path.abspath(template_dir)
+        self.project_template = find_project_template(self.template_dir)
+        self.output_dir = os.path.abspath(output_dir)
+        self.context = context
+        self.env = StrictEnvironment(context=context, keep_trailing_newline=True)
+        # Compiled templates are cached by the loader and only recompiled when their source changes.
+        self.env.loader = FileSystemLoader(self.project_template)
+        # Maps each template file path (relative to the template directory) to its output path.
+        self.outputs = OrderedDict()
+        # Template files whose outputs the post-generation hook removed (their option isn't selected) or split up.
+        self.removed_by_hook = set()
+
+    def render_string(self, text):
+        """
+        Render a template string, such as a path, with the current context.
+        """
+        return self.env.from_string(text).render(**self.context)
+
+    def template_files(self):
+        """
+        List every file of the project template, relative to the project template's parent.
+        """
+        found = []
+        for dirpath, dirnames, filenames in os.walk(self.project_template):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                found.append(os.path.relpath(os.path.join(dirpath, filename), self.template_dir))
+        return found
+
+    def copy_without_render(self, relpath):
+        """
+        Check whether a template file is listed in the context's ``_copy_without_render`` patterns.
+        """
+        inner = os.path.relpath(relpath, os.path.basename(self.project_template))
+        patterns = self.context['cookiecutter'].get('_copy_without_render', [])
+        return any(fnmatch.fnmatch(inner, pattern) for pattern in patterns)
+
+    def render_file(self, relpath):
+        """
+        Render one template file, writing the output only if it changed.
+
+        Args:
+            relpath (str): the template file path, relative to the template directory.
+
+        Returns:
+            bool: True if the output file was written.
+
+        """
+        if relpath in self.removed_by_hook:
+            return False
+        source = os.path.join(self.template_dir, relpath)
+        output = os.path.join(self.output_dir, self.render_string(relpath))
+        previous = self.outputs.get(relpath)
+        if previous is not None and previous != output:
+            self.remove_output(previous)
+        self.outputs[relpath] = output
+
+        if is_binary(source) or self.copy_without_render(relpath):
+            with open(source, 'rb') as template_file:
+                data = template_file.read()
+        else:
+            inner = os.path.relpath(source, self.project_template).replace(os.path.sep, '/')
+            rendered = self.env.get_template(inner).render(**self.context)
+            with open(source, encoding='utf-8') as template_file:
+                template_file.readline()
+                newlines = template_file.newlines
+            newline = newlines[0] if isinstance(newlines, tuple) else newlines or '\n'
+            data = rendered.replace('\n', newline).encode('utf-8')
+
+        if os.path.exists(output):
+            with open(output, 'rb') as output_file:
+                if output_file.read() == data:
+                    return False
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        with open(output, 'wb') as output_file:
+            output_file.write(data)
+        shutil.copymode(source, output)
+        logger.info('Rendered %s', os.path.relpath(output, self.output_dir))
+        return True
+
+    def remove_output(self, output):
+        """
+        Remove an output file which no longer corresponds to a template file.
+        """
+        if os.path.exists(output):
+            os.remove(output)
+            logger.info('Removed %s', os.path.relpath(output, self.output_dir))
+
+    def run_post_gen_hook(self):
+        """
+        Run the template's post-generation hook, and remember which outputs it removed.
+        """
+        project_dir = os.path.join(self.output_dir, self.render_string(os.path.basename(self.project_template)))
+        with work_in(self.template_dir):
+            run_hook('post_gen_project', project_dir, self.context)
+        self.removed_by_hook = {relpath for relpath, output in self.outputs.items() if not os.path.exists(output)}
+
+    def render_all(self):
+        """
+        Render every template file, and remove outputs of template files which are gone.
+
+        The post-generation hook is run afterwards, since the context may have changed which
+        optional files it removes.
+
+        Returns:
+            int: the number of output files written.
+
+        """
+        current = self.template_files()
+        for relpath in set(self.outputs) - set(current):
+            self.remove_output(self.outputs.pop(relpath))
+        self.removed_by_hook = set()
+        written = sum(self.render_file(relpath) for relpath in current)
+        self.run_post_gen_hook()
+        return written - len(self.removed_by_hook)
+
+    def watches(self, path):
+        """
+        Check whether a changed file affects the rendered project.
+        """
+        relpath = os.path.relpath(path, self.template_dir)
+        return relpath == 'cookiecutter.json' or relpath.startswith(os.path.basename(self.project_template) + os.sep)
+
+    def update(self, paths):
+        """
+        Re-render after the given files under the template directory changed.
+
+        Args:
+            paths (iterable): absolute paths of changed, created, or deleted files.
+
+        Returns:
+            int: the number of output files written.
+
+        """
+        written = 0
+        for path in sorted(set(paths)):
+            relpath = os.path.relpath(path, self.template_dir)
+            if relpath == 'cookiecutter.json':
+                return self.render_all()
+            if not self.watches(path):
+                continue
+            if relpath in self.removed_by_hook:
+                # The hook removed or split up the output, so it has to run again over a full render.
+                return self.render_all()
+            if os.path.isfile(path):
+                written += self.render_file(relpath)
+            elif relpath in self.outputs:
+                self.remove_output(self.outputs.pop(relpath))
+        return written
+
+
+class ChangeCollector(FileSystemEventHandler):
+    """
+    Collect the paths touched by file system events until they are handled.
+    """
+
+    def __init__(self):
+        """
+        Start with no changes.
+        """
+        super().__init__()
+        self.changed = set()
+        self.last_change = 0
+
+    def on_any_event(self, event):
+        """
+        Record the paths of a file event.
+        """
+        if event.is_directory or event.event_type not in ('created', 'deleted', 'modified', 'moved'):
+            return
+        self.changed.add(event.src_path)
+        if getattr(event, 'dest_path', None):
+            self.changed.add(event.dest_path)
+        self.last_change = time.time()
+
+    def take(self):
+        """
+        Return and forget the changed paths, once no change has happened for ``SETTLE_TIME``.
+        """
+        if not self.changed or time.time() - self.last_change < SETTLE_TIME:
+            return set()
+        changed, self.changed = self.changed, set()
+        return changed
+
+
+def watch(renderer, reload_context=None):
+    """
+    Re-render whenever template files change, until interrupted.
+
+    Args:
+        renderer (IncrementalRenderer): the renderer holding the already baked project.
+        reload_context (callable): returns a fresh context after ``cookiecutter.json`` changes.
+
+    """
+    collector = ChangeCollector()
+    observer = Observer()
+    # The project is usually baked inside the template directory, so only watch the template's own files.
+    observer.schedule(collector, renderer.project_template, recursive=True)
+    observer.schedule(collector, renderer.template_dir, recursive=False)
+    observer.start()
+    try:
+        while True:
+            time.sleep(SETTLE_TIME / 2)
+            changed = {path for path in collector.take() if renderer.watches(path)}
+            if not changed:
+                continue
+            started = time.time()
+            if reload_context and os.path.join(renderer.template_dir, 'cookiecutter.json') in changed:
+                renderer.context = reload_context()
+            written = renderer.update(changed)
+            logger.info('Wrote %d file(s) in %.1f ms', written, (time.time() - started) * 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def main(argv=None):
+    """
+    Render the template once and then keep it up to date.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('template', nargs='?', default='.', help='the cookiecutter template directory')
+    parser.add_argument('--output-dir', default='.', help='the directory to bake the project into')
+    parser.add_argument('--no-input', action='store_true', help='use the default options (the default)')
+    parser.add_argument('--replay', action='store_true', help='use the options of the last cookiecutter run')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    template_dir = os.path.abspath(args.template)
+
+    def reload_context():
+        return load_context(template_dir, replay=args.replay)
+
+    renderer = IncrementalRenderer(template_dir, reload_context(), args.output_dir)
+    renderer.render_all()
+    watch(renderer, None if args.replay else reload_context)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
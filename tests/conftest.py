@@ -1,48 +1,143 @@
 """Pytest fixtures."""
 
+import itertools
+import json
+import os
+from pathlib import Path
+
 import pytest
-import sh
-
-from .helpers import bake_in_temp_dir
-
-common = {
-    "app_name": "cookie_lover",
-    "repo_name": "cookie_repo",
-}
-
-configurations = [
-    pytest.param(
-        {
-            **common,
-        },
-        id="no models"
-    ),
-    pytest.param(
-        {
-            **common,
-            "models": "ChocolateChip,Zimsterne",
-        },
-        id="two models"
-    ),
+
+from bake_profiler import BakeProfiler
+
+from .helpers import bake_all, environment, inside_dir, upgrade_requirements
+
+COOKIECUTTER_JSON = Path(__file__).resolve().parent.parent / 'cookiecutter.json'
+
+# Each option axis of the bake matrix maps a fragment of the test id to the options it sets.
+MODEL_OPTIONS = [
+    ("no models", {}),
+    ("two models", {"models": "ChocolateChip,Zimsterne"}),
+    ("spaced models", {"models": " ChocolateChip , Zimsterne "}),
+]
+
+NAME_OPTIONS = [
+    ("cookie_lover", {"app_name": "cookie_lover", "repo_name": "cookie_repo"}),
+    ("cookie_jar2", {"app_name": "cookie_jar2", "repo_name": "edx-cookie-jar2"}),
 ]
 
 
+def feature_options(spec):
+    """
+    Get the option axis which bakes either with the defaults or with every optional feature turned on.
+
+    Optional features are the "no"/"yes" choices in cookiecutter.json.
+    """
+    features = {name: "yes" for name, choices in spec.items() if choices == ["no", "yes"]}
+    return [("default features", {}), ("all features", features)]
+
+
+def bake_matrix():
+    """
+    Generate the configurations to bake: every combination of license, models, names, and features.
+
+    The license and feature choices come from cookiecutter.json, so new choices are covered automatically.
+    """
+    spec = json.loads(COOKIECUTTER_JSON.read_text())
+    for license_name, (models_id, models), (names_id, names), (features_id, features) in itertools.product(
+            spec["open_source_license"], MODEL_OPTIONS, NAME_OPTIONS, feature_options(spec)):
+        yield pytest.param(
+            dict(open_source_license=license_name, **models, **names, **features),
+            id="-".join([license_name, models_id, names_id, features_id]),
+        )
+
+
+configurations = list(bake_matrix())
+
+
+def configuration_key(options):
+    """
+    Get a hashable key for a configuration's options dict.
+    """
+    return json.dumps(options, sort_keys=True)
+
+
+@pytest.fixture
+def bake_profiler():
+    """
+    Profile every bake made in this process during the test.
+
+    Provides the ``BakeProfiler``, whose ``report()`` has the time spent on each template file
+    and hook; bake with ``bake_in_temp_dir`` or ``bake``, not ``bake_all``.
+    """
+    with BakeProfiler() as profiler:
+        yield profiler
+
+
+@pytest.fixture(scope="session")
+def baked_matrix(request, tmp_path_factory):
+    """
+    Bake every configuration up front, in parallel.
+
+    Provides a dict of ``(project, tree_hash)`` results keyed by ``configuration_key``.
+    """
+    template = os.path.abspath(request.config.option.template)
+    contexts = [param.values[0] for param in configurations]
+    results = bake_all(template, str(tmp_path_factory.mktemp("matrix")), contexts)
+    return {configuration_key(context): result for context, result in zip(contexts, results)}
+
+
 @pytest.fixture(params=configurations, scope="session")
-def options_baked(cookies_session, request):
+def options_baked(baked_matrix, request):  # pylint: disable=redefined-outer-name
     """
     Bake a cookie cutter, parameterized by configurations.
 
     Provides the configuration dict, and changes into the directory with the
     baked result.
     """
-    with bake_in_temp_dir(cookies_session, extra_context=request.param):
+    project, _digest = baked_matrix[configuration_key(request.param)]
+    with inside_dir(project):
         yield request.param
 
 
 @pytest.fixture(scope="session")
-def options_upgraded(options_baked):  # pylint: disable=redefined-outer-name
+def options_unique(options_baked, baked_matrix):  # pylint: disable=redefined-outer-name
+    """
+    Skip configurations whose baked output is identical to an earlier configuration.
+
+    Expensive checks of the generated output should depend on this, so they run once per distinct output.
     """
-    Bake the cookie cutter, and run make upgrade.
+    _project, digest = baked_matrix[configuration_key(options_baked)]
+    for options in (param.values[0] for param in configurations):
+        if baked_matrix[configuration_key(options)][1] == digest:
+            if configuration_key(options) != configuration_key(options_baked):
+                pytest.skip("Same output as {}".format(options))
+            break
+    return options_baked
+
+
+@pytest.fixture(scope="session")
+def requirements_cache(request):
+    """
+    Provide the directory of compiled requirements, shared across configurations and sessions.
+
+    Set the REQUIREMENTS_CACHE_DIR environment variable to keep it somewhere other than the
+    pytest cache (e.g. a directory cached between CI runs).
+    """
+    cache_dir = os.environ.get('REQUIREMENTS_CACHE_DIR')
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+    return str(request.config.cache.makedir('requirements'))
+
+
+@pytest.fixture(scope="session")
+def options_upgraded(options_unique, requirements_cache):  # pylint: disable=redefined-outer-name
+    """
+    Bake the cookie cutter, and populate its compiled requirements.
+
+    Requirements are compiled with make upgrade only when their inputs haven't been seen
+    before; packages are then installed from the matching local wheelhouse without network access.
     """
-    sh.make('upgrade')  # first run make upgrade to populate requirements/test.txt
-    yield options_baked
+    wheelhouse = upgrade_requirements(requirements_cache)
+    with environment(PIP_FIND_LINKS=str(wheelhouse), PIP_NO_INDEX='1'):
+        yield options_unique
@@ -1,7 +1,21 @@
 """Helper functions for our tests."""
 
+import hashlib
 import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
+from pathlib import Path
+
+import sh
+from cookiecutter.main import cookiecutter
+
+# Bake-time timestamps, from the {% now %} tags in CHANGELOG.rst and docs/index.rst.
+TIMESTAMP_PATTERN = re.compile(rb'\w{3} \w{3} \d{2} \d{2}:\d{2}:\d{2} \d{4}|\d{4}-\d{2}-\d{2}')
+
+# The inputs to "make upgrade"; the compiled requirements/*.txt files are a function of these alone.
+REQUIREMENTS_INPUTS = ('*.in', 'constraints.txt')
 
 
 @contextmanager
@@ -21,6 +35,27 @@ def inside_dir(dirpath):
         os.chdir(old_path)
 
 
+@contextmanager
+def environment(**variables):
+    """
+    Set environment variables and restore their old values at the end of the with-statement.
+
+    Args:
+        variables (dict): the environment variables to set.
+
+    """
+    old_values = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+    try:
+        yield
+    finally:
+        for name, value in old_values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
 @contextmanager
 def bake_in_temp_dir(cookies, *args, **kwargs):
     """
@@ -35,3 +70,137 @@ def bake_in_temp_dir(cookies, *args, **kwargs):
         raise result.exception
     with inside_dir(str(result.project)):
         yield
+
+
+def tree_hash(root):
+    """
+    Get a content hash of every file under a directory.
+
+    Timestamps are masked, so baking the same options at different times gives the same hash.
+
+    Args:
+        root (str): the directory to hash.
+
+    Returns:
+        str: a hex digest which is the same for any two trees with identical relative paths and contents.
+
+    """
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(dirpath, filename)
+            digest.update(os.path.relpath(path, root).encode('utf-8'))
+            digest.update(b'\0')
+            digest.update(TIMESTAMP_PATTERN.sub(b'', Path(path).read_bytes()))
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def bake(template, output_dir, extra_context):
+    """
+    Bake a cookiecutter without prompting, and hash the result.
+
+    Args:
+        template (str): the path of the cookiecutter template.
+        output_dir (str): the directory to bake into; replay data is kept here too.
+        extra_context (dict): the cookiecutter options to use instead of the defaults.
+
+    Returns:
+        tuple: the path of the baked project and its ``tree_hash``.
+
+    """
+    os.makedirs(output_dir)
+    config_file = os.path.join(output_dir, 'config.yaml')
+    with open(config_file, 'w') as config:
+        config.write('cookiecutters_dir: "{0}/cookiecutters"\nreplay_dir: "{0}/replay"\n'.format(output_dir))
+    project = cookiecutter(
+        template,
+        no_input=True,
+        extra_context=extra_context,
+        output_dir=output_dir,
+        config_file=config_file,
+    )
+    return project, tree_hash(project)
+
+
+def bake_all(template, output_dir, contexts, workers=None):
+    """
+    Bake a cookiecutter once for each of several sets of options, in parallel worker processes.
+
+    Args:
+        template (str): the path of the cookiecutter template.
+        output_dir (str): the directory to bake into; each bake gets its own numbered subdirectory.
+        contexts (list): the ``extra_context`` dict for each bake.
+        workers (int): the number of worker processes; one per CPU by default.
+
+    Returns:
+        list: the ``(project, tree_hash)`` result of ``bake`` for each context, in order.
+
+    """
+    output_dirs = [os.path.join(output_dir, str(index)) for index in range(len(contexts))]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(bake, [template] * len(contexts), output_dirs, contexts))
+
+
+def requirements_key(requirements_dir='requirements'):
+    """
+    Get a content hash of the rendered requirements inputs in the given directory.
+
+    Args:
+        requirements_dir (str): the directory holding the ``*.in`` and ``constraints.txt`` files.
+
+    Returns:
+        str: a hex digest which changes whenever any input to ``make upgrade`` does.
+
+    """
+    digest = hashlib.sha256()
+    paths = set()
+    for pattern in REQUIREMENTS_INPUTS:
+        paths.update(Path(requirements_dir).glob(pattern))
+    for path in sorted(paths):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def upgrade_requirements(cache_dir, requirements_dir='requirements'):
+    """
+    Populate the compiled requirements of the baked project in the current directory.
+
+    The compiled ``*.txt`` files and a wheelhouse of their packages are stored in ``cache_dir``
+    under the hash of the requirements inputs, so ``make upgrade`` and the downloads only
+    happen the first time a given set of inputs is seen.
+
+    Args:
+        cache_dir (str): the directory holding previously compiled requirements.
+        requirements_dir (str): the directory of the baked project's requirements files.
+
+    Returns:
+        Path: the wheelhouse directory for the compiled requirements.
+
+    """
+    entry = Path(cache_dir) / requirements_key(requirements_dir)
+    if not entry.is_dir():
+        sh.make('upgrade')
+        staging = Path(cache_dir) / '{}.tmp{}'.format(entry.name, os.getpid())
+        shutil.rmtree(str(staging), ignore_errors=True)
+        (staging / 'requirements').mkdir(parents=True)
+        for compiled in Path(requirements_dir).glob('*.txt'):
+            shutil.copy(str(compiled), str(staging / 'requirements'))
+        sh.pip(
+            'wheel', '--wheel-dir', str(staging / 'wheelhouse'),
+            '-r', os.path.join(requirements_dir, 'test.txt'),
+            '-r', os.path.join(requirements_dir, 'django.txt'),
+        )
+        try:
+            staging.rename(entry)
+        except OSError:
+            # Another session populated the same entry first; its contents are equivalent.
+            shutil.rmtree(str(staging), ignore_errors=True)
+    else:
+        for compiled in (entry / 'requirements').glob('*.txt'):
+            shutil.copy(str(compiled), requirements_dir)
+    return entry / 'wheelhouse'
@@ -0,0 +1,140 @@
+"""
+Batched quality checks of generated projects.
+
+Each linter runs once over every Python file of the baked project rather than once per file, and the
+linters run concurrently, so a configuration costs one interpreter startup per linter.
+"""
+
+import os
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Each linter is a command line which accepts any number of file names after it.
+LINTERS = OrderedDict([
+    ('pylint', ['pylint']),
+    ('pycodestyle', ['pycodestyle']),
+    ('pydocstyle', ['pydocstyle']),
+    ('isort', ['isort', '--check-only', '--diff']),
+])
+
+
+def python_files(root='.'):
+    """
+    Find the Python files to check under a directory.
+
+    Args:
+        root (str): the directory to search.
+
+    Returns:
+        list: sorted relative paths of the ``.py`` files found.
+
+    """
+    found = []
+    for dirpath, _dirnames, filenames in os.walk(root):
+        found.extend(os.path.join(dirpath, name) for name in filenames if name.endswith('.py'))
+    return sorted(found)
+
+
+def run_linter(name, files):
+    """
+    Run one linter over all of the given files in a single process.
+
+    Args:
+        name (str): the key of the linter in ``LINTERS``.
+        files (list): the paths of the files to check.
+
+    Returns:
+        tuple: the linter name, its exit code, and its combined output.
+
+    """
+    process = subprocess.run(
+        LINTERS[name] + list(files),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        check=False,
+    )
+    return name, process.returncode, process.stdout
+
+
+def attribute_output(output, files):
+    """
+    Split linter output into the messages about each file.
+
+    A line which mentions one of the files starts the messages for that file; following lines
+    which don't (tracebacks, diffs, pydocstyle's indented details) belong to the same file.
+
+    Args:
+        output (str): the output of a linter.
+        files (list): the paths of the files which were checked.
+
+    Returns:
+        dict: lists of output lines, keyed by file path. Lines before any file is mentioned are keyed by ``''``.
+
+    """
+    names = {}
+    for path in files:
+        normalized = os.path.normpath(path)
+        names[normalized] = path
+        names[os.path.abspath(path)] = path
+    messages = {}
+    current = ''
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        for token in line.replace(':', ' ').split():
+            path = names.get(os.path.normpath(token))
+            if path is not None:
+                current = path
+                break
+        messages.setdefault(current, []).append(line)
+    return messages
+
+
+def check_quality(files, linters=None, workers=None):
+    """
+    Run the linters over the given files concurrently.
+
+    Args:
+        files (list): the paths of the files to check.
+        linters (list): the names of the linters to run; all of ``LINTERS`` by default.
+        workers (int): how many linters to run at once; one per CPU by default.
+
+    Returns:
+        dict: for each failing file (or ``''`` for output not tied to a file), a dict of the
+        output lines of each linter which reported a problem. An empty dict means every check passed.
+
+    """
+    linters = list(linters or LINTERS)
+    workers = workers or os.cpu_count() or 1
+    report = {}
+    # The linters do their work in their own processes; threads are only needed to wait on them.
+    with ThreadPoolExecutor(max_workers=min(workers, len(linters))) as executor:
+        results = executor.map(lambda name: run_linter(name, files), linters)
+        for name, returncode, output in results:
+            if returncode == 0:
+                continue
+            messages = attribute_output(output, files) or {'': ['{} exited with status {}'.format(name, returncode)]}
+            for path, lines in messages.items():
+                report.setdefault(path, OrderedDict())[name] = lines
+    return report
+
+
+def format_report(report):
+    """
+    Format a report from ``check_quality`` for display in a test failure.
+
+    Args:
+        report (dict): the report to format.
+
+    Returns:
+        str: the report as text, grouped by file and then by linter.
+
+    """
+    lines = []
+    for path in sorted(report):
+        lines.append(path or '(no file)')
+        for name, messages in report[path].items():
+            lines.extend('  {}: {}'.format(name, message) for message in messages)
+    return '\n'.join(lines)
@@ -0,0 +1,54 @@
+"""
+Tests of the bake-time profiler used by the profile make target.
+"""
+
+import json
+from pathlib import Path
+
+import cookiecutter.generate
+
+from bake_profiler import BakeProfiler, main
+
+from .helpers import bake_in_temp_dir
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_profiles_files_and_hooks(cookies, bake_profiler):
+    """Every rendered template file and both hooks should be timed, within the total."""
+    with bake_in_temp_dir(cookies, extra_context={'models': 'ChocolateChip,Zimsterne'}):
+        pass
+    report = bake_profiler.report()
+    assert set(report['hooks']) == {'pre_gen_project', 'post_gen_project'}
+    assert report['hooks']['post_gen_project']['run'] > 0
+    models = report['files']['{{cookiecutter.app_name}}/models.py']
+    assert models['compile'] > 0 and models['render'] > 0
+    assert models['total'] == models['binary'] + models['compile'] + models['render']
+    assert sum(timings['total'] for timings in report['files'].values()) < report['total']
+
+
+def test_restores_cookiecutter(cookies):
+    """Cookiecutter's functions should be unwrapped after the with-statement, even after an error."""
+    generate_file = cookiecutter.generate.generate_file
+    try:
+        with BakeProfiler():
+            assert cookiecutter.generate.generate_file != generate_file
+            raise KeyError
+    except KeyError:
+        pass
+    assert cookiecutter.generate.generate_file == generate_file
+    result = cookies.bake()
+    assert result.exception is None
+
+
+def test_reports(tmp_path, capsys):
+    """The command line should print the slowest files and write the JSON and flame graph reports."""
+    report_file = tmp_path / 'profile.json'
+    stacks_file = tmp_path / 'profile.folded'
+    main(['--json', str(report_file), '--flame', str(stacks_file), '--top', '3', str(TEMPLATE_DIR), 'models=Scoop'])
+    assert len(capsys.readouterr().out.splitlines()) == 1 + 2 + 3
+    report = json.loads(report_file.read_text())
+    assert '{{cookiecutter.app_name}}/models.py' in report['files']
+    stacks = stacks_file.read_text().splitlines()
+    assert 'bake;files;{{cookiecutter.app_name}}/models.py;compile ' in '\n'.join(stacks)
+    assert all(int(line.rsplit(' ', 1)[1]) >= 0 for line in stacks)
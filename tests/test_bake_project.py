@@ -4,14 +4,14 @@ Tests of the project generation output.
 
 import logging
 import logging.config
-import os
 import re
 from pathlib import Path
 
 import pytest
 import sh
 
-from .helpers import bake_in_temp_dir
+from .helpers import bake_in_temp_dir, requirements_key
+from .quality import attribute_output, check_quality, format_report, python_files
 
 LOGGING_CONFIG = {
     'version': 1,
@@ -31,23 +31,38 @@ logging.config.dictConfig(LOGGING_CONFIG)
 # Fixture names aren't always used in test functions. Disable completely.
 # pylint: disable=unused-argument
 
-@pytest.mark.parametrize("license_name, target_string", [
-    ('AGPL 3.0', 'GNU AFFERO GENERAL PUBLIC LICENSE'),
-    ('Apache Software License 2.0', 'Apache'),
-])
-def test_bake_selecting_license(cookies, license_name, target_string):
+# Text expected in LICENSE.txt and setup.py for each license choice.
+LICENSE_MARKERS = {
+    'AGPL 3.0': ('GNU AFFERO GENERAL PUBLIC LICENSE', 'license="AGPL 3.0"'),
+    'Apache Software License 2.0': ('Apache', 'license="Apache Software License 2.0"'),
+    'Not open source': ('', 'License :: Other/Proprietary License'),
+}
+
+
+def test_bake_selecting_license(options_baked):
     """Test to check if LICENSE.txt gets the correct license selected."""
-    with bake_in_temp_dir(cookies, extra_context={'open_source_license': license_name}):
-        assert target_string in Path("LICENSE.txt").read_text()
-        assert license_name in Path("setup.py").read_text()
+    license_text, setup_text = LICENSE_MARKERS[options_baked["open_source_license"]]
+    assert license_text in Path("LICENSE.txt").read_text()
+    assert setup_text in Path("setup.py").read_text()
+
+
+def test_requirements_key(cookies):
+    """The requirements cache key should depend only on the rendered requirements inputs."""
+    keys = []
+    for extra_context in ({'app_name': 'one'}, {'app_name': 'two'}, {'models': 'Scoop'}):
+        with bake_in_temp_dir(cookies, extra_context=extra_context):
+            keys.append(requirements_key())
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
 
 
 def test_readme(options_baked):
     """The generated README.rst file should pass some sanity checks and validate as a PyPI long description."""
     readme_file = Path('README.rst')
     readme_lines = [x.strip() for x in readme_file.open()]
-    assert "cookie_repo" == readme_lines[0]
-    assert 'The full documentation is at https://cookie_repo.readthedocs.org.' in readme_lines
+    repo_name = options_baked["repo_name"]
+    assert repo_name == readme_lines[0]
+    assert 'The full documentation is at https://{}.readthedocs.org.'.format(repo_name) in readme_lines
     try:
         sh.python("setup.py", 'check', restructuredtext=True, strict=True)
     except sh.ErrorReturnCode as exc:
@@ -58,19 +73,257 @@ def test_models(options_baked):
     """The generated models.py file should pass a sanity check."""
     if "models" not in options_baked:
         pytest.skip("No models to check")
-    model_txt = Path("cookie_lover/models.py").read_text()
-    for model_name in options_baked.get("models").split(","):
+    model_txt = Path(options_baked["app_name"], "models.py").read_text()
+    for model_name in options_baked.get("models").replace(" ", "").split(","):
         pattern = r'^class {}\(TimeStampedModel\):$'.format(model_name)
         assert re.search(pattern, model_txt, re.MULTILINE)
+        pattern = r'^class {}QuerySet\(TimeStampedQuerySet\):$'.format(model_name)
+        assert re.search(pattern, model_txt, re.MULTILINE)
+        assert '    objects = {}QuerySet.as_manager()'.format(model_name) in model_txt
+    assert "models.Index(fields=['created', 'id'], name=" in model_txt
+    assert "models.Index(fields=['modified'], name=" in model_txt
+
+
+def test_models_package(cookies):
+    """Past the threshold, each model and its tests should get a module of their own, with a registry."""
+    extra_context = {'models': 'ChocolateChip, HTTPLog', 'models_package_threshold': '1'}
+    with bake_in_temp_dir(cookies, extra_context=extra_context):
+        package = Path('your_project_title_goes_here', 'models')
+        assert not package.with_suffix('.py').exists()
+        assert sorted(path.name for path in package.iterdir()) == [
+            '__init__.py', 'base.py', 'chocolate_chip.py', 'http_log.py',
+        ]
+        registry_text = (package / '__init__.py').read_text()
+        assert 'from your_project_title_goes_here.models.http_log import HTTPLog, HTTPLogQuerySet' in registry_text
+        assert 'MODELS = [\n    ChocolateChip,\n    HTTPLog,\n]' in registry_text
+        assert 'class HTTPLog(TimeStampedModel):' in (package / 'http_log.py').read_text()
+        assert not Path('tests', 'test_models.py').exists()
+        assert 'class TestHTTPLog:' in Path('tests', 'models', 'test_http_log.py').read_text()
+
+
+def test_model_fields(cookies):
+    """Field specs in the models option should give fields, indexes and serializers in the models and migration."""
+    extra_context = {'models': 'ChocolateChip: name=str!idx, price=int, Zimsterne'}
+    with bake_in_temp_dir(cookies, extra_context=extra_context):
+        app = Path('your_project_title_goes_here')
+        model_text = (app / 'models.py').read_text()
+        assert "    name = models.CharField(max_length=255, default='')\n" in model_text
+        assert "    price = models.IntegerField(default=0)\n" in model_text
+        assert "models.Index(fields=['name'], name='your_projec_name_42db0a_idx')" in model_text
+        assert "            'price': self.price,\n" in model_text
+        assert "ChocolateChipRow = namedtuple('ChocolateChipRow', ['id', 'created', 'modified', 'name', 'price'])" in (
+            model_text)
+        assert 'class Zimsterne(TimeStampedModel):' in model_text
+        migration_text = (app / 'migrations' / '0001_initial.py').read_text()
+        assert "('name', models.CharField(default='', max_length=255))," in migration_text
+        assert "index=models.Index(fields=['name'], name='your_projec_name_42db0a_idx')" in migration_text
+        assert 'MODELS = [ChocolateChip, Zimsterne]' in Path('benchmarks', 'cases.py').read_text()
+
+
+def test_index_names(cookies):
+    """Models and fields which share long prefixes should still get index names unique in the database."""
+    extra_context = {'models': 'ChocolateChipCookie: name=str!idx, named=str!idx, ChocolateChipMuffin'}
+    with bake_in_temp_dir(cookies, extra_context=extra_context):
+        app = Path('your_project_title_goes_here')
+        model_names = re.findall(r"models\.Index\(fields=\[[^]]*\], name='(\w+)'\)", (app / 'models.py').read_text())
+        migration_text = (app / 'migrations' / '0001_initial.py').read_text()
+        migration_names = re.findall(r"models\.Index\(fields=\[[^]]*\], name='(\w+)'\)", migration_text)
+        assert len(model_names) == 6
+        assert len(set(model_names)) == len(model_names)
+        assert sorted(migration_names) == sorted(model_names)
+        assert all(len(name) <= 30 for name in model_names)
+
+
+@pytest.mark.parametrize('models', [
+    'price=int', 'Scoop:flavor=blob', 'Scoop:id=int', 'Scoop:name=str,name=int',
+])
+def test_invalid_model_fields(cookies, models):
+    """Invalid field specs should stop the bake."""
+    result = cookies.bake(extra_context={'models': models})
+    assert result.exit_code != 0
+
+
+def test_model_cache(options_baked):
+    """The model cache should only be generated when selected, and be connected by the AppConfig."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked and options_baked.get("model_cache") == "yes"
+    assert Path(app_name, "cache.py").exists() == selected
+    assert Path("tests", "test_cache.py").exists() == selected
+    apps_text = Path(app_name, "apps.py").read_text()
+    assert ("LazyReceiver('cache', 'invalidate_instance')" in apps_text) == selected
+
+
+def test_read_replicas(options_baked):
+    """The database router should only be generated when selected, with a replica database to test it against."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked and options_baked.get("read_replicas") == "yes"
+    assert Path(app_name, "routers.py").exists() == selected
+    assert Path("tests", "test_routers.py").exists() == selected
+    assert ("'replica': {" in Path("test_settings.py").read_text()) == selected
+    apps_text = Path(app_name, "apps.py").read_text()
+    assert ("LazyReceiver('routers', 'unpin')" in apps_text) == selected
+
+
+def test_bulk_transfer(options_baked):
+    """The import and export commands should be generated with any models, and the management package without."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked
+    commands = Path(app_name, "management", "commands")
+    assert Path(commands, "{}_import.py".format(app_name)).exists() == selected
+    assert Path(commands, "{}_export.py".format(app_name)).exists() == selected
+    assert Path(app_name, "bulk_transfer.py").exists() == selected
+    assert Path("tests", "test_bulk_transfer.py").exists() == selected
+    assert Path(app_name, "management").exists() == selected
+    assert ("_import <model> <model>.csv" in Path("docs", "getting_started.rst").read_text()) == selected
+
+
+def test_daily_summaries(options_baked):
+    """The summary models and the code which maintains them should only be generated when selected."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked and options_baked.get("daily_summaries") == "yes"
+    assert Path(app_name, "summaries.py").exists() == selected
+    assert Path("tests", "test_summaries.py").exists() == selected
+    assert Path(app_name, "management", "commands", "{}_rebuild_summaries.py".format(app_name)).exists() == selected
+    if "models" in options_baked:
+        assert ("class ChocolateChipDailySummary(" in Path(app_name, "models.py").read_text()) == selected
+        migration_text = Path(app_name, "migrations", "0001_initial.py").read_text()
+        assert ("name='ChocolateChipDailySummary'" in migration_text) == selected
+
+
+def test_model_api(options_baked):
+    """The JSON views should only be generated and routed when selected."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked and options_baked.get("model_api") == "yes"
+    assert Path(app_name, "views.py").exists() == selected
+    assert Path("tests", "test_views.py").exists() == selected
+    urls_text = Path(app_name, "urls.py").read_text()
+    for model_name in options_baked.get("models", "").replace(" ", "").split(","):
+        route = "url(r'^api/{}/$', views.object_list".format(model_name.lower())
+        assert (bool(model_name) and route in urls_text) == selected
+
+
+def test_async_views(options_baked):
+    """The async views and the ASGI load test should only be generated and routed when selected."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked and options_baked.get("model_api") == options_baked.get("async_views") == "yes"
+    assert Path(app_name, "async_views.py").exists() == selected
+    assert Path("tests", "test_async_views.py").exists() == selected
+    assert Path("benchmarks", "asgi.py").exists() == selected
+    assert ("async_views.object_list" in Path(app_name, "urls.py").read_text()) == selected
+    makefile_text = Path("Makefile").read_text()
+    assert ("python -m benchmarks.asgi" in makefile_text) == selected
+    assert (" benchmark_asgi " in makefile_text.split("\n\n")[0]) == selected
+    assert ("django31" in Path("tox.ini").read_text()) == selected
+
+
+def test_write_buffer(options_baked):
+    """The write buffer should only be generated when selected, and invalidate the model caches if there are any."""
+    app_name = options_baked["app_name"]
+    selected = "models" in options_baked and options_baked.get("write_buffer") == "yes"
+    assert Path(app_name, "write_buffer.py").exists() == selected
+    assert Path("tests", "test_write_buffer.py").exists() == selected
+    if selected:
+        buffer_text = Path(app_name, "write_buffer.py").read_text()
+        assert ("invalidate_instance(model, obj)" in buffer_text) == (options_baked.get("model_cache") == "yes")
 
 
 def test_urls(options_baked):
-    """The urls.py file should be present."""
-    urls_file_txt = Path("cookie_lover/urls.py").read_text()
-    basic_url = "url(r'', TemplateView.as_view(template_name=\"cookie_lover/base.html\"))"
+    """The urls.py file should be present, passing the sections of index.html to it if there are models."""
+    app_name = options_baked["app_name"]
+    urls_file_txt = Path(app_name, "urls.py").read_text()
+    if "models" in options_baked:
+        basic_url = "url(r'', TemplateView.as_view(\n        template_name=\"{}/index.html\",".format(app_name)
+        assert "'sections': SECTIONS}" in urls_file_txt
+    else:
+        basic_url = "url(r'', TemplateView.as_view(template_name=\"{}/base.html\"))".format(app_name)
     assert basic_url in urls_file_txt
 
 
+def test_template_caching(options_baked):
+    """Templates should be compiled once by the cached loader, and index.html should cache a fragment per model."""
+    assert "django.template.loaders.cached.Loader" in Path("test_settings.py").read_text()
+    templates = Path(options_baked["app_name"], "templates", options_baked["app_name"])
+    assert "{% cache" not in (templates / "base.html").read_text()
+    index = templates / "index.html"
+    assert index.exists() == ("models" in options_baked)
+    assert "models" not in options_baked or "section.objects.last_change %}" in index.read_text()
+    assert Path("tests", "test_templates.py").exists() == ("models" in options_baked)
+
+
+def test_fast_tests(options_baked):
+    """The generated project should support running its tests in parallel against in-memory databases."""
+    assert "pytest -n auto --reuse-db" in Path("Makefile").read_text()
+    assert "pytest-xdist" in Path("requirements", "test.in").read_text()
+    assert "os.environ.get('TEST_DATABASE_NAME', ':memory:')" in Path("test_settings.py").read_text()
+
+
+def test_benchmarks(options_baked):
+    """The generated benchmarks should cover each model and be run by make benchmark."""
+    cases_text = Path("benchmarks", "cases.py").read_text()
+    models = options_baked.get("models", "").replace(" ", "")
+    assert "MODELS = [{}]".format(models.replace(",", ", ")) in cases_text
+    makefile_text = Path("Makefile").read_text()
+    assert "python -m benchmarks --threshold $(BENCHMARK_THRESHOLD)" in makefile_text
+    assert " benchmark_baseline " in makefile_text.split("\n\n")[0]
+
+
+def test_loadtest(options_baked):
+    """The generated load test should request the JSON views of each model only if there are any."""
+    targets_text = Path("loadtest", "targets.py").read_text()
+    assert ("reverse(name + '-list')" in targets_text) == (
+        "models" in options_baked and options_baked.get("model_api") == "yes")
+    assert "python -m loadtest $(LOADTEST_OPTS)" in Path("Makefile").read_text()
+    assert " loadtest " in Path("tox.ini").read_text()
+
+
+def test_query_budgets(options_baked):
+    """The generated project should load the query budget plugin for its tests."""
+    assert "'test_utils.queries'" in Path("conftest.py").read_text()
+    assert Path("test_utils", "queries.py").exists()
+    assert Path("tests", "test_queries.py").exists()
+
+
+def test_memory_budgets(options_baked):
+    """The generated project should load the memory budget plugin for its tests."""
+    assert "'test_utils.memory'" in Path("conftest.py").read_text()
+    assert Path("test_utils", "memory.py").exists()
+    assert Path("tests", "test_memory.py").exists()
+
+
+def test_startup_budget(options_baked):
+    """The generated project should check the cost of the app at Django startup against a budget."""
+    assert "'test_utils.startup'" in Path("conftest.py").read_text()
+    assert "import_time_budget = " in Path("tox.ini").read_text()
+    startup_text = Path("tests", "test_startup.py").read_text()
+    for module in ("views", "cache", "routers", "summaries"):
+        assert "'{}.{}'".format(options_baked["app_name"], module) not in startup_text
+
+
+def test_migrations(options_baked):
+    """Models should get an initial migration with their indexes, which make check_migrations checks."""
+    migrations = Path(options_baked["app_name"], "migrations")
+    assert migrations.exists() == ("models" in options_baked)
+    if "models" in options_baked:
+        migration_text = (migrations / "0001_initial.py").read_text()
+        for model_name in options_baked["models"].replace(" ", "").split(","):
+            assert "migrations.CreateModel(\n            name='{}',".format(model_name) in migration_text
+            assert "model_name='{}',\n            index=models.Index(fields=['created', 'id']".format(
+                model_name.lower()) in migration_text
+    assert "python -m test_utils.migration_lint" in Path("Makefile").read_text()
+
+
+def test_translations(options_baked):
+    """The localization targets should be run by the incremental translation build, whose cache is ignored."""
+    makefile_text = Path("Makefile").read_text()
+    for step in ("extract", "dummy", "compile"):
+        assert "$(I18N) {} {}".format(step, options_baked["app_name"]) in makefile_text
+    assert "manage.py compilemessages" not in makefile_text
+    assert ".i18n_cache.json" in Path(".gitignore").read_text()
+    assert Path("translations", "build.py").exists()
+    assert not Path("test_utils", "translations.py").exists()
+    assert Path("tests", "test_translations.py").exists()
+
+
 def test_travis(options_baked):
     """The generated .travis.yml file should pass a sanity check."""
     travis_text = Path(".travis.yml").read_text()
@@ -79,42 +332,35 @@ def test_travis(options_baked):
 
 def test_app_config(options_baked):
     """The generated Django AppConfig should look correct."""
-    init_text = Path("cookie_lover/__init__.py").read_text()
-    pattern = r"^default_app_config = 'cookie_lover.apps.CookieLoverConfig'  #"
+    app_name = options_baked["app_name"]
+    class_name = app_name.replace("_", " ").title().replace(" ", "") + "Config"
+    init_text = Path(app_name, "__init__.py").read_text()
+    pattern = r"^default_app_config = '{}.apps.{}'  #".format(app_name, class_name)
     assert re.search(pattern, init_text, re.MULTILINE)
 
-    apps_text = Path("cookie_lover/apps.py").read_text()
-    pattern = r'^class CookieLoverConfig\(AppConfig\):$'
+    apps_text = Path(app_name, "apps.py").read_text()
+    pattern = r'^class {}\(AppConfig\):$'.format(class_name)
     assert re.search(pattern, apps_text, re.MULTILINE)
 
 
 def test_manifest(options_baked):
     """The generated MANIFEST.in should pass a sanity check."""
     manifest_text = Path("MANIFEST.in").read_text()
-    assert 'recursive-include cookie_lover *.html' in manifest_text
+    assert 'recursive-include {} *.html'.format(options_baked["app_name"]) in manifest_text
 
 
 def test_setup_py(options_baked):
     """The generated setup.py should pass a sanity check."""
     setup_text = Path("setup.py").read_text()
-    assert "VERSION = get_version('cookie_lover', '__init__.py')" in setup_text
+    assert "VERSION = get_version('{}', '__init__.py')".format(options_baked["app_name"]) in setup_text
     assert "    author='edX'," in setup_text
 
 
 def test_quality(options_upgraded):
     """Run quality tests on the given generated output."""
-    for dirpath, _dirnames, filenames in os.walk("."):
-        for filename in filenames:
-            name = os.path.join(dirpath, filename)
-            if not name.endswith('.py'):
-                continue
-            try:
-                sh.pylint(name)
-                sh.pycodestyle(name)
-                sh.pydocstyle(name)
-                sh.isort(name, check_only=True, diff=True)
-            except sh.ErrorReturnCode as exc:
-                pytest.fail(str(exc))
+    report = check_quality(python_files())
+    if report:
+        pytest.fail(format_report(report))
 
     try:
         # Sanity check the generated Makefile
@@ -126,6 +372,19 @@ def test_quality(options_upgraded):
         pytest.fail(str(exc))
 
 
+def test_quality_report_attribution():
+    """Linter output should be split into the messages about each checked file."""
+    output = "\n".join([
+        "./pkg/models.py:3:1: E302 expected 2 blank lines",
+        "./pkg/apps.py:1 at module level:",
+        "        D100: Missing docstring in public module",
+        "",
+    ])
+    messages = attribute_output(output, ["./pkg/apps.py", "./pkg/models.py", "./setup.py"])
+    assert sorted(messages) == ["./pkg/apps.py", "./pkg/models.py"]
+    assert len(messages["./pkg/apps.py"]) == 2
+
+
 def test_pii_annotations(options_upgraded):
     """
     Test that the pii_check make target works correctly.
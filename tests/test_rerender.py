@@ -0,0 +1,68 @@
+"""
+Tests of the incremental re-rendering used by the watch and replay make targets.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from rerender import IncrementalRenderer, load_context
+
+from .helpers import bake, tree_hash
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def template_copy(tmp_path):
+    """
+    Provide a copy of the cookiecutter template which the test can edit.
+    """
+    template = tmp_path / 'template'
+    template.mkdir()
+    shutil.copy(str(TEMPLATE_DIR / 'cookiecutter.json'), str(template))
+    shutil.copytree(str(TEMPLATE_DIR / '{{cookiecutter.repo_name}}'), str(template / '{{cookiecutter.repo_name}}'))
+    shutil.copytree(str(TEMPLATE_DIR / 'hooks'), str(template / 'hooks'))
+    return template
+
+
+def test_render_all_matches_bake(template_copy, tmp_path):  # pylint: disable=redefined-outer-name
+    """A full incremental render should produce the same tree as cookiecutter."""
+    project, digest = bake(str(template_copy), str(tmp_path / 'baked'), {})
+    renderer = IncrementalRenderer(str(template_copy), load_context(str(template_copy)), str(tmp_path / 'rendered'))
+    assert renderer.render_all() > 0
+    assert tree_hash(str(tmp_path / 'rendered' / Path(project).name)) == digest
+
+
+def test_update_rewrites_only_changed_files(template_copy, tmp_path):  # pylint: disable=redefined-outer-name
+    """Only the outputs of edited template files should be rewritten."""
+    renderer = IncrementalRenderer(str(template_copy), load_context(str(template_copy)), str(tmp_path))
+    renderer.render_all()
+    changed = template_copy / '{{cookiecutter.repo_name}}' / 'README.rst'
+    untouched = template_copy / '{{cookiecutter.repo_name}}' / 'setup.py'
+    assert renderer.update([str(untouched)]) == 0
+
+    changed.write_text(changed.read_text() + '\nEdited.\n')
+    assert renderer.update([str(changed), str(untouched)]) == 1
+    assert 'Edited.' in Path(renderer.outputs[str(changed.relative_to(template_copy))]).read_text()
+
+    changed.unlink()
+    renderer.update([str(changed)])
+    assert not Path(tmp_path, 'your-project-title-goes-here', 'README.rst').exists()
+
+
+def test_update_reruns_hook_for_bundles(template_copy, tmp_path):  # pylint: disable=redefined-outer-name
+    """Edits to a template file which the hook splits up should be split up again."""
+    context = load_context(str(template_copy))
+    context['cookiecutter'].update(models='Scoop,Flavor', models_package_threshold='1')
+    renderer = IncrementalRenderer(str(template_copy), context, str(tmp_path))
+    renderer.render_all()
+    package = tmp_path / 'your-project-title-goes-here' / 'your_project_title_goes_here' / 'models'
+    assert not package.with_suffix('.py').exists()
+
+    models = template_copy / '{{cookiecutter.repo_name}}' / '{{cookiecutter.app_name}}' / 'models.py'
+    models.write_text(models.read_text().replace('Queries of', 'Edited queries of'))
+    renderer.update([str(models)])
+    assert not package.with_suffix('.py').exists()
+    assert 'Edited queries of Scoop' in (package / 'scoop.py').read_text()
@@ -0,0 +1,69 @@
+"""
+Stress tests of baking, and loading, apps with hundreds of models.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from .helpers import bake_in_temp_dir
+
+# The model counts to compare; the larger is well past the default models_package_threshold.
+MODEL_COUNTS = (50, 500)
+
+# How much worse than linear in the model count the costs may grow, to allow for noise.
+SLACK = 3
+
+# Set up Django in a baked project, and print the time that took and the number of models registered.
+SETUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.apps import apps
+print(json.dumps([time.perf_counter() - start, len(list(apps.get_app_config(sys.argv[1]).get_models()))]))
+"""
+
+
+def registry_load_time(app_name):
+    """
+    Time ``django.setup()`` for the baked project in the current directory, in a new interpreter.
+
+    Returns:
+        tuple: the number of seconds taken and the number of models of the app registered.
+
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='test_settings')
+    output = subprocess.run(
+        [sys.executable, '-c', SETUP_SCRIPT, app_name],
+        stdout=subprocess.PIPE, universal_newlines=True, env=env, check=True,
+    ).stdout
+    seconds, models = json.loads(output)
+    return seconds, models
+
+
+def test_many_models(cookies, bake_profiler, record_property):
+    """Render time and app registry load time should grow no faster than linearly with the number of models."""
+    pytest.importorskip('django')
+    pytest.importorskip('model_utils')
+    render_times = []
+    load_times = []
+    for count in MODEL_COUNTS:
+        models = ','.join('Model{}'.format(number) for number in range(count))
+        started = bake_profiler.total
+        with bake_in_temp_dir(cookies, extra_context={'models': models}):
+            render_times.append(bake_profiler.total - started)
+            seconds, registered = registry_load_time('your_project_title_goes_here')
+            assert registered == count
+            load_times.append(seconds)
+        record_property('render_seconds_{}_models'.format(count), render_times[-1])
+        record_property('load_seconds_{}_models'.format(count), load_times[-1])
+
+    growth = MODEL_COUNTS[-1] / MODEL_COUNTS[0]
+    assert render_times[-1] <= render_times[0] * growth * SLACK
+    assert load_times[-1] <= load_times[0] * growth * SLACK
+    report = bake_profiler.report()
+    assert '{{cookiecutter.app_name}}/models.py' in report['files']
@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks of {{ cookiecutter.app_name }}, with a saved baseline to catch performance regressions.
+
+Run them with ``make benchmark``; see ``python -m benchmarks --help`` for the options.
+"""
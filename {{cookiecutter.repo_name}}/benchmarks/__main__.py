@@ -0,0 +1,63 @@
+"""
+Run the {{ cookiecutter.app_name }} benchmarks against a test database, and compare them with the baseline.
+
+The baseline is saved on the first run, or whenever ``--save`` is given.  Timings depend on the
+machine, so only compare against a baseline saved on the same kind of machine.
+"""
+
+import argparse
+import os
+import sys
+
+import django
+from django.db import connection
+
+from benchmarks.harness import compare, load_results, save_results
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def main(argv=None):
+    """
+    Run the benchmarks, returning a non-zero exit status if any regressed.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--baseline', default=BASELINE, help='the JSON file of baseline timings')
+    parser.add_argument('--save', action='store_true', help='save this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='the allowed slowdown, as a fraction of the baseline time')
+    parser.add_argument('--rows', type=int, default=1000, help='the number of rows to create and read')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of timed repetitions of each case')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+    django.setup()
+    # The cases import the models, which need the app registry that django.setup() populates.
+    from benchmarks.cases import object_sizes, run_benchmarks  # pylint: disable=import-outside-toplevel
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        results = run_benchmarks(rows=args.rows, repeat=args.repeat)
+        sizes = object_sizes(rows=args.rows)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    for name, seconds in sorted(results.items()):
+        print('{:<40} {:>12.3f} ms'.format(name, seconds * 1000))
+    # Reading whole model instances or just rows of their values, which aren't compared with the baseline.
+    for name, size in sorted(sizes.items()):
+        print('{:<40} {:>12.0f} objects/s {:>8.0f} bytes/object'.format(name, args.rows / results[name], size))
+
+    if args.save or not os.path.exists(args.baseline):
+        save_results(results, args.baseline)
+        print('Saved the baseline to {}'.format(args.baseline))
+        return 0
+
+    regressions = compare(results, load_results(args.baseline), args.threshold)
+    for name, baseline, seconds in regressions:
+        print('REGRESSION {}: {:.3f} ms, baseline {:.3f} ms'.format(name, seconds * 1000, baseline * 1000))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
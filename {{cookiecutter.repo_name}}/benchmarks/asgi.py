@@ -0,0 +1,160 @@
+"""
+Load test the sync and async {{ cookiecutter.app_name }} views over ASGI, in this process.
+
+Requests are passed straight to Django's ASGI application, with no server or sockets, by
+``concurrency`` clients which each send their next request as soon as the last is answered.
+The requests per second and the median (p50) and 99th percentile (p99) latencies so measure
+Django's request handling and the views alone.  Run it with ``make benchmark_asgi``.
+
+The synchronous list view streams its pages, which Django can only do over ASGI from version
+4.2 on, so only its async variant is load tested on earlier versions.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import django
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.urls import reverse
+
+from benchmarks.harness import percentile
+
+
+async def get(application, url):
+    """
+    Send a GET request for ``url``, a path with an optional query string, to an ASGI application.
+
+    Returns:
+        tuple: the status code and body of the response
+    """
+    path, _, query_string = url.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode('utf-8'),
+        'query_string': query_string.encode('utf-8'),
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    pending = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    messages = []
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        # The client never disconnects; Django stops listening for it once the response is sent.
+        await asyncio.Event().wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return messages[0]['status'], body
+
+
+async def load(application, url, requests, concurrency):
+    """
+    Send ``requests`` GET requests for ``url``, from ``concurrency`` clients at once.
+
+    Returns:
+        dict: the ``requests_per_second``, and the ``p50`` and ``p99`` latencies in seconds
+
+    Raises:
+        RuntimeError: if a request isn't answered with a 200 response
+    """
+    latencies = []
+
+    async def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            status, _ = await get(application, url)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError('GET {} answered {}'.format(url, status))
+
+    counts = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*[client(count) for count in counts if count])
+    seconds = time.perf_counter() - start
+    return {
+        'requests_per_second': len(latencies) / seconds,
+        'p50': percentile(latencies, 50),
+        'p99': percentile(latencies, 99),
+    }
+
+
+def run_load(url, requests=1000, concurrency=10, application=None):
+    """
+    Load test ``url``, with Django's ASGI application unless another is given.
+
+    Synchronous code run by the application, including the queries of the async views, runs in
+    the calling thread, so it uses the same database connection as the caller.
+    """
+    if application is None:
+        # Only in Django 3.0 and later.
+        from django.core.asgi import get_asgi_application  # pylint: disable=import-error,import-outside-toplevel
+        application = get_asgi_application()
+    return async_to_sync(load)(application, url, requests, concurrency)
+
+
+def variants(view):
+    """
+    Get the URL name infixes of the variants of a view which can be served over ASGI: sync and async.
+    """
+    # Before Django 4.2, a streamed response is read on the event loop, where queries aren't allowed.
+    if view == 'list' and django.VERSION < (4, 2):
+        return ['async-']
+    return ['', 'async-']
+
+
+def main(argv=None):
+    """
+    Load test the list and detail views of every model, both sync and async, against a test database.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000, help='the number of requests to each view')
+    parser.add_argument('--concurrency', type=int, default=10, help='the number of requests in flight at once')
+    parser.add_argument('--rows', type=int, default=1000, help='the number of objects of each model to list')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+    django.setup()
+    if django.VERSION < (3, 1):
+        parser.error('Django runs async views natively from version 3.1')
+    # The cases import the models, which need the app registry that django.setup() populates.
+    from benchmarks.cases import MODELS  # pylint: disable=import-outside-toplevel
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print('{:<40} {:>12} {:>10} {:>10}'.format('View', 'Requests/s', 'p50 ms', 'p99 ms'))
+        for model in MODELS:
+            model.objects.bulk_create_chunked(model() for _ in range(args.rows))
+            name = model._meta.model_name
+            pk = model.objects.values_list('pk', flat=True).first()
+            for view, kwargs in (('detail', {'pk': pk}), ('list', {})):
+                for variant in variants(view):
+                    url = reverse('{}-{}{}'.format(name, variant, view), kwargs=kwargs)
+                    result = run_load(url, requests=args.requests, concurrency=args.concurrency)
+                    print('{:<40} {:>12.0f} {:>10.2f} {:>10.2f}'.format(
+                        '{}.{} ({})'.format(model.__name__, view, variant.rstrip('-') or 'sync'),
+                        result['requests_per_second'], result['p50'] * 1000, result['p99'] * 1000,
+                    ))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
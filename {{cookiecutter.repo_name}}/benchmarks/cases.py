@@ -0,0 +1,105 @@
+"""
+Benchmark cases for the {{ cookiecutter.app_name }} models.
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if cookiecutter.models != "Comma-separated list of models" and '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+"""
+
+import random
+import tracemalloc
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from benchmarks.harness import time_case
+{%- if models %}
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+{%- endif %}
+
+MODELS = [{{ models|join(', ') }}]
+
+
+def model_cases(model, rows):
+    """
+    Get the benchmark cases of a model.
+
+    Args:
+        model: the model class to benchmark.
+        rows (int): how many rows to create in bulk, and to have in the table while reading.
+
+    Returns:
+        OrderedDict: the ``time_case`` keyword arguments of each case, keyed by case name
+    """
+    now = timezone.now()
+    pks = []
+    objs = []
+    choose = random.Random(0).choice
+
+    def empty():
+        model.objects.all().delete()
+
+    def populate():
+        empty()
+        model.objects.bulk_create_chunked(model(created=now - timedelta(seconds=n)) for n in range(rows))
+        pks[:] = model.objects.values_list('pk', flat=True)
+
+    def load():
+        populate()
+        objs[:] = model.objects.all()
+
+    window = timedelta(seconds=max(rows // 10, 1))
+    return OrderedDict([
+        ('create', dict(func=model.objects.create, setup=empty, number=100)),
+        ('bulk_create_{}'.format(rows), dict(
+            func=lambda: model.objects.bulk_create_chunked(model() for _ in range(rows)),
+            setup=empty,
+        )),
+        ('get_by_pk', dict(func=lambda: model.objects.get(pk=choose(pks)), setup=populate, number=100)),
+        ('created_range', dict(
+            func=lambda: list(model.objects.created_between(now - window, now)),
+            setup=populate,
+            number=10,
+        )),
+        ('serialize_{}'.format(rows), dict(func=lambda: [obj.serialize() for obj in objs], setup=load)),
+        ('read_instances_{}'.format(rows), dict(func=lambda: list(model.objects.all()), setup=populate)),
+        ('read_rows_{}'.format(rows), dict(func=lambda: list(model.objects.rows()), setup=populate)),
+    ])
+
+
+def object_sizes(rows=1000):
+    """
+    Measure the memory taken by each model's objects when read as model instances, and as rows.
+
+    Returns:
+        dict: the bytes per object, keyed by the name of the ``read_instances`` or ``read_rows`` case
+    """
+    sizes = {}
+    for model in MODELS:
+        model.objects.bulk_create_chunked(model() for _ in range(rows))
+        for name, read in (('read_instances', model.objects.all), ('read_rows', model.objects.rows)):
+            # Read once first, so that only the objects themselves are traced, not what's cached on the way.
+            list(read())
+            tracemalloc.start()
+            objs = list(read())
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            sizes['{}.{}_{}'.format(model.__name__, name, rows)] = size / len(objs)
+        model.objects.all().delete()
+    return sizes
+
+
+def run_benchmarks(rows=1000, repeat=5):
+    """
+    Run every benchmark case of every model.
+
+    Returns:
+        dict: the median seconds per call of each case, keyed by ``"<model>.<case>"``
+    """
+    results = {}
+    for model in MODELS:
+        for name, case in model_cases(model, rows).items():
+            results['{}.{}'.format(model.__name__, name)] = time_case(repeat=repeat, **case)
+        model.objects.all().delete()
+    return results
@@ -0,0 +1,76 @@
+"""
+Timing and baseline comparison for the {{ cookiecutter.app_name }} benchmarks.
+"""
+
+import json
+import math
+import statistics
+import time
+
+
+def time_case(func, setup=None, repeat=5, number=1):
+    """
+    Time a benchmark case.
+
+    Args:
+        func (callable): the operation to time; it is called ``number`` times per repetition.
+        setup (callable): run before each repetition, without being timed.
+        repeat (int): how many repetitions to time.
+        number (int): how many calls each repetition makes.
+
+    Returns:
+        float: the median time of one call over the repetitions, in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return statistics.median(timings)
+
+
+def percentile(values, percent):
+    """
+    Get the ``percent`` percentile of ``values``, by the nearest-rank method.
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * percent / 100), 1) - 1]
+
+
+def load_results(path):
+    """
+    Load benchmark results saved by ``save_results``.
+    """
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def save_results(results, path):
+    """
+    Save benchmark results, a dict of seconds per call keyed by case name, as JSON.
+    """
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+        results_file.write('\n')
+
+
+def compare(results, baseline, threshold):
+    """
+    Find the cases which are slower than the baseline by more than ``threshold``.
+
+    Args:
+        results (dict): seconds per call of the current run, keyed by case name.
+        baseline (dict): seconds per call of the baseline run, keyed by case name.
+        threshold (float): the allowed slowdown, as a fraction of the baseline time (0.25 is 25% slower).
+
+    Returns:
+        list: a ``(name, baseline seconds, current seconds)`` tuple for each regression, sorted by name
+    """
+    return [
+        (name, baseline[name], seconds)
+        for name, seconds in sorted(results.items())
+        if name in baseline and seconds > baseline[name] * (1 + threshold)
+    ]
@@ -0,0 +1,5 @@
+"""
+Pytest configuration for all of the tests of {{ cookiecutter.app_name }}.
+"""
+
+pytest_plugins = ['test_utils.memory', 'test_utils.queries', 'test_utils.startup']
@@ -0,0 +1,5 @@
+"""
+An in-process HTTP load test of {{ cookiecutter.app_name }} through its WSGI application, with no server or network.
+
+Run it with ``make loadtest``; see ``python -m loadtest --help`` for the options.
+"""
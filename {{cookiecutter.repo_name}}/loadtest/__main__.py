@@ -0,0 +1,64 @@
+"""
+Load test {{ cookiecutter.app_name }} in this process, through its WSGI application, against a test database.
+
+Prints a JSON summary of the run: the requests per second, and the latency percentiles in
+milliseconds and database queries per request of all the requests and of each target page.
+Every page is requested equally often unless ``--mix`` gives their weights.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import django
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+
+from loadtest.runner import parse_mix, run
+
+
+def main(argv=None):
+    """
+    Run the load test, returning a non-zero exit status if any request was answered with an error.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=1000, help='the number of requests to measure')
+    parser.add_argument('--concurrency', type=int, default=10, help='the number of threads sending requests')
+    parser.add_argument('--warmup', type=int, default=100, help='the number of requests to send before measuring')
+    parser.add_argument('--rows', type=int, default=100, help='the number of objects of each model to create')
+    parser.add_argument('--mix', help='the weights of the pages to request, like "home=3,foo-list=1"')
+    parser.add_argument('--seed', type=int, default=0, help='the seed of the random choice of pages')
+    parser.add_argument('--output', help='a file to write the summary to, as well as printing it')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'test_settings')
+    django.setup()
+    # The targets import the models, which need the app registry that django.setup() populates.
+    from loadtest.targets import populate, target_urls  # pylint: disable=import-outside-toplevel
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.rows)
+        urls = target_urls()
+        try:
+            weights = parse_mix(args.mix, urls) if args.mix else {name: 1 for name in urls}
+        except ValueError as error:
+            parser.error(str(error))
+        summary = run(
+            get_wsgi_application(), urls, weights,
+            requests=args.requests, concurrency=args.concurrency, warmup=args.warmup, seed=args.seed,
+        )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    text = json.dumps(summary, indent=2, sort_keys=True)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
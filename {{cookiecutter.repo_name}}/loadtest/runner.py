@@ -0,0 +1,159 @@
+"""
+Load generation against a WSGI application, in this process, from a pool of threads.
+
+Each thread sends its next request as soon as the last is answered, calling the application
+directly with a WSGI environ, so the results measure Django's request handling and the views
+alone.  The database queries of each request are counted on every connection of its thread.
+"""
+
+import bisect
+import itertools
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from wsgiref.util import setup_testing_defaults
+
+from django.db import connections
+
+from benchmarks.harness import percentile
+
+Result = namedtuple('Result', ['name', 'status', 'seconds', 'queries'])
+
+
+class QueryCounter:
+    """
+    A database execute wrapper which counts the queries run through it.
+    """
+
+    def __init__(self):
+        """
+        Start counting from zero.
+        """
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Count a query, and run it.
+        """
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def parse_mix(spec, urls):
+    """
+    Parse a request mix like ``"home=3,foo-list=1"`` into the weights of the targets named, keyed by name.
+
+    Raises:
+        ValueError: if a target isn't one of ``urls``, or a weight isn't a positive number
+    """
+    weights = {}
+    for item in spec.split(','):
+        name, _, text = item.strip().partition('=')
+        if name not in urls:
+            raise ValueError('Unknown target {!r}; the targets are {}'.format(name, ', '.join(urls)))
+        try:
+            weight = float(text)
+        except ValueError:
+            weight = 0
+        if weight <= 0:
+            raise ValueError('The weight of {} must be a positive number, not {!r}'.format(name, text))
+        weights[name] = weight
+    return weights
+
+
+def request_sequence(weights, count, seed=0):
+    """
+    Choose the names of ``count`` targets at random, in proportion to their weights; the same for the same seed.
+    """
+    names = sorted(weights)
+    cumulative = list(itertools.accumulate(weights[name] for name in names))
+    choose = random.Random(seed).random
+    return [names[bisect.bisect(cumulative, choose() * cumulative[-1])] for _ in range(count)]
+
+
+def wsgi_get(application, url):
+    """
+    Send a GET request for ``url``, a path with an optional query string, to a WSGI application.
+
+    Returns:
+        int: the status code of the response, whose body is read and discarded
+    """
+    path, _, query_string = url.partition('?')
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query_string, 'HTTP_HOST': 'testserver'}
+    setup_testing_defaults(environ)
+    statuses = []
+
+    def start_response(status, headers, exc_info=None):  # pylint: disable=unused-argument
+        statuses.append(int(status.split(' ', 1)[0]))
+
+    response = application(environ, start_response)
+    try:
+        # Streamed bodies, and their queries, are only produced as they're read.
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+    return statuses[0]
+
+
+def send(application, name, url):
+    """
+    Request ``url`` from a WSGI application, timing it and counting its queries.
+    """
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        start = time.perf_counter()
+        status = wsgi_get(application, url)
+        seconds = time.perf_counter() - start
+    return Result(name, status, seconds, counter.count)
+
+
+def summarize(results):
+    """
+    Summarize the number of requests, errors, latencies and queries per request of a list of results.
+    """
+    latencies = [result.seconds * 1000 for result in results]
+    return {
+        'requests': len(results),
+        'errors': sum(result.status >= 400 for result in results),
+        'p50_ms': percentile(latencies, 50),
+        'p90_ms': percentile(latencies, 90),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': max(latencies),
+        'queries_per_request': sum(result.queries for result in results) / len(results),
+    }
+
+
+def run(application, urls, weights, requests=1000, concurrency=10, warmup=100, seed=0):
+    """
+    Send ``requests`` GET requests for ``urls`` in the mix of ``weights``, from ``concurrency`` threads at once.
+
+    ``warmup`` requests of the same mix are sent first and left out of the results, so that
+    caches are filled and templates compiled as they would be in a long-running worker.
+
+    Returns:
+        dict: the ``summarize()`` of all the requests, with the ``concurrency``, ``seconds`` and
+        ``requests_per_second`` of the run, and that of each target's requests under ``targets``
+    """
+    sequence = request_sequence(weights, warmup + requests, seed)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda name: send(application, name, urls[name]), sequence[:warmup]))
+        start = time.perf_counter()
+        results = list(executor.map(lambda name: send(application, name, urls[name]), sequence[warmup:]))
+        seconds = time.perf_counter() - start
+    summary = summarize(results)
+    summary.update({
+        'concurrency': concurrency,
+        'seconds': seconds,
+        'requests_per_second': len(results) / seconds,
+        'targets': {
+            name: summarize([result for result in results if result.name == name])
+            for name in sorted({result.name for result in results})
+        },
+    })
+    return summary
@@ -0,0 +1,45 @@
+"""
+The pages of {{ cookiecutter.app_name }} which the load test requests, and the objects it creates for them.
+{%- set has_models = cookiecutter.models != "Comma-separated list of models" %}
+{%- set api = has_models and cookiecutter.model_api == "yes" %}
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if has_models and '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+"""
+
+from collections import OrderedDict
+{%- if api %}
+
+from django.urls import reverse
+{%- endif %}
+{%- if models %}
+
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+{%- endif %}
+
+MODELS = [{{ models|join(', ') }}]
+
+
+def populate(rows):
+    """
+    Create ``rows`` objects of each model, for the pages to show.
+    """
+    for model in MODELS:
+        model.objects.bulk_create_chunked(model() for _ in range(rows))
+
+
+def target_urls():
+    """
+    Get the URL of each page to request, keyed by the name which request mixes give it.
+    """
+    urls = OrderedDict([('home', '/')])
+{%- if api %}
+    for model in MODELS:
+        name = model._meta.model_name
+        urls[name + '-list'] = reverse(name + '-list')
+        pk = model.objects.values_list('pk', flat=True).first()
+        if pk is not None:
+            urls[name + '-detail'] = reverse(name + '-detail', kwargs={'pk': pk})
+{%- endif %}
+    return urls
@@ -5,6 +5,7 @@ In a real-world use case, apps in this project are installed into other
 Django applications, so these settings will not be used.
 """
 
+import os
 from os.path import abspath, dirname, join
 
 
@@ -15,6 +16,12 @@ def root(*args):
     return join(abspath(dirname(__file__)), *args)
 
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -23,7 +30,24 @@ DATABASES = {
         'PASSWORD': '',
         'HOST': '',
         'PORT': '',
-    }
+        'TEST': {
+            # Tests use an in-memory database by default.  Set TEST_DATABASE_NAME to a file name
+            # (e.g. "test.db") to keep the test databases between runs of pytest --reuse-db.
+            'NAME': os.environ.get('TEST_DATABASE_NAME', ':memory:'),
+        },
+    },
+{%- if cookiecutter.models != "Comma-separated list of models" and cookiecutter.read_replicas == "yes" %}
+    # A database of its own, not a test mirror of the default one, so the tests can tell which
+    # of them the router sent each query to; only tests/test_routers.py routes to it.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'replica.db',
+        'USER': '',
+        'PASSWORD': '',
+        'HOST': '',
+        'PORT': '',
+    },
+{%- endif %}
 }
 
 INSTALLED_APPS = (
@@ -39,3 +63,15 @@ LOCALE_PATHS = [
 ROOT_URLCONF = '{{ cookiecutter.app_name }}.urls'
 
 SECRET_KEY = 'insecure-secret-key'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {
+            # Compile each template once per process, rather than on every render, as in production.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', ['django.template.loaders.app_directories.Loader']),
+            ],
+        },
+    },
+]
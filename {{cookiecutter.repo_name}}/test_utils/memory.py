@@ -0,0 +1,298 @@
+"""
+Memory budgets, allocation reports and memory growth checks for tests, measured with tracemalloc.
+
+This module is loaded as a pytest plugin by the project's ``conftest.py``.  It provides the
+``memory_budget`` marker, which fails a test whose peak memory allocation is over ``limit_kb``
+kilobytes.  At the end of the run, the tests with a budget which had the highest peaks, and the
+call sites of the memory they left allocated, are summarized; the ``--memory-report`` option
+traces every test instead, and reports more of them::
+
+    @pytest.mark.memory_budget(512)
+    def test_export():
+        export_report()
+
+``MemoryBudget`` applies the same check to any block of code, and ``check_memory_growth`` fails
+if calling a function over and over keeps more memory allocated each time, as a leak would.
+
+Tracing allocations slows Python code down several times over, so only the tests with a budget
+are traced unless a report is asked for.  Only memory allocated by Python is traced, not that
+of libraries with allocators of their own, like SQLite's.
+"""
+
+import gc
+import tracemalloc
+from collections import Counter
+from contextlib import ContextDecorator
+
+import pytest
+
+# How many tests and call sites to summarize by default.
+SUMMARY_LIMIT = 3
+
+# Allocations made by these files are the tracing's own, pytest's hook calls' or the import system's.
+IGNORED_FILES = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '*/pluggy/*'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+
+class MemoryBudgetExceeded(AssertionError):
+    """
+    Raised when code allocates more memory than its budget allows, or keeps allocating more.
+    """
+
+
+def kilobytes(size):
+    """
+    Format a number of bytes as kilobytes.
+    """
+    return '{:.1f} KiB'.format(size / 1024)
+
+
+class MemoryTrace:
+    """
+    Trace the memory allocated within a with-statement.
+
+    Afterwards, ``peak`` is the most memory allocated at once within it, in bytes, and
+    ``call_sites()`` gives the lines which allocated the memory still allocated at its end.
+    Nested in another trace, the peak may include the outer trace's peak before this one began.
+    """
+
+    def __init__(self):
+        """
+        Prepare to trace, with nothing traced yet.
+        """
+        self.started = False
+        self.baseline = 0
+        self.peak = 0
+        self.before = None
+        self.after = None
+
+    def __enter__(self):
+        """
+        Start tracing allocations, unless they're already being traced, and note what's allocated.
+        """
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+        self.before = tracemalloc.take_snapshot().filter_traces(IGNORED_FILES)
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Record the peak and what's still allocated, and stop tracing if this trace started it.
+        """
+        self.peak = max(tracemalloc.get_traced_memory()[1] - self.baseline, 0)
+        self.after = tracemalloc.take_snapshot().filter_traces(IGNORED_FILES)
+        if self.started:
+            tracemalloc.stop()
+        return False
+
+    def call_sites(self, limit=10):
+        """
+        Get the ``limit`` lines which allocated the most of the memory left allocated by the traced code.
+
+        Returns:
+            list: a ``("<file>:<line>", bytes)`` tuple for each line, the largest first
+        """
+        statistics = self.after.compare_to(self.before, 'lineno')
+        return [
+            ('{}:{}'.format(statistic.traceback[0].filename, statistic.traceback[0].lineno), statistic.size_diff)
+            for statistic in statistics[:limit]
+            if statistic.size_diff > 0
+        ]
+
+
+def describe_call_sites(call_sites):
+    """
+    Format call sites from ``MemoryTrace.call_sites()`` as lines of a report.
+    """
+    return ['  {:>12}  {}'.format(kilobytes(size), site) for site, size in call_sites]
+
+
+class MemoryBudget(ContextDecorator):
+    """
+    Fail if the wrapped code's peak memory allocation is over ``limit_kb`` kilobytes.
+
+    Usable as a context manager, or as a decorator of a test or of a function under test.
+    """
+
+    def __init__(self, limit_kb):
+        """
+        Set the budget.
+        """
+        self.limit_kb = limit_kb
+        self.trace = None
+
+    def __enter__(self):
+        """
+        Start tracing memory.
+        """
+        self.trace = MemoryTrace().__enter__()
+        return self.trace
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Stop tracing memory, and check the peak if the wrapped code succeeded.
+        """
+        self.trace.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.check(self.trace)
+        return False
+
+    def check(self, trace):
+        """
+        Check the peak of a finished trace against this budget.
+
+        Raises:
+            MemoryBudgetExceeded: if the peak is over budget
+        """
+        if trace.peak > self.limit_kb * 1024:
+            problems = ['A peak of {} was allocated, but the budget is {}; still allocated at the end:'.format(
+                kilobytes(trace.peak), kilobytes(self.limit_kb * 1024))]
+            problems.extend(describe_call_sites(trace.call_sites()))
+            raise MemoryBudgetExceeded('\n'.join(problems))
+
+
+def check_memory_growth(func, iterations=20, warmup=5, max_growth_kb=1):
+    """
+    Fail if calling ``func`` repeatedly leaves more memory allocated after each call, as a leak would.
+
+    ``func`` is called ``warmup`` times first, to fill any caches and load any modules it uses.
+    Over the next ``iterations`` calls, garbage is collected after each and the memory still
+    allocated noted.  The least noted in the second half of the calls may exceed the least noted
+    in the first half by no more than ``max_growth_kb`` kilobytes per call between them, so that
+    memory which is freed in bulk now and then, like that of a bounded cache, isn't counted.
+
+    Raises:
+        MemoryBudgetExceeded: if the memory allocated grows faster than that
+    """
+    for _ in range(warmup):
+        func()
+    sizes = []
+    with MemoryTrace() as trace:
+        for _ in range(iterations):
+            func()
+            gc.collect()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+    half = max(iterations // 2, 1)
+    growth = (min(sizes[half:] or sizes) - min(sizes[:half])) / half
+    if growth > max_growth_kb * 1024:
+        problems = ['Memory grew by {} per call over {} calls, but at most {} is allowed; grown by:'.format(
+            kilobytes(growth), iterations, kilobytes(max_growth_kb * 1024))]
+        problems.extend(describe_call_sites(trace.call_sites()))
+        raise MemoryBudgetExceeded('\n'.join(problems))
+
+
+class MemoryReport:
+    """
+    The peaks of the tests traced, and the call sites of the memory they left allocated, for the end of the run.
+    """
+
+    def __init__(self, limit, every_test=False):
+        """
+        Start with nothing traced.
+
+        ``limit`` is how many tests and call sites to report, and ``every_test`` whether to trace
+        the tests without a budget too.
+        """
+        self.limit = limit
+        self.every_test = every_test
+        self.peaks = {}
+        self.budgets = {}
+        self.call_sites = Counter()
+
+    def add(self, nodeid, trace, limit_kb=None):
+        """
+        Record the trace of a test, and its budget if it has one.
+        """
+        self.peaks[nodeid] = trace.peak
+        if limit_kb is not None:
+            self.budgets[nodeid] = limit_kb * 1024
+        for site, size in trace.call_sites(self.limit):
+            self.call_sites[site] += size
+
+    def describe_peak(self, nodeid):
+        """
+        Format a test's peak, out of its budget if it has one.
+        """
+        if nodeid in self.budgets:
+            return '{:>12} of {:>12}'.format(kilobytes(self.peaks[nodeid]), kilobytes(self.budgets[nodeid]))
+        return '{:>12}'.format(kilobytes(self.peaks[nodeid]))
+
+    def lines(self):
+        """
+        Get the lines of the report.
+        """
+        lines = ['Highest peak memory allocation of the tests traced:']
+        peaks = sorted(self.peaks, key=self.peaks.get, reverse=True)
+        lines.extend('  {}  {}'.format(self.describe_peak(nodeid), nodeid) for nodeid in peaks[:self.limit])
+        lines.append('Call sites of the most memory left allocated by the tests traced:')
+        lines.extend(describe_call_sites(self.call_sites.most_common(self.limit)))
+        return lines
+
+
+def pytest_addoption(parser):
+    """
+    Add the --memory-report option.
+    """
+    parser.getgroup('memory').addoption(
+        '--memory-report', type=int, nargs='?', const=10, default=None, metavar='N',
+        help='trace the memory allocated by every test, not just those with a budget, and report the N '
+             '(10 by default) tests with the highest peaks and call sites of the most memory left allocated',
+    )
+
+
+def pytest_configure(config):
+    """
+    Register the memory_budget marker, and start the report of the tests traced.
+    """
+    config.addinivalue_line(
+        'markers',
+        'memory_budget(limit_kb): fail if the peak memory allocated by the test is over limit_kb kilobytes',
+    )
+    limit = config.getoption('memory_report')
+    config.memory_report = MemoryReport(limit or SUMMARY_LIMIT, every_test=bool(limit))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Trace the memory of the test itself, excluding its fixtures, if it has a budget or every test is traced.
+    """
+    marker = item.get_closest_marker('memory_budget')
+    report = item.config.memory_report
+    if marker is None and not report.every_test:
+        yield
+        return
+    budget = None if marker is None else MemoryBudget(*marker.args, **marker.kwargs)
+    with MemoryTrace() as trace:
+        outcome = yield
+    # Failed tests are reported too.
+    report.add(item.nodeid, trace, None if budget is None else budget.limit_kb)
+    # A failure of the test itself is reported as it is, without checking the budget.
+    outcome.get_result()
+    if budget is None:
+        return
+    try:
+        budget.check(trace)
+    except MemoryBudgetExceeded as error:
+        message = str(error)
+    else:
+        return
+    # Failed outside the except clause, so that the report doesn't chain the two exceptions.
+    pytest.fail(message, pytrace=False)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Print the memory report, if any tests were traced.
+    """
+    if config.memory_report.peaks:
+        terminalreporter.section('memory')
+        for line in config.memory_report.lines():
+            terminalreporter.write_line(line)
@@ -0,0 +1,336 @@
+"""
+Static checks of an app's migrations for operations which are slow on large tables.
+
+Run by ``make check_migrations``.  The migrations and the rest of the app's code are parsed,
+not imported, so the checks need neither Django settings nor a database.  They report:
+
+* ``M001``: a field which the app's code filters or orders by, but which no index starts with.
+* ``M002``: an operation which may rewrite a whole table, locking it meanwhile: adding a
+  column which isn't nullable, or altering a column, of a table created by an earlier migration.
+* ``M003``: a data migration which saves, creates, or deletes rows one at a time in a loop,
+  instead of in bulk with ``update()``, ``bulk_update()``, ``bulk_create()`` or ``delete()``.
+
+The checks only see field names, so a field filtered by on one model is reported on every
+model which has an unindexed field of that name.  A field which is only filtered by together
+with an exact match of a unique field of its model, in the same call, isn't reported, since
+the unique field's index finds the one row to check it on.  Add ``# noqa`` to the reported line of a
+problem which has been considered, such as an ``AlterField`` of a table known to be small.
+"""
+
+import argparse
+import ast
+import os
+import sys
+from collections import namedtuple
+
+Problem = namedtuple('Problem', ['path', 'line', 'code', 'message'])
+
+# Query set methods whose keyword arguments are lookups of the fields filtered by.
+FILTER_METHODS = {'exclude', 'filter', 'get', 'get_or_create', 'update_or_create'}
+
+# Methods which write a single row, and so shouldn't be called for each row of a table.
+ROW_METHODS = {'create', 'delete', 'save'}
+
+# Field types which Django indexes unless they're given db_index=False.
+INDEXED_FIELD_TYPES = {'ForeignKey', 'OneToOneField'}
+
+
+def call_name(node):
+    """
+    Get the name of the function or method which a call calls, without any module or object.
+    """
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    return None
+
+
+def keyword(call, name, default=None):
+    """
+    Get the node of a keyword argument of a call.
+    """
+    for argument in call.keywords:
+        if argument.arg == name:
+            return argument.value
+    return default
+
+
+def literal(node, default=None):
+    """
+    Get the value of a node which is a Python literal, or ``default`` if it isn't one.
+    """
+    if node is None:
+        return default
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return default
+
+
+def field_is_indexed(field):
+    """
+    Check whether a field definition, such as ``models.CharField(db_index=True)``, gets an index of its own.
+    """
+    if any(literal(keyword(field, option)) for option in ('db_index', 'primary_key', 'unique')):
+        return True
+    return call_name(field) in INDEXED_FIELD_TYPES and literal(keyword(field, 'db_index'), True)
+
+
+def field_is_unique(field):
+    """
+    Check whether a field definition, such as ``models.DateField(unique=True)``, makes each value unique.
+    """
+    return bool(literal(keyword(field, 'unique')) or literal(keyword(field, 'primary_key'))) or \
+        call_name(field) == 'OneToOneField'
+
+
+def index_lead(index):
+    """
+    Get the first field of an index definition, such as ``models.Index(fields=['-created'])``.
+    """
+    fields = literal(keyword(index, 'fields'), [])
+    return fields[0].lstrip('-') if fields else None
+
+
+def together_leads(value):
+    """
+    Get the first fields of a ``unique_together`` or ``index_together`` option.
+    """
+    value = literal(value, ())
+    if value and isinstance(next(iter(value)), str):
+        value = [value]
+    return {fields[0] for fields in value if fields}
+
+
+def migration_operations(tree):
+    """
+    Get the calls which are the elements of the ``operations`` list of a migration module.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.List) and any(
+                isinstance(target, ast.Name) and target.id == 'operations' for target in node.targets):
+            return [operation for operation in node.value.elts if isinstance(operation, ast.Call)]
+    return []
+
+
+class MigrationState:
+    """
+    The fields and indexes of an app's models, as built up by its migrations.
+    """
+
+    def __init__(self):
+        """
+        Start with no models.
+        """
+        # Where each field was last defined, and whether the definition gives it an index and makes
+        # it unique, keyed by (lowercase model name, field name).
+        self.fields = {}
+        # The first field of each named index, keyed by (lowercase model name, index name).
+        self.indexes = {}
+        # The first fields of the unique_together and index_together options of each model.
+        self.together = {}
+
+    def define(self, model, name, field, path):
+        """
+        Record the definition of a field.
+        """
+        self.fields[(model, name)] = (path, field.lineno, field_is_indexed(field), field_is_unique(field))
+
+    def create(self, model, operation, path):
+        """
+        Record the fields and indexes of a ``CreateModel`` operation.
+        """
+        for field in getattr(keyword(operation, 'fields'), 'elts', []):
+            if isinstance(field, ast.Tuple) and len(field.elts) == 2 and isinstance(field.elts[1], ast.Call):
+                self.define(model, literal(field.elts[0]), field.elts[1], path)
+        options = keyword(operation, 'options')
+        if not isinstance(options, ast.Dict):
+            return
+        for key, value in zip(map(literal, options.keys), options.values):
+            if key == 'indexes':
+                for index in getattr(value, 'elts', []):
+                    self.indexes[(model, literal(keyword(index, 'name')))] = index_lead(index)
+            elif key in ('index_together', 'unique_together'):
+                self.together.setdefault(model, set()).update(together_leads(value))
+
+    def remove_model(self, model):
+        """
+        Forget a deleted model.
+        """
+        for mapping in (self.fields, self.indexes):
+            for key in [key for key in mapping if key[0] == model]:
+                del mapping[key]
+        self.together.pop(model, None)
+
+    def is_unique(self, model, name):
+        """
+        Check whether a field of a model makes each value unique.
+        """
+        return name in ('pk', 'id') or (model, name) in self.fields and self.fields[(model, name)][3]
+
+    def unindexed_fields(self):
+        """
+        Yield the (model, field, path, line) of every field which no index starts with.
+        """
+        leads = {(model, lead) for (model, _), lead in self.indexes.items()}
+        leads.update((model, lead) for model, fields in self.together.items() for lead in fields)
+        for (model, name), (path, line, indexed, _) in sorted(self.fields.items()):
+            if not indexed and (model, name) not in leads:
+                yield model, name, path, line
+
+
+def apply_operations(state, operations, path):
+    """
+    Update the state with the operations of one migration, yielding the table rewrites they cause.
+    """
+    created = set()
+    for operation in operations:
+        kind = call_name(operation)
+        model = (literal(keyword(operation, 'model_name')) or literal(keyword(operation, 'name'), '')).lower()
+        if kind == 'CreateModel':
+            created.add(model)
+            state.create(model, operation, path)
+        elif kind in ('AddField', 'AlterField'):
+            name = literal(keyword(operation, 'name'))
+            field = keyword(operation, 'field')
+            if not isinstance(field, ast.Call):
+                continue
+            state.define(model, name, field, path)
+            if model in created:
+                continue
+            if kind == 'AlterField':
+                yield operation.lineno, 'AlterField of {}.{} may rewrite the table, e.g. to change the ' \
+                    "column's type or make it NOT NULL; check its SQL with sqlmigrate".format(model, name)
+            elif not literal(keyword(field, 'null')):
+                yield operation.lineno, 'AddField of {}.{} adds a NOT NULL column, which rewrites the table ' \
+                    'on some databases; add it with null=True, fill it in batches, and then make it NOT ' \
+                    'NULL'.format(model, name)
+        elif kind == 'RemoveField':
+            state.fields.pop((model, literal(keyword(operation, 'name'))), None)
+        elif kind == 'RenameField':
+            definition = state.fields.pop((model, literal(keyword(operation, 'old_name'))), None)
+            if definition:
+                state.fields[(model, literal(keyword(operation, 'new_name')))] = definition
+        elif kind == 'DeleteModel':
+            state.remove_model(model)
+        elif kind == 'AddIndex':
+            index = keyword(operation, 'index')
+            state.indexes[(model, literal(keyword(index, 'name')))] = index_lead(index)
+        elif kind == 'RemoveIndex':
+            state.indexes.pop((model, literal(keyword(operation, 'name'))), None)
+        elif kind in ('AlterIndexTogether', 'AlterUniqueTogether'):
+            option = 'index_together' if kind == 'AlterIndexTogether' else 'unique_together'
+            state.together[model] = together_leads(keyword(operation, option))
+
+
+def row_by_row_writes(tree, operations):
+    """
+    Yield the line and message of each single-row write in a loop of a ``RunPython`` function.
+    """
+    functions = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    names = set()
+    for operation in operations:
+        if call_name(operation) == 'RunPython':
+            arguments = operation.args + [keyword(operation, 'code'), keyword(operation, 'reverse_code')]
+            names.update(argument.id for argument in arguments if isinstance(argument, ast.Name))
+    for name in sorted(names & set(functions)):
+        for loop in ast.walk(functions[name]):
+            if not isinstance(loop, (ast.For, ast.While)):
+                continue
+            for node in ast.walk(loop):
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and \
+                        node.func.attr in ROW_METHODS:
+                    yield node.lineno, '{}() calls {}() for each row in a loop; write the rows in bulk, ' \
+                        'in batches'.format(name, node.func.attr)
+
+
+def lookups(app_dir):
+    """
+    Find the fields which the app's code, other than its migrations, filters or orders by.
+
+    Returns:
+        dict: the uses of each field, keyed by field name, as tuples of the path and line of the
+        call, and the fields which the same call matches exactly
+    """
+    found = {}
+    for path in python_files(app_dir, migrations=False):
+        with open(path) as source:
+            tree = ast.parse(source.read(), path)
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            exact = set()
+            if call_name(node) in FILTER_METHODS:
+                names = [argument.arg for argument in node.keywords if argument.arg]
+                exact = {name.split('__')[0] for name in names if name.split('__')[1:] in ([], ['exact'])}
+            elif call_name(node) == 'order_by':
+                names = [value.lstrip('-') for value in map(literal, node.args) if isinstance(value, str)]
+            else:
+                continue
+            for name in names:
+                name = name.split('__')[0]
+                if name and name not in ('pk', 'id'):
+                    found.setdefault(name, []).append((path, node.lineno, exact - {name}))
+    return found
+
+
+def python_files(app_dir, migrations):
+    """
+    Get the paths of the Python modules of an app, either just its migrations or all but its migrations.
+    """
+    paths = []
+    for directory, subdirectories, files in os.walk(app_dir):
+        subdirectories.sort()
+        in_migrations = os.path.basename(directory) == 'migrations'
+        if in_migrations != migrations:
+            continue
+        paths.extend(os.path.join(directory, name) for name in sorted(files) if name.endswith('.py'))
+    return paths
+
+
+def check_app(app_dir):
+    """
+    Check the migrations of the app in ``app_dir``, in the order of their file names.
+
+    Returns:
+        list: the ``Problem`` found, except any reported on a line which has a ``# noqa`` comment
+    """
+    state = MigrationState()
+    problems = []
+    sources = {}
+    for path in python_files(app_dir, migrations=True):
+        with open(path) as source:
+            sources[path] = source.read().splitlines()
+        tree = ast.parse('\n'.join(sources[path]), path)
+        operations = migration_operations(tree)
+        for line, message in apply_operations(state, operations, path):
+            problems.append(Problem(path, line, 'M002', message))
+        for line, message in row_by_row_writes(tree, operations):
+            problems.append(Problem(path, line, 'M003', message))
+
+    used = lookups(app_dir)
+    for model, name, path, line in state.unindexed_fields():
+        uses = [use for use in used.get(name, []) if not any(state.is_unique(model, other) for other in use[2])]
+        if uses:
+            problems.append(Problem(path, line, 'M001', '{}.{} is filtered or ordered by at {}:{}, but no index '
+                                                        'starts with it'.format(model, name, *uses[0][:2])))
+    return sorted(problem for problem in problems if '# noqa' not in sources[problem.path][problem.line - 1])
+
+
+def main(argv=None):
+    """
+    Check the migrations of the given apps, returning a non-zero exit status if there are any problems.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('apps', nargs='+', metavar='app', help='the directory of a Django app')
+    args = parser.parse_args(argv)
+
+    problems = [problem for app_dir in args.apps for problem in check_app(app_dir)]
+    for problem in problems:
+        print('{}:{}: {} {}'.format(*problem))
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
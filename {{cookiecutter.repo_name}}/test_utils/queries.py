@@ -0,0 +1,194 @@
+"""
+Query capturing, query budgets, and N+1 query detection for tests.
+
+This module is loaded as a pytest plugin by the project's ``conftest.py``.  It provides the
+``query_capture`` fixture and the ``query_budget`` marker, which fails a test that runs more
+than ``limit`` queries, or the same shape of query (the same SQL apart from its parameters)
+with different parameters more than ``max_repeats`` times.  Queries are captured from the
+test's database connection, so the marker needs database access, from the ``django_db``
+marker or the ``db`` fixture::
+
+    @pytest.mark.django_db
+    @pytest.mark.query_budget(3)
+    def test_list_view(client):
+        client.get('/')
+
+    @pytest.mark.django_db
+    @pytest.mark.query_budget(max_repeats=1)
+    def test_no_n_plus_one():
+        render_report()
+
+The same checks can wrap any block of code, or a view, with ``QueryBudget``.
+"""
+
+import re
+from collections import Counter, defaultdict
+from contextlib import ContextDecorator
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+# Quoted strings and numbers, which are the parameters of queries as Django logs them.
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# The fixtures which give a test database access, besides the django_db marker.
+DB_FIXTURES = {'db', 'transactional_db', 'django_db_reset_sequences'}
+
+# IN lists, whose length varies with the number of parameters.
+SQL_IN_LIST = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised when code runs more queries than its budget allows.
+    """
+
+
+def capture_queries(using=DEFAULT_DB_ALIAS):
+    """
+    Get a context manager which records the queries run inside it.
+
+    The queries are in its ``captured_queries`` list, as dicts with ``sql`` and ``time`` keys.
+    """
+    return CaptureQueriesContext(connections[using])
+
+
+def sql_shape(sql):
+    """
+    Get the shape of an SQL statement: the statement with its parameters replaced by ``?``.
+    """
+    return SQL_IN_LIST.sub('IN (...)', SQL_LITERAL.sub('?', sql))
+
+
+def repeated_queries(queries, max_repeats=1):
+    """
+    Find the query shapes which were run more than ``max_repeats`` times, a sign of N+1 queries.
+
+    Only shapes run with more than one set of parameters count; the same query repeated exactly
+    is redundant, but isn't a query per object.
+
+    Args:
+        queries (list): captured queries, as dicts with an ``sql`` key.
+        max_repeats (int): how many times each query shape is allowed.
+
+    Returns:
+        dict: the number of times each offending shape was run, keyed by shape
+    """
+    counts = Counter()
+    statements = defaultdict(set)
+    for query in queries:
+        shape = sql_shape(query['sql'])
+        counts[shape] += 1
+        statements[shape].add(query['sql'])
+    return {shape: count for shape, count in counts.items() if count > max_repeats and len(statements[shape]) > 1}
+
+
+def check_queries(queries, limit=None, max_repeats=None):
+    """
+    Check captured queries against a budget.
+
+    Args:
+        queries (list): captured queries, as dicts with an ``sql`` key.
+        limit (int): the number of queries allowed, or None for no limit.
+        max_repeats (int): how many times each query shape is allowed, or None for no limit.
+
+    Raises:
+        QueryBudgetExceeded: if the queries are over either budget
+    """
+    problems = []
+    if limit is not None and len(queries) > limit:
+        problems.append('{} queries were run, but the budget is {}:'.format(len(queries), limit))
+        problems.extend('  {}'.format(query['sql']) for query in queries)
+    if max_repeats is not None:
+        for shape, count in sorted(repeated_queries(queries, max_repeats).items()):
+            problems.append('Possible N+1 query, run {} times (at most {} allowed): {}'.format(
+                count, max_repeats, shape))
+    if problems:
+        raise QueryBudgetExceeded('\n'.join(problems))
+
+
+class QueryBudget(ContextDecorator):
+    """
+    Fail if the wrapped code runs more queries than its budget allows.
+
+    Usable as a context manager, or as a decorator of a test or of a view under test.
+    See ``check_queries`` for the arguments.
+    """
+
+    def __init__(self, limit=None, max_repeats=None, using=DEFAULT_DB_ALIAS):
+        """
+        Set the budget.
+        """
+        self.limit = limit
+        self.max_repeats = max_repeats
+        self.using = using
+        self.capture = None
+
+    def __enter__(self):
+        """
+        Start capturing queries.
+        """
+        self.capture = capture_queries(self.using)
+        return self.capture.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Stop capturing queries, and check them if the wrapped code succeeded.
+        """
+        self.capture.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            self.check(self.capture.captured_queries)
+        return False
+
+    def check(self, queries):
+        """
+        Check captured queries against this budget.
+        """
+        check_queries(queries, self.limit, self.max_repeats)
+
+
+def pytest_configure(config):
+    """
+    Register the query_budget marker.
+    """
+    config.addinivalue_line(
+        'markers',
+        'query_budget(limit=None, max_repeats=None): fail if the test runs more than limit queries, '
+        'or any shape of query with different parameters more than max_repeats times; needs django_db',
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Enforce the query_budget marker on the test itself, excluding its fixtures.
+    """
+    marker = item.get_closest_marker('query_budget')
+    if marker is None:
+        yield
+        return
+    if item.get_closest_marker('django_db') is None and not DB_FIXTURES.intersection(item.fixturenames):
+        pytest.fail('query_budget needs database access: add the django_db marker to the test', pytrace=False)
+    budget = QueryBudget(*marker.args, **marker.kwargs)
+    with capture_queries(budget.using) as captured:
+        outcome = yield
+    # A failure of the test itself is reported as it is, without checking the budget.
+    outcome.get_result()
+    try:
+        budget.check(captured.captured_queries)
+    except QueryBudgetExceeded as error:
+        message = str(error)
+    else:
+        return
+    # Failed outside the except clause, so that the report doesn't chain the two exceptions.
+    pytest.fail(message, pytrace=False)
+
+
+@pytest.fixture
+def query_capture():
+    """
+    Capture the queries run during the test; see ``capture_queries``.
+    """
+    with capture_queries() as captured:
+        yield captured
@@ -0,0 +1,73 @@
+"""
+Measurement of what installing the app costs every service at Django startup.
+
+This module is loaded as a pytest plugin by the project's ``conftest.py``.  It adds the
+``import_time_budget`` setting to the ``[pytest]`` section of ``tox.ini``: the most time, in
+milliseconds, which the app may add to ``django.setup()``.
+
+``python -X importtime`` doesn't see the modules which Django imports with ``import_module()``,
+including every app's ``apps`` and ``models`` modules, so the cost is measured instead by
+setting Django up in new interpreters with and without the app installed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Set up Django with the settings of the tests, less the apps given as arguments, and print
+# the time that took and the modules imported.
+SETUP_SCRIPT = """
+import importlib, json, os, sys, time
+start = time.perf_counter()
+import django
+from django.conf import settings
+module = importlib.import_module(os.environ['DJANGO_SETTINGS_MODULE'])
+options = {name: getattr(module, name) for name in dir(module) if name.isupper()}
+options['INSTALLED_APPS'] = [app for app in options['INSTALLED_APPS'] if app not in sys.argv[1:]]
+settings.configure(**options)
+django.setup()
+print(json.dumps([time.perf_counter() - start, sorted(sys.modules)]))
+"""
+
+
+def profile_setup(exclude=()):
+    """
+    Time ``django.setup()`` in a new interpreter, without the apps in ``exclude``.
+
+    Returns:
+        tuple: the number of seconds taken, and the names of the modules imported
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'test_settings'))
+    output = subprocess.run(
+        [sys.executable, '-c', SETUP_SCRIPT] + list(exclude),
+        stdout=subprocess.PIPE, universal_newlines=True, env=env, check=True,
+    ).stdout
+    seconds, modules = json.loads(output)
+    return seconds, modules
+
+
+def app_setup_cost(app, runs=3):
+    """
+    Measure the time which installing ``app`` adds to ``django.setup()``.
+
+    The fastest of ``runs`` setups with and without the app are compared, to discount noise.
+
+    Returns:
+        tuple: the extra number of seconds taken, and the names of the extra modules imported
+    """
+    with_app = [profile_setup() for _ in range(runs)]
+    without_app = [profile_setup(exclude=[app]) for _ in range(runs)]
+    seconds = min(run[0] for run in with_app) - min(run[0] for run in without_app)
+    modules = sorted(set(with_app[0][1]) - set(without_app[0][1]))
+    return max(seconds, 0.0), modules
+
+
+def pytest_addoption(parser):
+    """
+    Add the import_time_budget setting.
+    """
+    parser.addini(
+        'import_time_budget', 'the most time in milliseconds which installing the app may add to django.setup()',
+        default='200',
+    )
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` async JSON views, and the ASGI load test harness.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+
+import json
+
+import django
+import pytest
+from django.urls import reverse
+
+from benchmarks.asgi import run_load
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+
+pytestmark = pytest.mark.skipif(django.VERSION < (3, 1), reason='Django runs async views natively from version 3.1')
+
+
+def content(response):
+    """
+    Get the decoded JSON body of a response, streamed or not.
+    """
+    body = b''.join(response.streaming_content) if response.streaming else response.content
+    return json.loads(body.decode('utf-8'))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model', [{{ models|join(', ') }}])
+class TestAsyncViews:
+    """
+    Tests of the async list and detail views of each model.
+    """
+
+    def test_same_as_sync(self, model, client):
+        """The async views should answer with the same bodies and validators as the sync views."""
+        model.objects.bulk_create_chunked(model() for _ in range(3))
+        name = model._meta.model_name
+        pk = model.objects.values_list('pk', flat=True).first()
+        for view, kwargs, params in (('list', {}, {'limit': 2}), ('detail', {'pk': pk}, {})):
+            sync = client.get(reverse('{}-{}'.format(name, view), kwargs=kwargs), params)
+            response = client.get(reverse('{}-async-{}'.format(name, view), kwargs=kwargs), params)
+            assert response.status_code == sync.status_code == 200
+            assert response['ETag'] == sync['ETag']
+            assert content(response) == content(sync)
+
+    def test_conditional_and_errors(self, model, client):
+        """The async views should answer conditional, unsafe, invalid and missing object requests as sync views do."""
+        instance = model.objects.create()
+        name = model._meta.model_name
+        list_url = reverse('{}-async-list'.format(name))
+        detail_url = reverse('{}-async-detail'.format(name), kwargs={'pk': instance.pk})
+        for url in (list_url, detail_url):
+            assert client.get(url, HTTP_IF_NONE_MATCH=client.get(url)['ETag']).status_code == 304
+            assert client.post(url).status_code == 405
+        assert client.get(list_url, {'limit': 0}).status_code == 400
+        instance.delete()
+        assert client.get(detail_url).status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_harness():
+    """The harness should measure the throughput and latencies of both variants of a view."""
+    instance = {{ models[0] }}.objects.create()
+    for name in ('{{ models[0].lower() }}-detail', '{{ models[0].lower() }}-async-detail'):
+        result = run_load(reverse(name, kwargs={'pk': instance.pk}), requests=20, concurrency=4)
+        assert result['requests_per_second'] > 0
+        assert 0 < result['p50'] <= result['p99']
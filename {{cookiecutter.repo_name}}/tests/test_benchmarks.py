@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` benchmarks.
+"""
+
+import pytest
+
+from benchmarks.cases import MODELS, object_sizes, run_benchmarks
+from benchmarks.harness import compare, percentile
+
+
+@pytest.mark.django_db
+def test_run_benchmarks():
+    """Every case should run and produce a timing, leaving the tables empty."""
+    results = run_benchmarks(rows=10, repeat=1)
+    assert len(results) == 7 * len(MODELS)
+    assert all(seconds > 0 for seconds in results.values())
+    assert all(model.objects.count() == 0 for model in MODELS)
+
+
+@pytest.mark.django_db
+def test_object_sizes():
+    """Rows should take less memory than model instances, and the tables be left empty."""
+    sizes = object_sizes(rows=100)
+    for model in MODELS:
+        name = model.__name__
+        assert 0 < sizes[name + '.read_rows_100'] < sizes[name + '.read_instances_100']
+        assert model.objects.count() == 0
+
+
+def test_compare():
+    """Only cases slower than the baseline by more than the threshold should be regressions."""
+    baseline = {'fast': 1.0, 'slow': 1.0, 'faster': 1.0}
+    results = {'fast': 1.2, 'slow': 1.3, 'faster': 0.5, 'new': 9.0}
+    assert compare(results, baseline, threshold=0.25) == [('slow', 1.0, 1.3)]
+
+
+def test_percentile():
+    """Percentiles should be taken by the nearest-rank method."""
+    values = list(range(100, 0, -1))
+    assert (percentile(values, 50), percentile(values, 99), percentile(values, 100)) == (50, 99, 100)
+    assert percentile([3], 0) == 3
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` import and export management commands.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{%- set summaries = cookiecutter.daily_summaries == "yes" %}
+{#- The first-party imports are sorted as isort sorts them, which depends on the app's name. #}
+{%- set imports = [
+    'from ' ~ cookiecutter.app_name ~ ' import bulk_transfer',
+    'from ' ~ cookiecutter.app_name ~ '.models import ' ~ models|join(', '),
+    'from test_utils.queries import QueryBudget',
+] %}
+
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+{% for line in imports|sort %}
+{{ line }}
+{%- endfor %}
+
+MODELS = [{{ models|join(', ') }}]
+
+
+class Interrupted(Exception):
+    """Stands in for whatever stops a run part of the way through."""
+
+
+def run(command, *args):
+    """
+    Run one of the app's management commands quietly.
+    """
+    call_command('{{ cookiecutter.app_name }}_' + command, *args, stdout=StringIO(), stderr=StringIO())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('format_name', bulk_transfer.FORMATS)
+def test_round_trip(tmp_path, format_name):
+    """Exporting every model and importing it again should recreate each object as it was, ID and all."""
+    for model in MODELS:
+        model.objects.bulk_create_chunked(model() for _ in range(25))
+    for model in MODELS:
+        path = str(tmp_path / '{}.{}'.format(model.__name__, format_name))
+        expected = [obj.serialize() for obj in model.objects.order_by('pk')]
+        run('export', model.__name__, path, '--chunk-size', '10')
+        model.objects.all().delete()
+        run('import', model.__name__, path, '--batch-size', '10')
+        assert [obj.serialize() for obj in model.objects.order_by('pk')] == expected
+        assert not (tmp_path / '{}.{}.checkpoint'.format(model.__name__, format_name)).exists()
+        # The database should number new objects after the imported ones.
+        assert model.objects.create().pk > expected[-1]['id']
+
+
+@pytest.mark.django_db
+def test_export_stdout():
+    """Exporting to standard output should write one JSON object per line, and report progress to standard error."""
+    model = MODELS[0]
+    model.objects.bulk_create_chunked(model() for _ in range(5))
+    stdout, stderr = StringIO(), StringIO()
+    call_command(
+        '{{ cookiecutter.app_name }}_export', model.__name__, '-', '--format', 'jsonl', stdout=stdout, stderr=stderr
+    )
+    assert [json.loads(line)['id'] for line in stdout.getvalue().splitlines()] == list(
+        model.objects.order_by('pk').values_list('pk', flat=True))
+    assert 'Exported 5 rows' in stderr.getvalue()
+
+
+@pytest.mark.django_db
+def test_export_chunks():
+    """Exports should read a chunk of rows per query, each after the last primary key of the one before."""
+    model = MODELS[0]
+    model.objects.bulk_create_chunked(model() for _ in range(25))
+    output = StringIO()
+    writer = bulk_transfer.RecordWriter(output, 'jsonl', model.objects.all().row._fields)
+    progress = bulk_transfer.Progress(StringIO().write, 'Exported')
+    with QueryBudget(3) as captured:
+        written = bulk_transfer.export_rows(model, writer, bulk_transfer.Checkpoint(), progress, chunk_size=10)
+    assert written == 25
+    assert all('LIMIT 10' in query['sql'] for query in captured.captured_queries)
+    assert [json.loads(line)['id'] for line in output.getvalue().splitlines()] == list(
+        model.objects.order_by('pk').values_list('pk', flat=True))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('format_name', bulk_transfer.FORMATS)
+def test_export_resumes(tmp_path, monkeypatch, format_name):
+    """An interrupted export should carry on after its last checkpoint, writing the same file as one run."""
+    model = MODELS[0]
+    model.objects.bulk_create_chunked(model() for _ in range(25))
+    path = str(tmp_path / 'export.{}'.format(format_name))
+    run('export', model.__name__, path)
+    with open(path) as export:
+        expected = export.read()
+
+    write = bulk_transfer.RecordWriter.write
+    written = []
+
+    def interrupted_write(writer, row):
+        if len(written) == 13:
+            raise Interrupted()
+        written.append(row)
+        write(writer, row)
+
+    monkeypatch.setattr(bulk_transfer.RecordWriter, 'write', interrupted_write)
+    with pytest.raises(Interrupted):
+        run('export', model.__name__, path, '--chunk-size', '5')
+    monkeypatch.undo()
+    with open(path + '.checkpoint') as checkpoint:
+        assert json.load(checkpoint)['rows'] == 10
+
+    run('export', model.__name__, path, '--chunk-size', '5')
+    with open(path) as export:
+        assert export.read() == expected
+    assert not (tmp_path / 'export.{}.checkpoint'.format(format_name)).exists()
+
+
+@pytest.mark.django_db
+def test_import_resumes(tmp_path):
+    """An import stopped by a bad record should keep the batches before it, and carry on after them once it's fixed."""
+    model = MODELS[0]
+    path = tmp_path / 'import.jsonl'
+    records = ['{}'] * 25
+    records[12] = '{"created": "yesterday"}'
+    path.write_text('\n'.join(records))
+    with pytest.raises(CommandError, match='the first 10 records were imported'):
+        run('import', model.__name__, str(path), '--batch-size', '5')
+    assert model.objects.count() == 10
+
+    records[12] = '{}'
+    path.write_text('\n'.join(records))
+    run('import', model.__name__, str(path), '--batch-size', '5')
+    assert model.objects.count() == 25
+    assert not (tmp_path / 'import.jsonl.checkpoint').exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('args, message', [
+    (['Nonexistent', 'import.csv'], 'Nonexistent'),
+{%- if summaries %}
+    (['{{ models[0] }}DailySummary', 'import.csv'], '{{ models[0] }}DailySummary'),
+{%- endif %}
+    (['{{ models[0] }}', 'import.xml'], 'Unknown format'),
+    (['{{ models[0] }}', 'import.csv'], 'has no field'),
+])
+def test_import_errors(tmp_path, args, message):
+    """Unknown models, formats, and fields should be reported as command errors, before importing anything."""
+    (tmp_path / 'import.csv').write_text('id,nonexistent\n1,2\n')
+    args[1] = str(tmp_path / args[1])
+    with pytest.raises(CommandError, match=message):
+        run('import', *args)
+    assert not MODELS[0].objects.exists()
+{%- if summaries %}
+
+
+@pytest.mark.django_db
+def test_export_summaries(tmp_path):
+    """Daily summaries, which are rebuilt from their models, shouldn't be exported."""
+    with pytest.raises(CommandError, match='{{ models[0] }}DailySummary'):
+        run('export', '{{ models[0] }}DailySummary', str(tmp_path / 'export.csv'))
+{%- endif %}
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` model cache.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+
+import pytest
+from django.core.cache import caches
+from django.core.signals import request_finished
+from django.db import close_old_connections, transaction
+
+from {{ cookiecutter.app_name }}.cache import CACHE_ALIAS, MODEL_CACHES, request_cache, request_scope
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """
+    Start each test with empty caches and statistics.
+    """
+    caches[CACHE_ALIAS].clear()
+    for model_cache in MODEL_CACHES.values():
+        model_cache.stats.clear()
+
+
+@pytest.fixture
+def in_request():
+    """
+    Cache instances locally until the test ends or the request_finished signal is sent, as within a request.
+    """
+    with request_scope():
+        yield
+
+
+@pytest.fixture
+def end_request():
+    """
+    Provide a function which sends the request_finished signal, as the end of a request would.
+
+    Like Django's test client, this keeps the test's database connection open.
+    """
+    request_finished.disconnect(close_old_connections)
+    yield lambda: request_finished.send(sender=None)
+    request_finished.connect(close_old_connections)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model', [{{ models|join(', ') }}])
+class TestModelCache:
+    """
+    Tests of the read-through model caches.
+    """
+
+    @pytest.mark.usefixtures('in_request')
+    def test_request_tier(self, model, django_assert_num_queries):
+        """Repeated lookups within a request should query the database once."""
+        instance = model.objects.create()
+        model_cache = MODEL_CACHES[model]
+        with django_assert_num_queries(1):
+            for _ in range(10):
+                assert model_cache.get(instance.pk) == instance
+        assert model_cache.stats == {'database': 1, 'request': 9}
+        assert model_cache.hit_rate == 0.9
+
+    @pytest.mark.usefixtures('in_request')
+    def test_shared_tier(self, model, end_request, django_assert_num_queries):
+        """Lookups in later requests should be answered by the shared cache."""
+        instance = model.objects.create()
+        model_cache = MODEL_CACHES[model]
+        model_cache.get(instance.pk)
+        end_request()
+        with django_assert_num_queries(0):
+            assert model_cache.get(instance.pk) == instance
+        assert model_cache.stats == {'database': 1, 'shared': 1}
+
+    @pytest.mark.usefixtures('in_request')
+    def test_save_invalidates(self, model, end_request):
+        """Saving an instance should remove the old version from both tiers."""
+        instance = model.objects.create()
+        model_cache = MODEL_CACHES[model]
+        model_cache.get(instance.pk)
+        instance.save()
+        assert model_cache.get(instance.pk).modified == instance.modified
+        end_request()
+        assert model_cache.get(instance.pk).modified == instance.modified
+        assert model_cache.stats == {'database': 2, 'shared': 1}
+
+    def test_outside_requests(self, model):
+        """Lookups outside requests should skip the local tier, and lookups in a request scope should not outlive it."""
+        instance = model.objects.create()
+        model_cache = MODEL_CACHES[model]
+        model_cache.get(instance.pk)
+        model_cache.get(instance.pk)
+        assert request_cache() is None
+        assert model_cache.stats == {'database': 1, 'shared': 1}
+        with request_scope():
+            model_cache.get(instance.pk)
+            model_cache.get(instance.pk)
+        assert request_cache() is None
+        assert model_cache.stats == {'database': 1, 'shared': 2, 'request': 1}
+
+    def test_delete_invalidates(self, model):
+        """Deleted instances should no longer be found."""
+        instance = model.objects.create()
+        model_cache = MODEL_CACHES[model]
+        model_cache.get(instance.pk)
+        instance.delete()
+        with pytest.raises(model.DoesNotExist):
+            model_cache.get(instance.pk)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_invalidate_on_commit(self, model):
+        """A version cached by another reader before the transaction commits should be removed."""
+        instance = model.objects.create()
+        stale = model.objects.get(pk=instance.pk)
+        model_cache = MODEL_CACHES[model]
+        with transaction.atomic():
+            instance.save()
+            caches[CACHE_ALIAS].set(model_cache.key(instance.pk), stale)
+        assert model_cache.get(instance.pk).modified == instance.modified
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` in-process load test.
+"""
+
+import pytest
+from django.core.cache import caches
+from django.core.wsgi import get_wsgi_application
+
+from loadtest.runner import parse_mix, request_sequence, run
+from loadtest.targets import MODELS, populate, target_urls
+
+
+def test_parse_mix():
+    """A mix should give positive weights to known targets only."""
+    urls = {'home': '/', 'other': '/other/'}
+    assert parse_mix('home=3, other=0.5', urls) == {'home': 3, 'other': 0.5}
+    for spec in ('nowhere=1', 'home=0', 'home=many', 'home'):
+        with pytest.raises(ValueError):
+            parse_mix(spec, urls)
+
+
+def test_request_sequence():
+    """Targets should be chosen in proportion to their weights, in the same order for the same seed."""
+    weights = {'home': 3, 'other': 1}
+    sequence = request_sequence(weights, 1000, seed=1)
+    assert sequence == request_sequence(weights, 1000, seed=1)
+    assert sequence != request_sequence(weights, 1000, seed=2)
+    assert 700 < sequence.count('home') < 800
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run():
+    """Every target should be requested without errors, and summarized with its latencies and queries."""
+    caches['default'].clear()
+    populate(3)
+    urls = target_urls()
+    summary = run(get_wsgi_application(), urls, {name: 1 for name in urls}, requests=50, concurrency=4, warmup=10)
+    assert (summary['requests'], summary['errors'], summary['concurrency']) == (50, 0, 4)
+    assert summary['requests_per_second'] > 0
+    assert 0 < summary['p50_ms'] <= summary['p90_ms'] <= summary['p99_ms'] <= summary['max_ms']
+    assert set(summary['targets']) <= set(urls)
+    assert sum(target['requests'] for target in summary['targets'].values()) == 50
+
+    # After the warmup, each section of the home page is cached, and costs only its last modified query.
+    summary = run(get_wsgi_application(), urls, {'home': 1}, requests=20, concurrency=4, warmup=1)
+    assert summary['queries_per_request'] == len(MODELS)
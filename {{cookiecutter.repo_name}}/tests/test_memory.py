@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Tests for the memory budget utilities in `test_utils.memory`, and a check for memory leaks in the app.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if cookiecutter.models != "Comma-separated list of models" and '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{#- The first-party imports are sorted as isort sorts them, which depends on the app's name. #}
+{%- set imports = [
+    'from loadtest.runner import wsgi_get',
+    'from test_utils.memory import MemoryBudget, MemoryBudgetExceeded, check_memory_growth',
+] %}
+{%- if models %}
+{%- set _ = imports.append('from ' ~ cookiecutter.app_name ~ '.models import ' ~ models|join(', ')) %}
+{%- endif %}
+
+import pytest
+from django.core.cache import caches
+from django.core.wsgi import get_wsgi_application
+{% for line in imports|sort %}
+{{ line }}
+{%- endfor %}
+
+MODELS = [{{ models|join(', ') }}]
+
+
+def test_budget():
+    """Code within its budget should pass, and code over it fail, listing where it allocated what it kept."""
+    with MemoryBudget(1024) as trace:
+        data = bytearray(100 * 1024)
+    assert 100 * 1024 <= trace.peak < 1024 * 1024
+    with pytest.raises(MemoryBudgetExceeded, match='test_memory.py'):
+        with MemoryBudget(64):
+            data = bytearray(1024 * 1024)
+    assert len(data) == 1024 * 1024
+
+
+@pytest.mark.memory_budget(1024)
+def test_budget_marker():
+    """The marker should allow a test which stays within its budget."""
+    assert len(bytearray(100 * 1024)) == 100 * 1024
+
+
+def test_memory_growth():
+    """Keeping more memory after each call should be reported as growth, and replacing what's kept shouldn't."""
+    kept = []
+
+    def replace():
+        kept[:] = [bytearray(64 * 1024)]
+
+    def leak():
+        kept.append(bytearray(16 * 1024))
+
+    check_memory_growth(replace)
+    with pytest.raises(MemoryBudgetExceeded, match='grew by'):
+        check_memory_growth(leak)
+
+
+# Not in a test transaction, which would keep the on_commit callbacks of every save until the test ends.
+@pytest.mark.django_db(transaction=True)
+def test_app_memory_growth():
+    """Saving objects and rendering the home page over and over shouldn't keep more memory each time."""
+    # Through the WSGI application, as in production; the test client keeps a little of each request.
+    application = get_wsgi_application()
+
+    def exercise():
+        for model in MODELS:
+            obj = model()
+            obj.save()
+        assert wsgi_get(application, '/') == 200
+        # The fragment cache keeps each version of the page's sections, up to its MAX_ENTRIES; that isn't a leak.
+        caches['default'].clear()
+
+    # SQLite frees the references to the cursors of each connection every 200 cursors made, and
+    # Python's type attribute cache keeps up to 4096 attribute names looked up, like Django's
+    # "as_<vendor>" for each expression compiled, so some slow growth for a while is expected.
+    check_memory_growth(exercise, iterations=100, warmup=10, max_growth_kb=4)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Tests for the migration checks in `test_utils.migration_lint`.
+"""
+
+from test_utils.migration_lint import check_app, main
+
+INITIAL = """
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    operations = [
+        migrations.CreateModel(
+            name='Order',
+            fields=[
+                ('id', models.AutoField(primary_key=True)),
+                ('number', models.CharField(max_length=20, unique=True)),
+                ('status', models.CharField(max_length=20)),
+                ('placed', models.DateTimeField()),
+                ('note', models.TextField()),
+            ],
+            options={'index_together': {('placed', 'status')}},
+        ),
+    ]
+"""
+
+CHANGES = """
+from django.db import migrations, models
+
+
+def fill_notes(apps, schema_editor):
+    for order in apps.get_model('shop', 'Order').objects.all():
+        order.note = order.number
+        order.save()
+
+
+class Migration(migrations.Migration):
+
+    operations = [
+        migrations.AddField(model_name='order', name='total', field=models.IntegerField(default=0)),
+        migrations.AddField(model_name='order', name='coupon', field=models.CharField(max_length=20, null=True)),
+        migrations.AlterField(model_name='order', name='note', field=models.CharField(max_length=200)),
+        migrations.AlterField(model_name='order', name='status', field=models.CharField(max_length=40)),  # noqa
+        migrations.RunPython(fill_notes, migrations.RunPython.noop),
+    ]
+"""
+
+VIEWS = """
+def open_orders(Order):
+    return Order.objects.filter(status='open', placed__year=2020).exclude(pk=1).order_by('-note', 'number')
+"""
+
+
+def write_app(path, migrations, views=VIEWS):
+    """
+    Write an app with the given migration modules, and a module which queries its models.
+    """
+    (path / 'migrations').mkdir(parents=True)
+    (path / 'migrations' / '__init__.py').write_text('')
+    for number, migration in enumerate(migrations, 1):
+        (path / 'migrations' / '{:04d}_auto.py'.format(number)).write_text(migration)
+    (path / 'views.py').write_text(views)
+    return str(path)
+
+
+def test_app_migrations():
+    """The migrations generated for the app's models should pass the checks."""
+    assert not check_app('{{ cookiecutter.app_name }}')
+
+
+def test_unindexed_lookups(tmp_path):
+    """Fields filtered or ordered by, which no index starts with, should be reported where they're defined."""
+    app = write_app(tmp_path, [INITIAL])
+    problems = check_app(app)
+    assert [(problem.code, problem.line) for problem in problems] == [('M001', 13), ('M001', 15)]
+    assert problems[0].message.startswith('order.status is filtered or ordered by at {}:3'.format(
+        tmp_path / 'views.py'))
+
+
+def test_lookups_with_unique_fields(tmp_path):
+    """Fields only filtered by along with an exact match of a unique field shouldn't be reported."""
+    views = "Order.objects.filter(number='1', status='open').exclude(pk=1, note='')\n"
+    assert not check_app(write_app(tmp_path / 'exact', [INITIAL], views=views))
+    views = "Order.objects.filter(number__startswith='1', status='open')\n"
+    assert [problem.line for problem in check_app(write_app(tmp_path / 'prefix', [INITIAL], views=views))] == [13]
+
+
+def test_table_rewrites_and_row_writes(tmp_path):
+    """Not nullable new columns, altered columns and saves in a loop should be reported, except with noqa."""
+    app = write_app(tmp_path, [INITIAL, CHANGES], views='')
+    problems = check_app(app)
+    assert [(problem.code, problem.line) for problem in problems] == [('M003', 8), ('M002', 14), ('M002', 16)]
+    assert 'save() for each row' in problems[0].message
+    assert problems[1].message.startswith('AddField of order.total')
+    assert problems[2].message.startswith('AlterField of order.note')
+
+
+def test_main(tmp_path, capsys):
+    """The command line should print each problem, and fail if there are any."""
+    assert main([write_app(tmp_path, [INITIAL], views='')]) == 0
+    (tmp_path / 'views.py').write_text(VIEWS)
+    assert main([str(tmp_path)]) == 1
+    assert capsys.readouterr().out.count(': M001 ') == 2
@@ -1,11 +1,38 @@
-#!/usr/bin/env python
-"""
-Tests for the `{{ cookiecutter.repo_name }}` models module.
-"""
-{%- if cookiecutter.models != "Comma-separated list of models" -%}
-{%- for model in cookiecutter.models.replace(' ', '').split(',') %}
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if cookiecutter.models != "Comma-separated list of models" and '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{%- set split = models|length > cookiecutter.models_package_threshold|int %}
+{%- macro module_name(model) -%}
+{#- Words start at capitals, except within acronyms: HTTPLog becomes http_log. #}
+{%- for char in model %}
+{%- if char.isupper() and not loop.first and (model[loop.index0 - 1].islower() or model[loop.index0 + 1:][:1].islower()) %}_{% endif %}
+{{- char.lower() }}
+{%- endfor %}
+{%- endmacro %}
+{%- macro imports(models) %}
+{%- set names = [] %}
+{%- for model in models %}
+{%- set _ = names.extend([model, model ~ 'Row']) %}
+{%- endfor %}
+{#- The first-party imports are sorted as isort sorts them, which depends on the app's name. #}
+{%- set lines = [
+    'from ' ~ cookiecutter.app_name ~ '.models import ' ~ names|join(', '),
+    'from test_utils.queries import QueryBudget',
+] %}
+from collections import namedtuple
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+{% for line in lines|sort %}
+{{ line }}
+{%- endfor %}
+{%- endmacro %}
+{%- macro model_tests(model) %}
 
 
+@pytest.mark.django_db
 class Test{{ model }}:
     """
     Tests of the {{ model }} model.
@@ -13,5 +40,97 @@ class Test{{ model }}:
 
     def test_something(self):
         """TODO: Write real test cases."""
-{%- endfor -%}
+
+    def test_serialize(self):
+        """The serialized object should have the value of every field of the model."""
+        obj = {{ model }}.objects.create()
+        assert obj.serialize() == {field.attname: getattr(obj, field.attname) for field in obj._meta.concrete_fields}
+
+    def test_rows(self):
+        """Rows should have the field values of the objects, or just those of a narrower named tuple."""
+        obj = {{ model }}.objects.create()
+        with QueryBudget(1):
+            rows = list({{ model }}.objects.rows())
+        assert rows == [{{ model }}Row(**obj.serialize())]
+        Timestamps = namedtuple('Timestamps', ['created', 'modified'])
+        assert list({{ model }}.objects.rows(Timestamps)) == [Timestamps(obj.created, obj.modified)]
+
+    def test_bulk_create_chunked(self):
+        """Objects should be inserted with one query per batch."""
+        objs = ({{ model }}() for _ in range(25))
+        with QueryBudget(3):
+            created = {{ model }}.objects.bulk_create_chunked(objs, batch_size=10)
+        assert created == 25
+        assert {{ model }}.objects.count() == 25
+
+    def test_bulk_update_chunked(self):
+        """Updated objects should be saved with one query per batch, with a new modified timestamp."""
+        {{ model }}.objects.bulk_create_chunked({{ model }}() for _ in range(5))
+        objs = list({{ model }}.objects.all())
+        before = timezone.now()
+        with QueryBudget(3):
+            updated = {{ model }}.objects.bulk_update_chunked(objs, [], batch_size=2)
+        assert updated == 5
+        assert {{ model }}.objects.modified_between(start=before).count() == 5
+
+    def test_in_chunks(self):
+        """Objects should be read in bounded chunks, with one query per chunk."""
+        {{ model }}.objects.bulk_create_chunked({{ model }}() for _ in range(5))
+        with QueryBudget(4):
+            sizes = [len(chunk) for chunk in {{ model }}.objects.in_chunks(chunk_size=2)]
+        assert sizes == [2, 2, 1]
+        assert len(list({{ model }}.objects.stream(chunk_size=2))) == 5
+
+    def test_created_between(self):
+        """Time window queries should include the start and exclude the end."""
+        now = timezone.now()
+        {{ model }}.objects.bulk_create_chunked({{ model }}(created=now - timedelta(days=n)) for n in range(3))
+        assert {{ model }}.objects.created_between(now - timedelta(days=1), now).count() == 1
+        assert {{ model }}.objects.created_between(start=now - timedelta(days=1)).count() == 2
+        assert {{ model }}.objects.created_between(end=now).count() == 2
+
+    def test_last_modified(self):
+        """The latest modified timestamp should be that of the first of the objects most recently modified."""
+        assert {{ model }}.objects.last_modified() is None
+        objs = [{{ model }}.objects.create() for _ in range(3)]
+        objs[0].save()
+        assert {{ model }}.objects.last_modified() == objs[0].modified
+        assert list({{ model }}.objects.recently_modified()) == [objs[0], objs[2], objs[1]]
+
+    def test_last_change(self):
+        """The count, last primary key and last modified time should change with every create, update and delete."""
+        assert {{ model }}.objects.last_change() == (0, None, None)
+        objs = [{{ model }}.objects.create() for _ in range(3)]
+        changes = [{{ model }}.objects.last_change()]
+        assert changes[0] == (3, objs[2].pk, objs[2].modified)
+        objs[0].save()
+        changes.append({{ model }}.objects.last_change())
+        objs[1].delete()
+        changes.append({{ model }}.objects.last_change())
+        {{ model }}.objects.create()
+        objs[2].delete()
+        changes.append({{ model }}.objects.last_change())
+        assert len(set(changes)) == len(changes)
+{%- endmacro %}
+{%- if split %}
+{%- for model in models %}
+# file: models/test_{{ module_name(model) }}.py
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` {{ model }} model.
+"""
+{{ imports([model]) }}
+{{- model_tests(model) }}
+{%- endfor %}
+{%- else -%}
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` models module.
+"""
+{%- if models %}
+{{ imports(models) }}
+{%- for model in models %}
+{{- model_tests(model) }}
+{%- endfor %}
+{%- endif %}
 {%- endif %}
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Tests for the query budget utilities in `test_utils.queries`.
+"""
+
+import pytest
+from django.contrib.auth.models import Group
+
+from test_utils.queries import QueryBudget, QueryBudgetExceeded, repeated_queries, sql_shape
+
+
+def test_sql_shape():
+    """Queries differing only in their parameters should have the same shape."""
+    first = sql_shape("SELECT * FROM \"auth_group\" WHERE (\"id\" = 1 AND \"name\" = 'it''s')")
+    second = sql_shape("SELECT * FROM \"auth_group\" WHERE (\"id\" = 22 AND \"name\" = 'other')")
+    assert first == second == "SELECT * FROM \"auth_group\" WHERE (\"id\" = ? AND \"name\" = ?)"
+    assert sql_shape("SELECT 1 FROM t2 WHERE id IN (1, 2, 3)") == sql_shape("SELECT 1 FROM t2 WHERE id IN (4)")
+
+
+def test_repeated_queries():
+    """Query shapes run more often than allowed should be reported with their counts."""
+    queries = [{'sql': 'SELECT * FROM t WHERE id = {}'.format(pk)} for pk in range(3)]
+    queries.append({'sql': 'SELECT COUNT(*) FROM t'})
+    assert repeated_queries(queries) == {'SELECT * FROM t WHERE id = ?': 3}
+    assert repeated_queries(queries, max_repeats=3) == {}
+
+
+def test_exact_repeats():
+    """The same query run again with the same parameters shouldn't be reported as an N+1 query."""
+    queries = [{'sql': 'SELECT * FROM t WHERE id = 1'}] * 3
+    assert repeated_queries(queries) == {}
+    queries.append({'sql': 'SELECT * FROM t WHERE id = 2'})
+    assert repeated_queries(queries) == {'SELECT * FROM t WHERE id = ?': 4}
+
+
+@pytest.mark.django_db
+def test_budget_limit():
+    """Running more queries than the budget allows should fail."""
+    with QueryBudget(2):
+        Group.objects.count()
+        Group.objects.count()
+    with pytest.raises(QueryBudgetExceeded):
+        with QueryBudget(1):
+            Group.objects.count()
+            Group.objects.count()
+
+
+@pytest.mark.django_db
+def test_budget_n_plus_one():
+    """Running the same query shape with different parameters too often should fail."""
+    groups = [Group.objects.create(name=str(number)) for number in range(3)]
+    with pytest.raises(QueryBudgetExceeded, match='N\\+1'):
+        with QueryBudget(max_repeats=1):
+            for group in groups:
+                Group.objects.get(pk=group.pk)
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(1)
+def test_query_budget_marker(query_capture):
+    """The marker should allow a test which stays within its budget."""
+    Group.objects.count()
+    assert len(query_capture.captured_queries) == 1
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` read replica router.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import Group
+from django.core.signals import request_finished, request_started
+
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+from {{ cookiecutter.app_name }}.routers import ReadReplicaRouter, pin, pinned, unpin
+
+MODELS = [{{ models|join(', ') }}]
+
+# Nothing is replicated between the two test databases, so a row is only found in the one it was written to.
+DATABASES = ['default', 'replica']
+
+
+@pytest.fixture(autouse=True)
+def replica_router(settings):
+    """Route the app's models with the read replica router, starting from an unpinned thread."""
+    settings.{{ cookiecutter.app_name|upper }}_REPLICA_DATABASES = ['replica']
+    settings.DATABASE_ROUTERS = ['{{ cookiecutter.app_name }}.routers.ReadReplicaRouter']
+    unpin()
+    yield
+    unpin()
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_reads_from_replica():
+    """Until the thread writes, reads of every model should go to the replica."""
+    for model in MODELS:
+        model.objects.using('replica').create()
+    for model in MODELS:
+        assert model.objects.count() == 1
+        assert model.objects.using('default').count() == 0
+    assert not pinned()
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_write_pins_to_primary():
+    """After a write, reads of every model should go to the primary, and see the write, until the request ends."""
+    obj = MODELS[0].objects.create()
+    assert pinned()
+    assert MODELS[0].objects.using('default').filter(pk=obj.pk).exists()
+    assert not MODELS[0].objects.using('replica').exists()
+    assert MODELS[0].objects.get(pk=obj.pk) == obj
+    assert all(model.objects.all().db == 'default' for model in MODELS)
+
+    request_finished.send(sender=None)
+    assert not pinned()
+    assert all(model.objects.all().db == 'replica' for model in MODELS)
+    assert not MODELS[0].objects.filter(pk=obj.pk).exists()
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_request_starts_unpinned():
+    """A request should read from the replica even if the thread wrote before it started."""
+    MODELS[-1].objects.create()
+    request_started.send(sender=None)
+    assert not pinned()
+    assert MODELS[-1].objects.count() == 0
+
+
+@pytest.mark.django_db(databases=DATABASES)
+def test_other_apps():
+    """The models of other apps should be left to the default routing, and their writes not pin the thread."""
+    Group.objects.create(name='readers')
+    assert not pinned()
+    assert Group.objects.all().db == 'default'
+    assert Group.objects.filter(name='readers').exists()
+
+
+def test_concurrent_coroutines():
+    """A coroutine pinned to the primary shouldn't pin another one whose code runs in the same thread."""
+    async def request(write):
+        await sync_to_async(unpin)()
+        if write:
+            await sync_to_async(pin)()
+        await asyncio.sleep(0.01)
+        return await sync_to_async(pinned)()
+
+    async def serve():
+        return await asyncio.gather(request(True), request(False), request(True), request(False))
+
+    assert async_to_sync(serve)() == [True, False, True, False]
+    assert not pinned()
+
+
+def test_allow_migrate():
+    """The app's migrations should only run on the primary database."""
+    router = ReadReplicaRouter()
+    assert router.allow_migrate('default', '{{ cookiecutter.app_name }}')
+    assert not router.allow_migrate('replica', '{{ cookiecutter.app_name }}')
+    assert router.allow_migrate('replica', 'auth') is None
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+Tests of what the `{{ cookiecutter.repo_name }}` app costs services at Django startup.
+"""
+
+import os
+
+import pytest
+
+from test_utils.startup import app_setup_cost
+
+# The only modules of the app which Django startup should import, besides those of a models
+# package; anything else, like views and signal handlers, is loaded when first used.
+STARTUP_MODULES = [
+    '{{ cookiecutter.app_name }}',
+    '{{ cookiecutter.app_name }}.apps',
+    '{{ cookiecutter.app_name }}.models',
+]
+
+
+@pytest.fixture(scope='module', name='setup_cost')
+def measure_setup_cost():
+    """
+    Measure what installing the app adds to django.setup(), once for the tests of this module.
+    """
+    return app_setup_cost('{{ cookiecutter.app_name }}')
+
+
+def test_setup_modules(setup_cost):
+    """Installing the app should only import the modules it needs at startup, and load the rest lazily."""
+    _, modules = setup_cost
+    app_modules = [module for module in modules if module.split('.')[0] == '{{ cookiecutter.app_name }}']
+    assert [module for module in app_modules if not module.startswith('{{ cookiecutter.app_name }}.models.')] == \
+        STARTUP_MODULES
+
+
+# Other workers compete for the CPU, so timings taken in parallel runs, like make test-fast, mean little.
+@pytest.mark.skipif('PYTEST_XDIST_WORKER' in os.environ, reason='timed only when the tests run one at a time')
+def test_setup_time(pytestconfig, setup_cost):
+    """Installing the app should add no more than the import_time_budget to django.setup()."""
+    budget = float(pytestconfig.getini('import_time_budget'))
+    seconds, modules = setup_cost
+    assert seconds * 1000 <= budget, 'The app added {:.0f} ms to django.setup(), over the budget of {} ms, ' \
+        'importing:\n{}'.format(seconds * 1000, budget, '\n'.join(modules))
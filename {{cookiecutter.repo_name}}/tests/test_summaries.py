@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` daily summaries.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+from {{ cookiecutter.app_name }}.summaries import DAILY_SUMMARIES, full_scan, summary_date
+
+MODELS = [{{ models|join(', ') }}]
+
+
+def summary_values(summaries):
+    """
+    Get the values of summary objects, for comparing them.
+    """
+    return [model_to_dict(summary, exclude=['id']) for summary in summaries]
+
+
+def assert_consistent(model):
+    """
+    Check that the daily summaries of ``model`` are those of a full scan of its table.
+    """
+    summary_model = DAILY_SUMMARIES[model]
+    assert summary_values(summary_model.objects.order_by('date')) == summary_values(full_scan(model))
+
+
+def create_objects(model, count, days=3):
+    """
+    Create objects spread over the given number of days, with numeric fields counting up from 1.
+    """
+    now = timezone.now()
+    for number in range(1, count + 1):
+        obj = model(created=now - timedelta(days=number % days))
+        for name in DAILY_SUMMARIES[model].counted_fields[1:]:
+            setattr(obj, name, number)
+        obj.save()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('model', MODELS)
+def test_writes(model):
+    """Creating, updating, moving, and deleting objects should keep the summaries the same as a full scan."""
+    summary_model = DAILY_SUMMARIES[model]
+    create_objects(model, 10)
+    assert summary_model.objects.count() == 3
+    assert sum(summary_model.objects.values_list('count', flat=True)) == 10
+    assert_consistent(model)
+
+    objs = list(model.objects.order_by('pk'))
+    for obj in objs[:4]:
+        for name in summary_model.counted_fields[1:]:
+            setattr(obj, name, getattr(obj, name) * 3)
+        obj.save()
+    objs[4].created -= timedelta(days=10)
+    objs[4].save()
+    objs[5].save()
+    assert summary_model.objects.count() == 4
+    assert_consistent(model)
+
+    objs[4].delete()
+    model.objects.filter(pk__in=[obj.pk for obj in objs[6:8]]).delete()
+    assert summary_model.objects.count() == 3
+    assert_consistent(model)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('model', MODELS)
+def test_values_not_loaded(model):
+    """Saving objects whose counted values weren't loaded with them should read those values from the database."""
+    create_objects(model, 4, days=2)
+    obj = model.objects.only('id').order_by('pk').first()
+    obj.created = timezone.now() - timedelta(days=5)
+    obj.save()
+    assert_consistent(model)
+
+    fetched = model.objects.order_by('pk').last()
+    obj = model(**{field.attname: getattr(fetched, field.attname) for field in model._meta.concrete_fields})
+    obj.created -= timedelta(days=7)
+    obj.save()
+    assert_consistent(model)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back():
+    """Writes which are rolled back shouldn't change the summaries."""
+    model = MODELS[0]
+    create_objects(model, 3)
+    expected = summary_values(DAILY_SUMMARIES[model].objects.order_by('date'))
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            create_objects(model, 3)
+            model.objects.first().delete()
+            raise RuntimeError()
+    assert summary_values(DAILY_SUMMARIES[model].objects.order_by('date')) == expected
+    assert_consistent(model)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('model', MODELS)
+def test_saved_in_transactions(model):
+    """Saving an object again in a transaction, or after one was rolled back, should move it from its latest values."""
+    create_objects(model, 3)
+    obj = model.objects.order_by('pk').first()
+    with transaction.atomic():
+        obj.created -= timedelta(days=4)
+        obj.save()
+        obj.created -= timedelta(days=1)
+        obj.save()
+    assert_consistent(model)
+
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            obj.created -= timedelta(days=2)
+            obj.save()
+            raise RuntimeError()
+    obj.refresh_from_db()
+    obj.created -= timedelta(days=3)
+    obj.save()
+    assert_consistent(model)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rebuild_command():
+    """Rebuilding should repair summaries missing writes which sent no signals, for all days or those after one."""
+    for model in MODELS:
+        model.objects.bulk_create_chunked(model(created=timezone.now() - timedelta(days=day)) for day in range(4))
+        assert not DAILY_SUMMARIES[model].objects.exists()
+    since = summary_date(timezone.now()) - timedelta(days=1)
+    call_command(
+        '{{ cookiecutter.app_name }}_rebuild_summaries', '{{ models[0] }}', '--since', str(since), stdout=StringIO()
+    )
+    assert DAILY_SUMMARIES[MODELS[0]].objects.count() == 2
+
+    stdout = StringIO()
+    call_command('{{ cookiecutter.app_name }}_rebuild_summaries', stdout=stdout)
+    for model in MODELS:
+        assert 'Summarized 4 days of {}'.format(model.__name__) in stdout.getvalue()
+        assert_consistent(model)
+
+    with pytest.raises(CommandError, match='Nonexistent'):
+        call_command('{{ cookiecutter.app_name }}_rebuild_summaries', 'Nonexistent')
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` templates, and the caching of their compilation and fragments.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+
+import pytest
+from django.core.cache import caches
+from django.template import engines
+from django.template.base import Template
+from django.utils.html import escape
+
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+
+MODELS = [{{ models|join(', ') }}]
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """
+    Start each test with no compiled templates and no cached fragments.
+    """
+    engines['django'].engine.template_loaders[0].reset()
+    caches['default'].clear()
+
+
+@pytest.mark.django_db
+def test_compiled_once(client, monkeypatch):
+    """The cached template loader should compile index.html for the first request only."""
+    compiled = []
+    compile_nodelist = Template.compile_nodelist
+
+    def record_compile(template):
+        compiled.append(template.name)
+        return compile_nodelist(template)
+
+    monkeypatch.setattr(Template, 'compile_nodelist', record_compile)
+    for _ in range(3):
+        assert client.get('/').status_code == 200
+    assert compiled == ['{{ cookiecutter.app_name }}/index.html']
+
+
+@pytest.mark.django_db
+def test_fragments_cached(client, django_assert_num_queries):
+    """A model's section should only be rendered, and its objects listed, again once one has been saved."""
+    objs = [model.objects.create() for model in MODELS]
+    # The last change of each model, and the objects of each section on a cache miss.
+    with django_assert_num_queries(2 * len(MODELS)):
+        first = client.get('/').content.decode('utf-8')
+    assert all(escape(str(obj)) in first for obj in objs)
+    for _ in range(2):
+        with django_assert_num_queries(len(MODELS)):
+            assert client.get('/').content.decode('utf-8') == first
+    added = MODELS[0].objects.create()
+    with django_assert_num_queries(len(MODELS) + 1):
+        assert escape(str(added)) in client.get('/').content.decode('utf-8')
+
+
+@pytest.mark.django_db
+def test_deletes_shown(client):
+    """A deleted object should leave its model's section at once, not when the cached fragment expires."""
+    model = MODELS[0]
+    kept, deleted = model.objects.create(), model.objects.create()
+    kept.save()
+    assert escape(str(deleted)) in client.get('/').content.decode('utf-8')
+    deleted.delete()
+    content = client.get('/').content.decode('utf-8')
+    assert escape(str(kept)) in content
+    assert escape(str(deleted)) not in content
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Tests for the incremental translation build in `translations.build`.
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from translations import build
+from translations.build import Cache, compile_all, dummy, extract, main
+
+
+@pytest.fixture(autouse=True, name='commands')
+def fake_commands(monkeypatch):
+    """
+    Record the commands run, faking what makemessages, i18n_tool and msgfmt write.
+    """
+    run = []
+
+    def run_command(args, cwd):
+        run.append(args)
+        if 'makemessages' in args:
+            domain = args[args.index('-d') + 1]
+            write(os.path.join(cwd, 'conf', 'locale', 'en', 'LC_MESSAGES', domain + '.po'), 'msgid "Hi"\n')
+        elif args[0] == 'i18n_tool':
+            write(os.path.join(cwd, 'conf', 'locale', 'eo', 'LC_MESSAGES', 'django.po'), 'msgstr "Hi"\n')
+        elif args[-1].startswith('broken'):
+            raise subprocess.CalledProcessError(1, args)
+        else:
+            write(os.path.join(cwd, args[args.index('-o') + 1]), '')
+
+    monkeypatch.setattr(build, 'run_command', run_command)
+    return run
+
+
+def write(path, text):
+    """
+    Write a file, making its directory if need be.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as output:
+        output.write(text)
+
+
+@pytest.fixture(name='app')
+def write_app(tmp_path):
+    """
+    Write an app with a source file and its locale directory.
+    """
+    write(str(tmp_path / 'app' / 'views.py'), '_("Hi")\n')
+    write(str(tmp_path / 'app' / 'conf' / 'locale' / 'config.yaml'), 'locales: [en]\n')
+    return str(tmp_path / 'app')
+
+
+def test_extract(app, commands):
+    """Strings should only be extracted again once a source file has changed, or been added."""
+    assert extract(app, Cache(app))
+    assert [args[3:] for args in commands] == [
+        ['-l', 'en', '-v1', '-d', 'django'], ['-l', 'en', '-v1', '-d', 'djangojs'],
+    ]
+    assert not extract(app, Cache(app))
+    write(os.path.join(app, 'templates', 'app', 'base.html'), '<p>Hi</p>\n')
+    assert extract(app, Cache(app))
+    assert not extract(app, Cache(app))
+    assert extract(app, Cache(app), force=True)
+    assert len(commands) == 6
+
+
+def test_dummy(app, commands):
+    """Dummy translations should only be generated again once the source or generated .po files have changed."""
+    extract(app, Cache(app))
+    assert dummy(app, Cache(app))
+    assert not dummy(app, Cache(app))
+    write(os.path.join(app, 'conf', 'locale', 'eo', 'LC_MESSAGES', 'django.po'), 'msgstr "Edited"\n')
+    assert dummy(app, Cache(app))
+    assert not dummy(app, Cache(app))
+    write(os.path.join(app, 'conf', 'locale', 'en', 'LC_MESSAGES', 'django.po'), 'msgid "Hello"\n')
+    assert dummy(app, Cache(app))
+    os.remove(os.path.join(app, 'conf', 'locale', 'eo', 'LC_MESSAGES', 'django.po'))
+    assert dummy(app, Cache(app))
+    assert [args for args in commands if args[0] == 'i18n_tool'] == [['i18n_tool', 'dummy']] * 4
+
+
+def test_compile(app):
+    """Only .po files which have changed, or lost their .mo files, should be compiled."""
+    extract(app, Cache(app))
+    dummy(app, Cache(app))
+    assert compile_all(app, Cache(app), jobs=2) == [
+        'en/LC_MESSAGES/django.po', 'en/LC_MESSAGES/djangojs.po', 'eo/LC_MESSAGES/django.po',
+    ]
+    assert compile_all(app, Cache(app)) == []
+    write(os.path.join(app, 'conf', 'locale', 'eo', 'LC_MESSAGES', 'django.po'), 'msgstr "Edited"\n')
+    os.remove(os.path.join(app, 'conf', 'locale', 'en', 'LC_MESSAGES', 'django.mo'))
+    assert compile_all(app, Cache(app)) == ['en/LC_MESSAGES/django.po', 'eo/LC_MESSAGES/django.po']
+    assert len(compile_all(app, Cache(app), force=True)) == 3
+
+
+def test_compile_failure(app):
+    """The files which compiled should be recorded even if another fails, so that only it is compiled again."""
+    extract(app, Cache(app))
+    write(os.path.join(app, 'conf', 'locale', 'broken', 'LC_MESSAGES', 'django.po'), 'msgid\n')
+    with pytest.raises(subprocess.CalledProcessError):
+        compile_all(app, Cache(app))
+    os.remove(os.path.join(app, 'conf', 'locale', 'broken', 'LC_MESSAGES', 'django.po'))
+    assert compile_all(app, Cache(app)) == []
+
+
+def test_main(app, capsys):
+    """The command line should say what it compiled, or that it skipped a step."""
+    assert main(['extract', app]) == 0
+    assert main(['extract', app]) == 0
+    assert main(['compile', app]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        'Skipped extract: nothing has changed since it was last run', 'Compiled 2 of 2 .po files',
+    ]
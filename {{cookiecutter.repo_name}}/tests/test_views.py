@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` JSON views.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+
+import json
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+
+
+def get_page(client, model, **params):
+    """
+    Get a page of the list view of ``model``, decoded from JSON.
+    """
+    response = client.get(reverse('{}-list'.format(model._meta.model_name)), params)
+    assert response.status_code == 200
+    return json.loads(b''.join(response.streaming_content).decode('utf-8'))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model', [{{ models|join(', ') }}])
+class TestViews:
+    """
+    Tests of the list and detail views of each model.
+    """
+
+    def test_pages(self, model, client):
+        """Following the cursors should list every object once, in creation order."""
+        now = timezone.now()
+        # Pairs of objects created at the same time, each split across two pages.
+        model.objects.bulk_create_chunked(model(created=now - timedelta(minutes=n // 2)) for n in range(7))
+        expected = list(model.objects.order_by('created', 'pk').values_list('pk', flat=True))
+        listed = []
+        page = get_page(client, model, limit=2)
+        while page['next']:
+            assert len(page['results']) == 2
+            listed.extend(result['id'] for result in page['results'])
+            page = get_page(client, model, limit=2, cursor=page['next'])
+        listed.extend(result['id'] for result in page['results'])
+        assert listed == expected
+
+    def test_constant_page_cost(self, model, client, django_assert_num_queries):
+        """A page deep into the table should be read with the same queries as the first page, without an offset."""
+        model.objects.bulk_create_chunked(model() for _ in range(50))
+        cursor = get_page(client, model, limit=40)['next']
+        for params in ({}, {'cursor': cursor}):
+            with django_assert_num_queries(2) as captured:
+                page = get_page(client, model, limit=5, **params)
+            assert len(page['results']) == 5
+            assert all('LIMIT' in query['sql'] and 'OFFSET' not in query['sql'] for query in captured)
+
+    def test_invalid_parameters(self, model, client):
+        """Malformed cursors and limits out of range should be rejected."""
+        url = reverse('{}-list'.format(model._meta.model_name))
+        assert client.get(url, {'cursor': 'nonsense'}).status_code == 400
+        assert client.get(url, {'limit': 0}).status_code == 400
+
+    def test_list_conditional_get(self, model, client):
+        """The list view should answer 304 until an object on the page changes."""
+        instance = model.objects.create()
+        url = reverse('{}-list'.format(model._meta.model_name))
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        instance.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_full_last_page_extended(self, model, client):
+        """A full last page should change once an object is added after it, since it then has a next cursor."""
+        model.objects.bulk_create_chunked(model() for _ in range(2))
+        url = reverse('{}-list'.format(model._meta.model_name))
+        etag = client.get(url, {'limit': 2})['ETag']
+        assert get_page(client, model, limit=2)['next'] is None
+        model.objects.create()
+        assert client.get(url, {'limit': 2}, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        assert get_page(client, model, limit=2)['next'] is not None
+
+    def test_detail(self, model, client, django_assert_num_queries):
+        """The detail view should answer with the object, or 304 if the client's copy is current."""
+        instance = model.objects.create()
+        url = reverse('{}-detail'.format(model._meta.model_name), kwargs={'pk': instance.pk})
+        with django_assert_num_queries(1):
+            response = client.get(url)
+        assert response.json()['id'] == instance.pk
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        assert client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+        instance.delete()
+        assert client.get(url).status_code == 404
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Tests for the `{{ cookiecutter.repo_name }}` write buffer.
+"""
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{%- set cache = cookiecutter.model_cache == "yes" %}
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+{% if cache -%}
+from {{ cookiecutter.app_name }}.cache import MODEL_CACHES
+{% endif -%}
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+from {{ cookiecutter.app_name }}.write_buffer import WriteBuffer, WriteBufferMiddleware, buffered_save, current_buffer
+
+MODELS = [{{ models|join(', ') }}]
+
+
+def writes(captured):
+    """
+    Get the SQL of the captured queries which write rows, leaving out savepoints.
+    """
+    return [query['sql'] for query in captured if query['sql'].split()[0] in ('INSERT', 'UPDATE')]
+
+
+@pytest.mark.django_db
+def test_coalesces_creates():
+    """Saving each new object repeatedly should cost one insert per model, when the buffer is flushed."""
+    with CaptureQueriesContext(connection) as captured:
+        with WriteBuffer() as buffer:
+            for model in MODELS:
+                for obj in [model() for _ in range(10)]:
+                    buffered_save(obj)
+                    buffered_save(obj)
+            assert len(buffer) == 10 * len(MODELS)
+            assert not captured.captured_queries
+    assert len(writes(captured)) == len(MODELS)
+    for model in MODELS:
+        assert model.objects.count() == 10
+        assert all(obj.modified >= obj.created for obj in model.objects.all())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model', MODELS)
+def test_coalesces_updates(model):
+    """Saving existing objects repeatedly should cost one update, combining the fields saved and renewing modified."""
+    model.objects.bulk_create_chunked(model() for _ in range(10))
+    objs = list(model.objects.all())
+    earlier = timezone.now() - timedelta(days=1)
+{%- if cache %}
+    for obj in objs:
+        MODEL_CACHES[model].get(obj.pk)
+{%- endif %}
+    with CaptureQueriesContext(connection) as captured:
+        with WriteBuffer():
+            for obj in objs:
+                obj.created = earlier
+                buffered_save(obj, update_fields=['created'])
+                buffered_save(obj, update_fields=['created'])
+    assert len(writes(captured)) == 1
+    for obj, saved in zip(objs, model.objects.order_by('pk')):
+        assert saved.created == earlier
+        assert saved.modified > obj.modified - timedelta(seconds=1) and saved.modified > earlier
+{%- if cache %}
+        assert MODEL_CACHES[model].get(obj.pk).created == earlier
+{%- endif %}
+
+
+@pytest.mark.django_db
+def test_read_your_writes():
+    """Buffered writes should only be seen once flushed, and be discarded if an exception is raised."""
+    model = MODELS[0]
+    with pytest.raises(KeyError):
+        with WriteBuffer() as buffer:
+            buffered_save(model())
+            assert model.objects.count() == 0
+            assert buffer.flush() == 1
+            assert model.objects.count() == 1
+            buffered_save(model())
+            raise KeyError
+    assert model.objects.count() == 1
+    assert current_buffer() is None
+    buffered_save(model())
+    assert model.objects.count() == 2
+    with pytest.raises(TypeError):
+        WriteBuffer().save(Group(name='not timestamped'))
+
+
+@pytest.mark.django_db
+def test_saved_again_after_flush():
+    """A flushed new object should be updated if saved again, or rejected if the database didn't give it a key."""
+    model = MODELS[0]
+    with WriteBuffer() as buffer:
+        obj = model()
+        buffered_save(obj)
+        buffer.flush()
+        if obj.pk is None:
+            with pytest.raises(ValueError, match='read it back'):
+                buffered_save(obj)
+        else:
+            buffered_save(obj)
+    assert model.objects.count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('status, saved', [(200, 3), (400, 3), (500, 0)])
+def test_middleware(status, saved):
+    """The writes of a request should be made at its end, unless it failed with a server error."""
+    model = MODELS[0]
+
+    def view(request):
+        assert current_buffer() is request.write_buffer
+        for _ in range(saved or 3):
+            buffered_save(model())
+        assert model.objects.count() == 0
+        return HttpResponse(status=status)
+
+    response = WriteBufferMiddleware(view)(RequestFactory().post('/'))
+    assert response.status_code == status
+    assert model.objects.count() == saved
+
+
+@pytest.mark.django_db
+def test_concurrent_coroutines():
+    """A coroutine should only see its own buffer, even if another one's code runs in the same thread."""
+    model = MODELS[0]
+
+    async def request(saves):
+        buffer = WriteBuffer()
+        await sync_to_async(buffer.__enter__)()
+        for _ in range(saves):
+            await sync_to_async(buffered_save)(model())
+            await asyncio.sleep(0.01)
+        current = await sync_to_async(current_buffer)()
+        buffered = len(current)
+        await sync_to_async(buffer.__exit__)(None, None, None)
+        return current is buffer and buffered
+
+    async def serve():
+        return await asyncio.gather(request(1), request(2), request(3))
+
+    assert async_to_sync(serve)() == [1, 2, 3]
+    assert current_buffer() is None
+    assert model.objects.count() == 6
@@ -0,0 +1,6 @@
+"""
+Incremental builds of the translations of {{ cookiecutter.app_name }}, for the localization targets of the Makefile.
+
+Run by ``make extract_translations``, ``make dummy_translations`` and ``make compile_translations``;
+see ``python -m translations.build --help`` for the options.
+"""
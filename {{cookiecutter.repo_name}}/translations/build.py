@@ -0,0 +1,261 @@
+"""
+Incremental builds of an app's translations, skipping steps whose input hasn't changed.
+
+Each step records what it was run on in a cache file, ``conf/locale/.i18n_cache.json`` in the
+app, and is skipped when run again on the same input:
+
+* ``extract`` runs ``makemessages`` for the source language, unless no source file of the app,
+  by its path and content, has changed since the last extraction.
+* ``dummy`` runs ``i18n_tool dummy``, unless neither the source language's ``.po`` files nor any
+  file it wrote last time have changed.
+* ``compile`` runs ``msgfmt``, as ``compilemessages`` would, for each ``.po`` file whose content
+  has changed or whose ``.mo`` file is missing, running one process per CPU core at once.
+
+Files are compared by the SHA-256 digest of their content, not by modification time, so a fresh
+checkout or a ``tx pull`` which doesn't change a file doesn't cause it to be rebuilt.  Pass
+``--force`` to run a step on everything regardless, or delete the cache file.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# The language which the app's strings are written in.
+SOURCE_LOCALE = 'en'
+
+# The gettext domains which makemessages extracts strings into.
+DOMAINS = ['django', 'djangojs']
+
+# The extensions of the files which makemessages extracts strings from, in either domain.
+SOURCE_EXTENSIONS = {'.html', '.js', '.py', '.txt'}
+
+CACHE_NAME = '.i18n_cache.json'
+
+
+def locale_dir(app_dir):
+    """
+    Get the directory of an app's translations, which makemessages writes to when run in the app.
+    """
+    return os.path.join(app_dir, 'conf', 'locale')
+
+
+def file_digest(path):
+    """
+    Get the SHA-256 hex digest of the content of a file.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sources_digest(app_dir):
+    """
+    Get a digest of the relative paths and content of every file of an app which strings are extracted from.
+    """
+    translations = os.path.abspath(locale_dir(app_dir))
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(app_dir):
+        dirs[:] = sorted(name for name in dirs if os.path.join(os.path.abspath(root), name) != translations)
+        for name in sorted(files):
+            if os.path.splitext(name)[1] in SOURCE_EXTENSIONS:
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, app_dir).replace(os.sep, '/').encode('utf-8'))
+                digest.update(file_digest(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def po_files(app_dir, source=None):
+    """
+    Get the paths of an app's ``.po`` files, relative to its locale directory.
+
+    Only those of the source language are included if ``source`` is True, and only those of
+    other languages if it's False.
+    """
+    translations = locale_dir(app_dir)
+    paths = []
+    for root, dirs, files in os.walk(translations):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.po'):
+                path = os.path.relpath(os.path.join(root, name), translations).replace(os.sep, '/')
+                if source is None or (path.split('/')[0] == SOURCE_LOCALE) == source:
+                    paths.append(path)
+    return paths
+
+
+def po_digests(app_dir, paths):
+    """
+    Get the digests of ``.po`` files of an app, keyed by their paths relative to its locale directory.
+    """
+    translations = locale_dir(app_dir)
+    return {path: file_digest(os.path.join(translations, path)) for path in paths}
+
+
+def current_digests(app_dir, digests):
+    """
+    Check whether the ``.po`` files of an app still have the given digests, none having been removed.
+    """
+    translations = locale_dir(app_dir)
+    return all(
+        os.path.exists(os.path.join(translations, path)) and file_digest(os.path.join(translations, path)) == digest
+        for path, digest in digests.items()
+    )
+
+
+def run_command(args, cwd):
+    """
+    Run a command in the directory ``cwd``, raising CalledProcessError if it fails.
+    """
+    subprocess.check_call(args, cwd=cwd)
+
+
+class Cache:
+    """
+    The record of what each step was last run on, kept in a JSON file in an app's locale directory.
+    """
+
+    def __init__(self, app_dir):
+        """
+        Load the record of an app's steps, which is empty if it hasn't been saved.
+        """
+        self.path = os.path.join(locale_dir(app_dir), CACHE_NAME)
+        try:
+            with open(self.path) as cache_file:
+                self.steps = json.load(cache_file)
+        except (IOError, ValueError):
+            self.steps = {}
+
+    def get(self, step):
+        """
+        Get what a step was last run on, or None if it hasn't been run.
+        """
+        return self.steps.get(step)
+
+    def set(self, step, value):
+        """
+        Record what a step was run on, saving the cache file at once so that later failures don't lose it.
+        """
+        self.steps[step] = value
+        with open(self.path, 'w') as cache_file:
+            json.dump(self.steps, cache_file, indent=2, sort_keys=True)
+            cache_file.write('\n')
+
+
+def extract(app_dir, cache, force=False):
+    """
+    Extract the strings of an app into its source ``.po`` files, unless its source files are unchanged.
+
+    Returns:
+        bool: whether the strings were extracted
+    """
+    digest = sources_digest(app_dir)
+    if not force and cache.get('extract') == digest and po_files(app_dir, source=True):
+        return False
+    manage = os.path.join(os.path.dirname(os.path.abspath(app_dir)), 'manage.py')
+    for domain in DOMAINS:
+        run_command([sys.executable, manage, 'makemessages', '-l', SOURCE_LOCALE, '-v1', '-d', domain], app_dir)
+    cache.set('extract', digest)
+    return True
+
+
+def dummy(app_dir, cache, force=False):
+    """
+    Generate an app's dummy translations, unless its source ``.po`` files and those generated are unchanged.
+
+    Returns:
+        bool: whether the dummy translations were generated
+    """
+    source = po_digests(app_dir, po_files(app_dir, source=True))
+    last = cache.get('dummy')
+    if not force and last and last['source'] == source and current_digests(app_dir, last['output']):
+        return False
+    before = po_digests(app_dir, po_files(app_dir, source=False))
+    run_command(['i18n_tool', 'dummy'], app_dir)
+    after = po_digests(app_dir, po_files(app_dir, source=False))
+    output = {path: digest for path, digest in after.items() if before.get(path) != digest}
+    if last:
+        # Files which were written last time, but were left unchanged by this run, are still its output.
+        output.update((path, after[path]) for path in last['output'] if path in after)
+    cache.set('dummy', {'source': source, 'output': output})
+    return True
+
+
+def compile_po(app_dir, path):
+    """
+    Compile a ``.po`` file of an app, given relative to its locale directory, into the ``.mo`` file beside it.
+    """
+    translations = locale_dir(app_dir)
+    mo_path = os.path.splitext(path)[0] + '.mo'
+    run_command(['msgfmt', '--check-format', '-o', mo_path, path], translations)
+
+
+def compile_all(app_dir, cache, force=False, jobs=None):
+    """
+    Compile each ``.po`` file of an app which has changed since it was last compiled, ``jobs`` at once.
+
+    ``jobs`` defaults to the number of CPU cores; msgfmt runs in separate processes, so compiling
+    in threads uses them all.
+
+    Returns:
+        list: the paths of the files compiled, relative to the app's locale directory
+
+    Raises:
+        CalledProcessError: if msgfmt fails for any file, once every other file has been compiled
+    """
+    translations = locale_dir(app_dir)
+    digests = po_digests(app_dir, po_files(app_dir))
+    compiled = {} if force else dict(cache.get('compile') or {})
+    stale = [
+        path for path, digest in sorted(digests.items())
+        if compiled.get(path) != digest or not os.path.exists(os.path.join(translations, path[:-3] + '.mo'))
+    ]
+    errors = []
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        futures = [(path, executor.submit(compile_po, app_dir, path)) for path in stale]
+        for path, future in futures:
+            try:
+                future.result()
+            except subprocess.CalledProcessError as error:
+                errors.append(error)
+            else:
+                compiled[path] = digests[path]
+    # Keep the files which compiled, so that they aren't compiled again after fixing another.
+    cache.set('compile', {path: digest for path, digest in compiled.items() if path in digests})
+    if errors:
+        raise errors[0]
+    return stale
+
+
+STEPS = {
+    'compile': compile_all,
+    'dummy': dummy,
+    'extract': extract,
+}
+
+
+def main(argv=None):
+    """
+    Run a step of the translation build of an app, unless its input is unchanged since it was last run.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('step', choices=sorted(STEPS), help='the step to run')
+    parser.add_argument('app', help='the directory of a Django app')
+    parser.add_argument('--force', action='store_true', help='run the step even if its input is unchanged')
+    args = parser.parse_args(argv)
+
+    result = STEPS[args.step](args.app, Cache(args.app), force=args.force)
+    if isinstance(result, list):
+        print('Compiled {} of {} .po files'.format(len(result), len(po_files(args.app))))
+    elif not result:
+        print('Skipped {}: nothing has changed since it was last run'.format(args.step))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,6 +2,9 @@
 {{ cookiecutter.project_short_description }}.
 """
 
+# Every service which installs this app imports this module, apps.py, and models.py at startup,
+# so keep their imports light; load anything else, like views, where it's used.
+
 __version__ = '{{ cookiecutter.version }}'
 
 default_app_config = '{{ cookiecutter.app_name }}.apps.{{ cookiecutter.config_class_name }}'  # pylint: disable=invalid-name
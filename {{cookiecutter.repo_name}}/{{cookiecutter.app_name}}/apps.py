@@ -1,8 +1,64 @@
 """
 {{ cookiecutter.app_name }} Django application initialization.
 """
+{%- set has_models = cookiecutter.models != "Comma-separated list of models" %}
+{%- set cache = has_models and cookiecutter.model_cache == "yes" %}
+{%- set replicas = has_models and cookiecutter.read_replicas == "yes" %}
+{%- set summaries = has_models and cookiecutter.daily_summaries == "yes" %}
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{#- The modules with signal handlers to connect, and what they do. #}
+{%- set handlers = [] %}
+{%- if cache %}
+{%- set _ = handlers.append(['cache', 'keep the model caches up to date']) %}
+{%- endif %}
+{%- if replicas %}
+{%- set _ = handlers.append(['routers', 'unpin reads from the primary database at the start and end of each request']) %}
+{%- endif %}
+{%- if summaries %}
+{%- set _ = handlers.append(['summaries', 'keep the daily summaries up to date']) %}
+{%- endif %}
+{%- if handlers %}
+
+from importlib import import_module
+{%- endif %}
 
 from django.apps import AppConfig
+{%- if cache or replicas %}
+from django.core.signals import request_finished, request_started
+{%- endif %}
+{%- if cache or summaries %}
+from django.db.models.signals import post_delete, post_save{% if summaries %}, pre_save{% endif %}
+{%- endif %}
+{%- if handlers %}
+
+
+class LazyReceiver:
+    """
+    A signal receiver which imports its handler from a module of the app when first sent a signal.
+
+    Connecting these instead of the handlers keeps the handlers' modules out of Django startup,
+    which every service installing the app pays for.
+    """
+
+    def __init__(self, module, name):
+        """
+        Refer to the handler ``name`` of the app's ``module``, without importing it yet.
+        """
+        self.module = '{{ cookiecutter.app_name }}.' + module
+        self.name = name
+        self.handler = None
+
+    def __call__(self, **kwargs):
+        """
+        Pass the signal on to the handler.
+        """
+        if self.handler is None:
+            self.handler = getattr(import_module(self.module), self.name)
+        return self.handler(**kwargs)
+{%- endif %}
 
 
 class {{ cookiecutter.config_class_name }}(AppConfig):
@@ -11,3 +67,52 @@ class {{ cookiecutter.config_class_name }}(AppConfig):
     """
 
     name = '{{ cookiecutter.app_name }}'
+{%- if handlers %}
+
+    def ready(self):
+        """
+{%- if handlers|length == 1 %}
+        Connect the signal handlers which {{ handlers[0][1] }}.
+{%- else %}
+        Connect the signal handlers of the {% for module, _ in handlers %}{% if not loop.first %}{% if loop.last %}{% if handlers|length > 2 %},{% endif %} and {% else %}, {% endif %}{% endif %}{{ module }}{% endfor %} modules.
+{%- endif %}
+        """
+{%- if cache %}
+        request_started.connect(
+            LazyReceiver('cache', 'start_request_cache'), weak=False,
+            dispatch_uid='{{ cookiecutter.app_name }}.cache.request_started',
+        )
+        request_finished.connect(
+            LazyReceiver('cache', 'end_request_cache'), weak=False,
+            dispatch_uid='{{ cookiecutter.app_name }}.cache.request_finished',
+        )
+{%- endif %}
+{%- if replicas %}
+        unpin = LazyReceiver('routers', 'unpin')
+        request_started.connect(unpin, weak=False, dispatch_uid='{{ cookiecutter.app_name }}.routers.request_started')
+        request_finished.connect(unpin, weak=False, dispatch_uid='{{ cookiecutter.app_name }}.routers.request_finished')
+{%- endif %}
+{%- if cache or summaries %}
+{%- if cache %}
+        invalidate_instance = LazyReceiver('cache', 'invalidate_instance')
+{%- endif %}
+{%- if summaries %}
+        load_counted_values = LazyReceiver('summaries', 'load_counted_values')
+        count_saved = LazyReceiver('summaries', 'count_saved')
+        count_deleted = LazyReceiver('summaries', 'count_deleted')
+{%- endif %}
+        for name in [{% for model in models %}'{{ model }}'{% if not loop.last %}, {% endif %}{% endfor %}]:
+            model = self.get_model(name)
+{%- if cache %}
+            uid = '{{ cookiecutter.app_name }}.cache.' + name
+            post_save.connect(invalidate_instance, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(invalidate_instance, sender=model, weak=False, dispatch_uid=uid)
+{%- endif %}
+{%- if summaries %}
+            uid = '{{ cookiecutter.app_name }}.summaries.' + name
+            pre_save.connect(load_counted_values, sender=model, weak=False, dispatch_uid=uid)
+            post_save.connect(count_saved, sender=model, weak=False, dispatch_uid=uid)
+            post_delete.connect(count_deleted, sender=model, weak=False, dispatch_uid=uid)
+{%- endif %}
+{%- endif %}
+{%- endif %}
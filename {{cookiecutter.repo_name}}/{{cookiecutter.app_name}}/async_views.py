@@ -0,0 +1,56 @@
+"""
+Async variants of the JSON views in ``views``, for services which serve the app over ASGI.
+
+Under ASGI, Django runs each synchronous view in a worker thread.  These views run on the
+event loop instead, and since the ORM can't be used from async code in the versions of Django
+supported, each one hops to a thread just once, for all of its queries.  A list page is read
+in that thread and sent whole, rather than streamed like the synchronous view's: before Django
+4.2, the body of a streamed response is read on the event loop, where queries aren't allowed,
+so the synchronous list view can't be served over ASGI on earlier versions.
+
+Django runs async views natively from version 3.1, and ``urls.py`` only routes them from then
+on.  ``python -m benchmarks.asgi`` compares them with the synchronous views.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.shortcuts import get_object_or_404
+
+from {{ cookiecutter.app_name }} import views
+
+SAFE_METHODS = ['GET', 'HEAD']
+
+
+def read_page(request, queryset, limit):
+    """
+    Answer a list request with the page of ``limit`` objects from the start of ``queryset``.
+    """
+    etag, last_modified = views.page_validators(queryset, limit)
+    return views.conditional(
+        request, etag, last_modified,
+        lambda: HttpResponse(''.join(views.stream_page(queryset, limit)), content_type='application/json'),
+    )
+
+
+async def object_list(request, model):
+    """
+    List the objects of ``model``, one page at a time, with the query parameters of ``views.object_list``.
+    """
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    try:
+        queryset, limit = views.page_start(request, model)
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    return await sync_to_async(read_page, thread_sensitive=True)(request, queryset, limit)
+
+
+async def object_detail(request, model, pk):
+    """
+    Get the object of ``model`` with primary key ``pk``.
+    """
+    if request.method not in SAFE_METHODS:
+        return HttpResponseNotAllowed(SAFE_METHODS)
+    instance = await sync_to_async(get_object_or_404, thread_sensitive=True)(model, pk=pk)
+    etag, last_modified = views.detail_validators(instance)
+    return views.conditional(request, etag, last_modified, lambda: JsonResponse(instance.serialize()))
@@ -0,0 +1,298 @@
+"""
+Streaming import and export of {{ cookiecutter.app_name }} models, for backfills and data moves of any size.
+
+Records are read from and written to CSV files with a header row, or JSON Lines files of one
+object per line.  Neither the files nor the query sets are ever held in memory: imports read one
+batch of records at a time and insert each batch in a transaction of its own, and exports read
+the table in primary key order with a query per ``chunk_size`` rows, starting after the last
+primary key of the chunk before, like ``in_chunks()``.  After each batch a checkpoint of
+the progress made is saved, from which an interrupted run can carry on; see the
+``{{ cookiecutter.app_name }}_import`` and ``{{ cookiecutter.app_name }}_export`` management commands.
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+"""
+
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router, transaction
+
+from {{ cookiecutter.app_name }}.models import BULK_BATCH_SIZE, {{ models|join(', ') }}
+
+FORMATS = ('csv', 'jsonl')
+
+# The models which can be imported and exported, by lowercase name; tables derived from them, like
+# daily summaries, are rebuilt from them instead.
+TRANSFER_MODELS = {model._meta.model_name: model for model in [{{ models|join(', ') }}]}
+
+
+class _Encoder(DjangoJSONEncoder):
+    """
+    Encodes the values of model fields as JSON, keeping the microseconds which DjangoJSONEncoder drops from times.
+    """
+
+    def default(self, o):  # pylint: disable=method-hidden
+        """
+        Encode a value which json can't; datetimes in ISO 8601 format, and anything else as DjangoJSONEncoder does.
+        """
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+_encoder = _Encoder()
+
+
+def get_model(name):
+    """
+    Get the {{ cookiecutter.app_name }} model with the given name, in any case.
+
+    Raises:
+        LookupError: if the app has no such model, or only one derived from the others
+    """
+    try:
+        return TRANSFER_MODELS[name.lower()]
+    except KeyError:
+        raise LookupError(
+            "App '{{ cookiecutter.app_name }}' has no model named '{}' to import or export.".format(name)
+        ) from None
+
+
+def file_format(path, name=None):
+    """
+    Get the format of a file: ``name`` if given, or else the file's extension.
+
+    Raises:
+        ValueError: if the format isn't one of ``FORMATS``
+    """
+    name = name or os.path.splitext(path)[1].lstrip('.').lower()
+    if name not in FORMATS:
+        raise ValueError('Unknown format {!r}; give one of {} with --format'.format(name, ', '.join(FORMATS)))
+    return name
+
+
+def read_records(lines, format_name):
+    """
+    Yield the records of a CSV or JSON Lines file, as dicts of field values keyed by field name, one at a time.
+    """
+    if format_name == 'csv':
+        yield from csv.DictReader(lines)
+    else:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordWriter:
+    """
+    Writes rows of field values to a CSV or JSON Lines file, one at a time.
+    """
+
+    def __init__(self, output, format_name, fields, header=True):
+        """
+        Prepare to write rows of ``fields`` to ``output``, starting with a CSV header row if ``header`` is true.
+        """
+        self.output = output
+        self.fields = fields
+        self.csv = csv.writer(output) if format_name == 'csv' else None
+        if self.csv and header:
+            self.csv.writerow(fields)
+
+    def write(self, row):
+        """
+        Write a row of values, in the order of the fields.
+        """
+        if self.csv:
+            self.csv.writerow(row)
+        else:
+            self.output.write(_encoder.encode(dict(zip(self.fields, row))) + '\n')
+
+    def flush(self):
+        """
+        Flush the rows written so far to the file.
+
+        Returns:
+            int: the position in the file after the last row, or None if it isn't seekable, like stdout
+        """
+        self.output.flush()
+        return self.output.tell() if self.output.seekable() else None
+
+
+class Checkpoint:
+    """
+    The progress of an import or export, saved in a JSON file so that an interrupted run can carry on.
+
+    Each save replaces the whole file at once, so a crash never leaves half a checkpoint.  Without
+    a path, nothing is saved and every run starts from the beginning.
+    """
+
+    def __init__(self, path=None):
+        """
+        Load the checkpoint saved at ``path``, if there is one.
+        """
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path) as checkpoint_file:
+                self.state = json.load(checkpoint_file)
+
+    def get(self, key, default=None):
+        """
+        Get a value saved in the checkpoint.
+        """
+        return self.state.get(key, default)
+
+    def save(self, **values):
+        """
+        Update the checkpoint with some values, and save it.
+        """
+        self.state.update(values)
+        if self.path:
+            temporary_path = self.path + '.tmp'
+            with open(temporary_path, 'w') as checkpoint_file:
+                json.dump(self.state, checkpoint_file)
+            os.replace(temporary_path, self.path)
+
+    def clear(self):
+        """
+        Delete the checkpoint, once the run it records is complete.
+        """
+        self.state = {}
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Progress:
+    """
+    Reports the number of rows done and the throughput, at most every ``interval`` seconds and at the end.
+    """
+
+    def __init__(self, write, verb, done=0, interval=5.0):
+        """
+        Start timing, with ``done`` rows done by an earlier run; reports are passed to ``write``.
+        """
+        self.write = write
+        self.verb = verb
+        self.done = done
+        self.count = 0
+        self.interval = interval
+        self.start = self.last_report = time.perf_counter()
+
+    def add(self, count):
+        """
+        Count some more rows done, and report the progress if it's been a while.
+        """
+        self.done += count
+        self.count += count
+        if time.perf_counter() - self.last_report >= self.interval:
+            self.report()
+
+    def report(self):
+        """
+        Report the progress.
+        """
+        self.last_report = time.perf_counter()
+        seconds = max(self.last_report - self.start, 1e-9)
+        self.write('{} {} rows ({:.0f} rows/s)'.format(self.verb, self.done, self.count / seconds))
+
+
+def build_instance(model, record):
+    """
+    Make an unsaved instance of ``model`` from a record, converting its values from text where needed.
+
+    Fields are named as in exports, by their ``attname``, or by their names.  An empty value of a
+    field which may be null is taken as null, since CSV files can't tell them apart.
+
+    Raises:
+        ValueError: if the record has a field which the model doesn't, or a value not valid for its field
+    """
+    fields = {}
+    for field in model._meta.concrete_fields:
+        fields[field.name] = fields[field.attname] = field
+    values = {}
+    for name, value in record.items():
+        if name not in fields:
+            raise ValueError('{} has no field {!r}'.format(model.__name__, name))
+        field = fields[name]
+        if value == '' and field.null:
+            value = None
+        try:
+            values[field.attname] = field.to_python(value)
+        except ValidationError as error:
+            raise ValueError('Invalid {}.{} {!r}: {}'.format(
+                model.__name__, name, value, ' '.join(error.messages))) from error
+    return model(**values)
+
+
+def import_records(model, records, checkpoint, progress, batch_size=BULK_BATCH_SIZE):
+    """
+    Insert objects made from an iterable of records, with one bulk insert and transaction per batch.
+
+    The records already imported according to ``checkpoint`` are skipped, without making objects
+    of them, and the checkpoint is saved after each batch is committed; if a run stops between
+    the two, the batch is imported again when it carries on.
+
+    Returns:
+        int: the number of objects created by this run
+    """
+    records = iter(records)
+    skipped = sum(1 for _ in islice(records, checkpoint.get('records', 0)))
+    created = 0
+    batch = [build_instance(model, record) for record in islice(records, batch_size)]
+    while batch:
+        with transaction.atomic(using=router.db_for_write(model)):
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        created += len(batch)
+        checkpoint.save(records=skipped + created)
+        progress.add(len(batch))
+        batch = [build_instance(model, record) for record in islice(records, batch_size)]
+    return created
+
+
+def reset_sequences(model):
+    """
+    Make the database number new objects of ``model`` after those imported with their primary keys, as loaddata does.
+    """
+    connection = connections[router.db_for_write(model)]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+            cursor.execute(sql)
+
+
+def export_rows(model, writer, checkpoint, progress, chunk_size=BULK_BATCH_SIZE):
+    """
+    Write the rows of every object of ``model`` in primary key order, after those already exported.
+
+    Rows are fetched as the model's named tuple rows, with a query for each chunk of ``chunk_size``
+    which starts after the last primary key of the chunk before, so no database holds more than a
+    chunk in memory, as MySQL and SQLite would hold the whole result of one query.  Once each chunk
+    of rows has been written and flushed, the checkpoint records the last primary key written and
+    the position in the file after it, where a run which carries on truncates the file and appends.
+
+    Returns:
+        int: the number of rows written by this run
+    """
+    queryset = model.objects.order_by('pk')
+    last_pk = checkpoint.get('last_pk')
+    written = 0
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size].rows(chunk_size=chunk_size))
+        for row in rows:
+            writer.write(row)
+        if rows:
+            last_pk = rows[-1].id
+            written += len(rows)
+            checkpoint.save(last_pk=last_pk, rows=checkpoint.get('rows', 0) + len(rows), offset=writer.flush())
+            progress.add(len(rows))
+        if len(rows) < chunk_size:
+            return written
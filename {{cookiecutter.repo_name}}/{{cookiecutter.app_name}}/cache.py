@@ -0,0 +1,156 @@
+"""
+Read-through caching of {{ cookiecutter.app_name }} models by primary key.
+
+Each lookup tries a dict local to the current request first, then Django's cache framework,
+and only then the database.  The local dict is made at the start of every request and dropped
+at its end, so it never serves an instance across requests; outside requests, lookups skip it,
+unless they're made in a ``request_scope()`` block, as a task or command can do for each unit
+of work.  Saving or deleting an instance removes it from both tiers, and again once the
+surrounding transaction commits.
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{%- macro constant_name(model) -%}
+{% for char in model %}{% if char.isupper() and not loop.first %}_{% endif %}{{ char.upper() }}{% endfor %}_CACHE
+{%- endmacro %}
+"""
+
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+
+# The Django cache to use for the shared tier, and how long entries are kept there, in seconds.
+CACHE_ALIAS = getattr(settings, '{{ cookiecutter.app_name|upper }}_CACHE_ALIAS', 'default')
+CACHE_TIMEOUT = getattr(settings, '{{ cookiecutter.app_name|upper }}_CACHE_TIMEOUT', 300)
+
+# Local to each thread, or to each coroutine and the code it runs with sync_to_async().
+_request_local = Local()
+
+
+def request_cache():
+    """
+    Get the dict of instances cached for the current request, or None outside requests.
+    """
+    return getattr(_request_local, 'instances', None)
+
+
+def start_request_cache(**kwargs):  # pylint: disable=unused-argument
+    """
+    Start an empty cache for the current request; connected to the request_started signal.
+    """
+    _request_local.instances = {}
+
+
+def end_request_cache(**kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cache of the current request; connected to the request_finished signal.
+    """
+    _request_local.instances = None
+
+
+@contextmanager
+def request_scope():
+    """
+    Cache instances locally inside the block, as within a request, and drop them when it exits.
+    """
+    previous = request_cache()
+    start_request_cache()
+    try:
+        yield
+    finally:
+        _request_local.instances = previous
+
+
+class ModelCache:
+    """
+    A two-tier read-through cache of one model's instances, keyed by primary key.
+
+    ``stats`` counts where each lookup was answered: ``request``, ``shared``, or ``database``.
+    """
+
+    def __init__(self, model, timeout=None):
+        """
+        Create a cache for ``model``.
+        """
+        self.model = model
+        self.key_prefix = '{{ cookiecutter.app_name }}.{}'.format(model.__name__.lower())
+        self.timeout = CACHE_TIMEOUT if timeout is None else timeout
+        self.stats = Counter()
+
+    def key(self, pk):
+        """
+        Get the cache key for the instance with the given primary key.
+        """
+        return '{}.{}'.format(self.key_prefix, pk)
+
+    def get(self, pk):
+        """
+        Get the instance with the given primary key.
+
+        Raises:
+            DoesNotExist: if there is no such instance; misses are not cached
+        """
+        key = self.key(pk)
+        local = request_cache()
+        if local is not None and key in local:
+            self.stats['request'] += 1
+            return local[key]
+        shared = caches[CACHE_ALIAS]
+        instance = shared.get(key)
+        if instance is not None:
+            self.stats['shared'] += 1
+        else:
+            self.stats['database'] += 1
+            instance = self.model.objects.get(pk=pk)
+            shared.set(key, instance, self.timeout)
+        if local is not None:
+            local[key] = instance
+        return instance
+
+    def invalidate(self, pk):
+        """
+        Remove the instance with the given primary key from both tiers.
+        """
+        key = self.key(pk)
+        local = request_cache()
+        if local is not None:
+            local.pop(key, None)
+        caches[CACHE_ALIAS].delete(key)
+
+    @property
+    def hit_rate(self):
+        """
+        Get the fraction of lookups which were answered without a database query.
+        """
+        lookups = sum(self.stats.values())
+        return (lookups - self.stats['database']) / lookups if lookups else 0.0
+
+
+{% for model in models -%}
+{{ constant_name(model) }} = ModelCache({{ model }})
+{% endfor %}
+MODEL_CACHES = {
+{%- for model in models %}
+    {{ model }}: {{ constant_name(model) }},
+{%- endfor %}
+}
+
+
+def invalidate_instance(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove a saved or deleted instance from its cache, now and after the current transaction commits.
+
+    The second invalidation removes any copy of the old row cached by a concurrent reader
+    before the change was committed.
+    """
+    model_cache = MODEL_CACHES[sender]
+    pk = instance.pk
+    model_cache.invalidate(pk)
+    transaction.on_commit(lambda: model_cache.invalidate(pk))
@@ -0,0 +1,75 @@
+"""
+Export every object of a {{ cookiecutter.app_name }} model to a CSV or JSON Lines file, streaming its rows.
+
+For example::
+
+    python manage.py {{ cookiecutter.app_name }}_export <model> <model>.jsonl
+
+The table is read in primary key order with a query per chunk of rows, as named tuples rather
+than model instances, and written out as it's read, so memory use doesn't grow with the table
+on any database.
+Progress is saved in ``<file>.checkpoint`` after each chunk, so running the same command again
+after an interruption carries on after the last chunk saved, dropping any rows written after it.
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from {{ cookiecutter.app_name }} import bulk_transfer
+from {{ cookiecutter.app_name }}.models import BULK_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Export every object of a {{ cookiecutter.app_name }} model to a CSV or JSON Lines file.
+    """
+
+    help = 'Export a {{ cookiecutter.app_name }} model to a CSV or JSON Lines file, resuming from its checkpoint.'
+
+    def add_arguments(self, parser):
+        """
+        Add the command's arguments.
+        """
+        parser.add_argument('model', help='the name of the model')
+        parser.add_argument('path', help='the file to write, or - for standard output')
+        parser.add_argument('--format', choices=bulk_transfer.FORMATS, help="the file's format, if not its extension")
+        parser.add_argument('--chunk-size', type=int, default=BULK_BATCH_SIZE, help='rows per fetch')
+        parser.add_argument(
+            '--checkpoint', help='where to save the progress made (default: <path>.checkpoint, or none for output)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Export the model.
+        """
+        try:
+            model = bulk_transfer.get_model(options['model'])
+            format_name = bulk_transfer.file_format(options['path'], options['format'])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+        to_stdout = options['path'] == '-'
+        checkpoint_path = options['checkpoint'] or (None if to_stdout else options['path'] + '.checkpoint')
+        checkpoint = bulk_transfer.Checkpoint(checkpoint_path)
+        if not to_stdout and not os.path.exists(options['path']):
+            # The rows written before the checkpoint are gone, so start again from the beginning.
+            checkpoint.clear()
+        resuming = checkpoint.get('last_pk') is not None
+        if to_stdout:
+            output = self.stdout
+        elif resuming:
+            output = open(options['path'], 'r+', newline='', encoding='utf-8')
+            output.seek(checkpoint.get('offset'))
+            output.truncate()
+        else:
+            output = open(options['path'], 'w', newline='', encoding='utf-8')
+        progress = bulk_transfer.Progress(self.stderr.write, 'Exported', done=checkpoint.get('rows', 0))
+        try:
+            fields = model.objects.all().row._fields
+            writer = bulk_transfer.RecordWriter(output, format_name, fields, header=not resuming)
+            bulk_transfer.export_rows(model, writer, checkpoint, progress, options['chunk_size'])
+        finally:
+            if not to_stdout:
+                output.close()
+        checkpoint.clear()
+        progress.report()
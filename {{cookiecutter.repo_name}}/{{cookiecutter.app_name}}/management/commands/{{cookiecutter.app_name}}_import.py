@@ -0,0 +1,66 @@
+"""
+Import objects of a {{ cookiecutter.app_name }} model from a CSV or JSON Lines file, in bulk and in batches.
+
+For example::
+
+    python manage.py {{ cookiecutter.app_name }}_import <model> <model>.csv
+
+The file is read a batch at a time, however large it is, and each batch inserted with one bulk
+insert in a transaction of its own.  Progress is saved in ``<file>.checkpoint`` after each batch,
+so running the same command again after an interruption carries on from the last batch saved;
+the checkpoint is deleted once the whole file has been imported.
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from {{ cookiecutter.app_name }} import bulk_transfer
+from {{ cookiecutter.app_name }}.models import BULK_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Import objects of a {{ cookiecutter.app_name }} model from a CSV or JSON Lines file.
+    """
+
+    help = 'Import a {{ cookiecutter.app_name }} model from a CSV or JSON Lines file, resuming from its checkpoint.'
+
+    def add_arguments(self, parser):
+        """
+        Add the command's arguments.
+        """
+        parser.add_argument('model', help='the name of the model')
+        parser.add_argument('path', help='the file to import, or - for standard input')
+        parser.add_argument('--format', choices=bulk_transfer.FORMATS, help="the file's format, if not its extension")
+        parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE, help='objects per insert')
+        parser.add_argument(
+            '--checkpoint', help='where to save the progress made (default: <path>.checkpoint, or none for input)'
+        )
+
+    def handle(self, *args, **options):
+        """
+        Import the file.
+        """
+        try:
+            model = bulk_transfer.get_model(options['model'])
+            format_name = bulk_transfer.file_format(options['path'], options['format'])
+        except (LookupError, ValueError) as error:
+            raise CommandError(error) from error
+        from_stdin = options['path'] == '-'
+        checkpoint_path = options['checkpoint'] or (None if from_stdin else options['path'] + '.checkpoint')
+        checkpoint = bulk_transfer.Checkpoint(checkpoint_path)
+        progress = bulk_transfer.Progress(self.stderr.write, 'Imported', done=checkpoint.get('records', 0))
+        lines = sys.stdin if from_stdin else open(options['path'], newline='', encoding='utf-8')
+        try:
+            records = bulk_transfer.read_records(lines, format_name)
+            bulk_transfer.import_records(model, records, checkpoint, progress, options['batch_size'])
+        except ValueError as error:
+            raise CommandError('{}; the first {} records were imported'.format(
+                error, checkpoint.get('records', 0))) from error
+        finally:
+            if not from_stdin:
+                lines.close()
+        bulk_transfer.reset_sequences(model)
+        checkpoint.clear()
+        progress.report()
@@ -0,0 +1,51 @@
+"""
+Rebuild the daily summaries of {{ cookiecutter.app_name }} models from their tables.
+
+For example, after a bulk import, or to repair the summaries from a day on::
+
+    python manage.py {{ cookiecutter.app_name }}_rebuild_summaries
+    python manage.py {{ cookiecutter.app_name }}_rebuild_summaries <model> --since 2020-01-31
+
+Each model's summaries are replaced in one transaction, with those computed by a query grouping
+its table by day.
+"""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from {{ cookiecutter.app_name }} import summaries
+
+
+def date(value):
+    """
+    Parse a date argument in YYYY-MM-DD format.
+    """
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the daily summaries of {{ cookiecutter.app_name }} models from their tables.
+    """
+
+    help = 'Rebuild the daily summaries of {{ cookiecutter.app_name }} models from their tables.'
+
+    def add_arguments(self, parser):
+        """
+        Add the command's arguments.
+        """
+        parser.add_argument('models', nargs='*', help='the names of the models to rebuild (default: all of them)')
+        parser.add_argument('--since', type=date, help='rebuild only the summaries of this day (YYYY-MM-DD) and after')
+
+    def handle(self, *args, **options):
+        """
+        Rebuild the summaries.
+        """
+        models = {model.__name__.lower(): model for model in summaries.DAILY_SUMMARIES}
+        unknown = [name for name in options['models'] if name.lower() not in models]
+        if unknown:
+            raise CommandError('No daily summaries of {}'.format(', '.join(unknown)))
+        for model in [models[name.lower()] for name in options['models']] or list(models.values()):
+            days = summaries.rebuild(model, options['since'])
+            self.stdout.write('Summarized {} days of {}'.format(days, model.__name__))
@@ -0,0 +1,95 @@
+{#- The same models and fields as in models.py. #}
+{%- set models = [] %}
+{%- set fields = {} %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if cookiecutter.models != "Comma-separated list of models" %}
+{%- if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- set _ = fields.update({item.split(':')[0]: []}) %}
+{%- endif %}
+{%- if '=' in item.split(':')[-1] %}
+{%- set spec = item.split(':')[-1].split('=') %}
+{%- set _ = fields[models[-1]].append({'name': spec[0], 'type': spec[1].split('!')[0], 'index': spec[1].endswith('!idx')}) %}
+{%- endif %}
+{%- endfor %}
+{#- As makemigrations writes the fields of models.py, with their keyword arguments sorted. #}
+{%- set field_types = {
+    'bool': "models.BooleanField(default=False)",
+    'date': "models.DateField(blank=True, null=True)",
+    'datetime': "models.DateTimeField(blank=True, null=True)",
+    'float': "models.FloatField(default=0.0)",
+    'int': "models.IntegerField(default=0)",
+    'str': "models.CharField(default='', max_length=255)",
+    'text': "models.TextField(default='')",
+} %}
+{%- set sum_types = {
+    'float': "models.FloatField(default=0.0)",
+    'int': "models.BigIntegerField(default=0)",
+} %}
+{%- macro index_name(model, fields) -%}
+{#- The same as in models.py. -#}
+{%- set table = cookiecutter.app_name.lower() ~ '_' ~ model.lower() %}
+{%- set digest = [0] %}
+{%- for char in table ~ '.' ~ fields|join('.') %}
+{%- set _ = digest.append((digest[-1] * 41 + '_.0123456789abcdefghijklmnopqrstuvwxyz'.index(char) + 1) % 16777213) %}
+{%- endfor %}
+{%- set name = table[:11] ~ '_' ~ fields[0][:7] ~ '_' ~ '%06x'|format(digest[-1]) ~ '_idx' %}
+{{- 'D' ~ name[1:] if name.startswith('_') else name }}
+{%- endmacro -%}
+# Generated for the models option of cookiecutter-django-app; add later changes with makemigrations.
+
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+{%- for model in models %}
+        migrations.CreateModel(
+            name='{{ model }}',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+{%- for field in fields[model] %}
+                ('{{ field.name }}', {{ field_types[field.type] }}),
+{%- endfor %}
+            ],
+        ),
+{%- if cookiecutter.daily_summaries == "yes" %}
+        migrations.CreateModel(
+            name='{{ model }}DailySummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('count', models.IntegerField(default=0)),
+{%- for field in fields[model] if field.type in sum_types %}
+                ('{{ field.name }}_sum', {{ sum_types[field.type] }}),
+{%- endfor %}
+            ],
+        ),
+{%- endif %}
+{%- endfor %}
+{%- for model in models %}
+        migrations.AddIndex(
+            model_name='{{ model.lower() }}',
+            index=models.Index(fields=['created', 'id'], name='{{ index_name(model, ['created', 'id']) }}'),
+        ),
+        migrations.AddIndex(
+            model_name='{{ model.lower() }}',
+            index=models.Index(fields=['modified'], name='{{ index_name(model, ['modified']) }}'),
+        ),
+{%- for field in fields[model] if field.index %}
+        migrations.AddIndex(
+            model_name='{{ model.lower() }}',
+            index=models.Index(fields=['{{ field.name }}'], name='{{ index_name(model, [field.name]) }}'),
+        ),
+{%- endfor %}
+{%- endfor %}
+    ]
@@ -1,13 +1,226 @@
-"""
-Database models for {{cookiecutter.app_name}}.
-"""
-{%- if cookiecutter.models != "Comma-separated list of models" %}
-# from django.db import models
-from model_utils.models import TimeStampedModel
-{%- for model in cookiecutter.models.replace(' ', '').split(',') %}
+{#- Each item of the models option is a model, a model and its first field after a colon, or another
+    field of the last model: "ChocolateChip:name=str!idx,price=int,Scoop"; see hooks/pre_gen_project.py. #}
+{%- set models = [] %}
+{%- set fields = {} %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if cookiecutter.models != "Comma-separated list of models" %}
+{%- if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- set _ = fields.update({item.split(':')[0]: []}) %}
+{%- endif %}
+{%- if '=' in item.split(':')[-1] %}
+{%- set spec = item.split(':')[-1].split('=') %}
+{%- set _ = fields[models[-1]].append({'name': spec[0], 'type': spec[1].split('!')[0], 'index': spec[1].endswith('!idx')}) %}
+{%- endif %}
+{%- endfor %}
+{#- The definition of a field of each type; the initial migration has the same fields. #}
+{%- set field_types = {
+    'bool': "models.BooleanField(default=False)",
+    'date': "models.DateField(null=True, blank=True)",
+    'datetime': "models.DateTimeField(null=True, blank=True)",
+    'float': "models.FloatField(default=0.0)",
+    'int': "models.IntegerField(default=0)",
+    'str': "models.CharField(max_length=255, default='')",
+    'text': "models.TextField(default='')",
+} %}
+{#- The fields which daily summary models total, as the Django fields which hold their totals. #}
+{%- set sum_types = {
+    'float': "models.FloatField(default=0.0)",
+    'int': "models.BigIntegerField(default=0)",
+} %}
+{%- set summaries = cookiecutter.daily_summaries == "yes" %}
+{#- Past this many models, each model gets a module of its own in a models package; see hooks/post_gen_project.py. #}
+{%- set split = models|length > cookiecutter.models_package_threshold|int %}
+{%- macro module_name(model) -%}
+{#- Words start at capitals, except within acronyms: HTTPLog becomes http_log. #}
+{%- for char in model %}
+{%- if char.isupper() and not loop.first and (model[loop.index0 - 1].islower() or model[loop.index0 + 1:][:1].islower()) %}_{% endif %}
+{{- char.lower() }}
+{%- endfor %}
+{%- endmacro %}
+{%- macro index_name(model, fields) -%}
+{#- Explicit, so that the initial migration can name them too.  Named as Django names indexes: at most 30
+    characters, with the start of the table and first field, and a hash of the table and all the fields
+    which keeps the name unique in the database however much the rest is cut short. -#}
+{%- set table = cookiecutter.app_name.lower() ~ '_' ~ model.lower() %}
+{%- set digest = [0] %}
+{%- for char in table ~ '.' ~ fields|join('.') %}
+{%- set _ = digest.append((digest[-1] * 41 + '_.0123456789abcdefghijklmnopqrstuvwxyz'.index(char) + 1) % 16777213) %}
+{%- endfor %}
+{%- set name = table[:11] ~ '_' ~ fields[0][:7] ~ '_' ~ '%06x'|format(digest[-1]) ~ '_idx' %}
+{#- Index names can't start with an underscore. -#}
+{{ 'D' ~ name[1:] if name.startswith('_') else name }}
+{%- endmacro %}
+{%- macro base_queryset() %}
+# The default number of rows written or read per query by the chunked operations below.
+BULK_BATCH_SIZE = 1000
 
 
-class {{ model.strip() }}(TimeStampedModel):
+class TimeStampedQuerySet(models.QuerySet):
+    """
+    Bulk write and scan operations for TimeStampedModel subclasses.
+    """
+
+    # The named tuple of every field of the model, which rows() gives by default; set by each model's query set.
+    row = None
+
+    def bulk_create_chunked(self, objs, batch_size=BULK_BATCH_SIZE):
+        """
+        Insert objects with one query per batch.
+
+        ``objs`` is consumed one batch at a time, so it can be a generator of any length.
+
+        Returns:
+            int: the number of objects created
+        """
+        objs = iter(objs)
+        created = 0
+        batch = list(islice(objs, batch_size))
+        while batch:
+            self.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+            batch = list(islice(objs, batch_size))
+        return created
+
+    def bulk_update_chunked(self, objs, fields, batch_size=BULK_BATCH_SIZE):
+        """
+        Save the given fields of objects with one query per batch.
+
+        Each object's ``modified`` timestamp is updated too, as ``save()`` would do.
+
+        Returns:
+            int: the number of objects updated
+        """
+        fields = list(fields)
+        if 'modified' not in fields:
+            fields.append('modified')
+        objs = iter(objs)
+        updated = 0
+        batch = list(islice(objs, batch_size))
+        while batch:
+            now = timezone.now()
+            for obj in batch:
+                obj.modified = now
+            self.bulk_update(batch, fields, batch_size=batch_size)
+            updated += len(batch)
+            batch = list(islice(objs, batch_size))
+        return updated
+
+    def stream(self, chunk_size=BULK_BATCH_SIZE):
+        """
+        Iterate over the objects without caching them, fetching ``chunk_size`` rows at a time.
+
+        Memory use is bounded on databases with server-side cursors (e.g. PostgreSQL); use
+        ``in_chunks()`` for the same guarantee on SQLite and MySQL.
+        """
+        return self.iterator(chunk_size=chunk_size)
+
+    def in_chunks(self, chunk_size=BULK_BATCH_SIZE):
+        """
+        Yield lists of at most ``chunk_size`` objects, in primary key order.
+
+        Each list is fetched with its own query which starts after the last primary key of
+        the previous list, so memory use is bounded on every database and each query costs
+        the same however far into the table it is.
+        """
+        queryset = self.order_by('pk')
+        chunk = list(queryset[:chunk_size])
+        while chunk:
+            yield chunk
+            chunk = list(queryset.filter(pk__gt=chunk[-1].pk)[:chunk_size])
+
+    def rows(self, row=None, chunk_size=BULK_BATCH_SIZE):
+        """
+        Iterate over the objects as read-only named tuples of their field values, instead of model instances.
+
+        ``row`` is the named tuple class, the model's ``row`` of every field by default; one of just
+        the fields which a read needs fetches only their columns.  Rows are built straight from the
+        fetched values, ``chunk_size`` at a time like ``stream()``, without the signals, state and
+        per-object ``__dict__`` of model instances, so they're quicker to make and a fraction of the size.
+        """
+        row = row or self.row
+        return map(row._make, self.values_list(*row._fields).iterator(chunk_size=chunk_size))
+
+    def created_between(self, start=None, end=None):
+        """
+        Filter to objects created at or after ``start`` and before ``end``; either bound may be omitted.
+        """
+        return self._time_window('created', start, end)
+
+    def modified_between(self, start=None, end=None):
+        """
+        Filter to objects modified at or after ``start`` and before ``end``; either bound may be omitted.
+        """
+        return self._time_window('modified', start, end)
+
+    def last_modified(self):
+        """
+        Get the latest ``modified`` timestamp of the objects, or None if there are none.
+
+        It's read from the end of the ``modified`` index, so it's cheap enough to key caches on.
+        """
+        return self.order_by('-modified').values_list('modified', flat=True).first()
+
+    def last_change(self):
+        """
+        Get the number of objects, their greatest primary key and their latest ``modified`` timestamp.
+
+        Any create, update or delete of the objects changes at least one of them, so they key
+        caches of the objects which are invalidated by deletions too, at the cost of counting them.
+        """
+        values = self.aggregate(
+            count=models.Count('pk'), last_pk=models.Max('pk'), last_modified=models.Max('modified'),
+        )
+        return values['count'], values['last_pk'], values['last_modified']
+
+    def recently_modified(self):
+        """
+        Order the objects from the most recently modified to the least.
+        """
+        return self.order_by('-modified', '-pk')
+
+    def _time_window(self, field, start, end):
+        """
+        Filter to a half-open time range of ``field``.
+        """
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(**{field + '__gte': start})
+        if end is not None:
+            queryset = queryset.filter(**{field + '__lt': end})
+        return queryset
+{%- endmacro %}
+{%- macro model_classes(model) %}
+{%- set row_fields = ['id', 'created', 'modified'] %}
+{%- set summed_fields = [] %}
+{%- for field in fields[model] %}
+{%- set _ = row_fields.append(field.name) %}
+{%- if field.type in sum_types %}
+{%- set _ = summed_fields.append(field) %}
+{%- endif %}
+{%- endfor %}
+
+# A read-only projection of every field of a {{ model }}, for {{ model }}.objects.rows().
+{#- Split the definition over several lines if it would be longer than 120 characters on one. #}
+{%- if (model ~ model ~ row_fields|join("', '"))|length > 91 %}
+{{ model }}Row = namedtuple('{{ model }}Row', [
+{%- for name in row_fields %}
+    '{{ name }}',
+{%- endfor %}
+])
+{%- else %}
+{{ model }}Row = namedtuple('{{ model }}Row', ['{{ row_fields|join("', '") }}'])
+{%- endif %}
+
+
+class {{ model }}QuerySet(TimeStampedQuerySet):
+    """
+    Queries of {{ model }} objects.
+    """
+
+    row = {{ model }}Row
+
+
+class {{ model }}(TimeStampedModel):
     """
     TODO: replace with a brief description of the model.
 
@@ -15,14 +228,164 @@ class {{ model.strip() }}(TimeStampedModel):
     information, see OEP-30:
     https://open-edx-proposals.readthedocs.io/en/latest/oep-0030-arch-pii-markup-and-auditing.html
     """
-
+{% for field in fields[model] %}
+    {{ field.name }} = {{ field_types[field.type] }}
+{%- else %}
     # TODO: add field definitions
+{%- endfor %}
+
+    objects = {{ model }}QuerySet.as_manager()
+
+    class Meta:
+        """
+        Options for the {{ model }} model.
+        """
+
+        indexes = [
+            models.Index(fields=['created', 'id'], name='{{ index_name(model, ['created', 'id']) }}'),
+            models.Index(fields=['modified'], name='{{ index_name(model, ['modified']) }}'),
+{%- for field in fields[model] if field.index %}
+            models.Index(fields=['{{ field.name }}'], name='{{ index_name(model, [field.name]) }}'),
+{%- endfor %}
+        ]
 
     def __str__(self):
         """
         Get a string representation of this model instance.
         """
         # TODO: return a string appropriate for the data fields
-        return '<{{ model.strip() }}, ID: {}>'.format(self.id)
-{%- endfor -%}
+        return '<{{ model }}, ID: {}>'.format(self.id)
+
+    def serialize(self):
+        """
+        Get a dict of the field values of this object, for encoding as JSON.
+
+        Written out field by field, so no fields are looked up for each object; add any new field here too.
+        """
+        return {
+            'id': self.id,
+            'created': self.created,
+            'modified': self.modified,
+{%- for field in fields[model] %}
+            '{{ field.name }}': self.{{ field.name }},
+{%- endfor %}
+        }
+{%- if summaries %}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Load an object from the database, remembering the values its daily summary counted it with.
+        """
+        instance = super().from_db(db, field_names, values)
+        counted_fields = {{ model }}DailySummary.counted_fields
+        instance.counted_values = {name: value for name, value in zip(field_names, values) if name in counted_fields}
+        return instance
+
+
+class {{ model }}DailySummary(models.Model):
+    """
+    The number of {{ model }} objects created each day{% if summed_fields %}, and the totals of their numeric fields{% endif %}.
+
+    Kept up to date as objects are saved and deleted by {{ cookiecutter.app_name }}.summaries, so that
+    dashboards needn't aggregate the whole {{ model }} table.
+
+    .. no_pii:
+    """
+
+    # The fields of {{ model }} which it counts objects by: when they were created, then those it totals.
+    counted_fields = ['created'{% for field in summed_fields %}, '{{ field.name }}'{% endfor %}]
+
+    date = models.DateField(unique=True)
+    count = models.IntegerField(default=0)
+{%- for field in summed_fields %}
+    {{ field.name }}_sum = {{ sum_types[field.type] }}
+{%- endfor %}
+
+    def __str__(self):
+        """
+        Get a string representation of this summary.
+        """
+        return '<{{ model }}DailySummary, date: {}>'.format(self.date)
+{%- endif %}
+{%- endmacro %}
+{%- if split %}
+{%- set modules = [] %}
+{%- for model in models %}
+{%- set _ = modules.append(module_name(model) ~ ' ' ~ model) %}
+{%- endfor %}
+# file: models/__init__.py
+"""
+Database models for {{cookiecutter.app_name}}.
+
+Each model is defined in a module of its own, and imported from there into this registry.
+"""
+{%- for module in (modules + ['base'])|sort %}
+{%- if module == 'base' %}
+from {{ cookiecutter.app_name }}.models.base import BULK_BATCH_SIZE, TimeStampedQuerySet
+{%- else %}
+{%- set name = module.split(' ') %}
+{%- set names = [name[1], name[1] ~ 'QuerySet', name[1] ~ 'Row'] %}
+{%- if summaries %}
+{%- set _ = names.insert(1, name[1] ~ 'DailySummary') %}
+{%- endif %}
+{%- set line = 'from ' ~ cookiecutter.app_name ~ '.models.' ~ name[0] ~ ' import ' ~ names|join(', ') %}
+{#- Wrapped as isort wraps lines longer than 120 characters. #}
+{%- if line|length > 120 %}
+from {{ cookiecutter.app_name }}.models.{{ name[0] }} import (
+{%- for imported in names %}
+    {{ imported }},
+{%- endfor %}
+)
+{%- else %}
+{{ line }}
+{%- endif %}
+{%- endif %}
+{%- endfor %}
+
+# Every model of the app, in the order of the models option.
+MODELS = [
+{%- for model in models %}
+    {{ model }},
+{%- endfor %}
+]
+# file: models/base.py
+"""
+The base query set of the {{cookiecutter.app_name}} models.
+"""
+from itertools import islice
+
+from django.db import models
+from django.utils import timezone
+{{ base_queryset() }}
+{%- for model in models %}
+# file: models/{{ module_name(model) }}.py
+"""
+The {{ model }} model.
+"""
+from collections import namedtuple
+
+from django.db import models
+from model_utils.models import TimeStampedModel
+
+from {{ cookiecutter.app_name }}.models.base import TimeStampedQuerySet
+{{- model_classes(model) }}
+{%- endfor %}
+{%- else -%}
+"""
+Database models for {{cookiecutter.app_name}}.
+"""
+{%- if models %}
+from collections import namedtuple
+from itertools import islice
+
+from django.db import models
+from django.utils import timezone
+from model_utils.models import TimeStampedModel
+{{ base_queryset() }}
+{%- for model in models %}
+{# Two blank lines after the code before, where the module has just one after its imports. #}
+{{- model_classes(model) }}
+{%- endfor %}
+{%- endif %}
 {%- endif %}
@@ -0,0 +1,95 @@
+"""
+Routing of {{ cookiecutter.app_name }} models between a primary database and its read replicas.
+
+Add ``'{{ cookiecutter.app_name }}.routers.ReadReplicaRouter'`` to ``DATABASE_ROUTERS``, and list the aliases of
+the replicas in ``{{ cookiecutter.app_name|upper }}_REPLICA_DATABASES``.  Reads of the app's models then go
+to a replica chosen at random, and writes to the primary, ``{{ cookiecutter.app_name|upper }}_PRIMARY_DATABASE``
+(``default`` unless set), which is also the only database the app's migrations run on.  Models of
+other apps are left to the other routers.
+
+Replicas lag behind the primary, so once a thread writes to one of the models, its reads of them
+go to the primary too until the end of the request, and it reads its own writes.  Threads which
+work outside requests, like those of task queues, should call ``unpin()`` before each unit of work.
+Under ASGI the pin belongs to the request's coroutine rather than the thread, since
+``sync_to_async()`` runs the code of concurrent requests in the same thread.
+"""
+
+import random
+
+from asgiref.local import Local
+from django.conf import settings
+
+# Local to each thread, or to each coroutine and the code it runs with sync_to_async().
+_local = Local()
+
+
+def pinned():
+    """
+    Tell whether the current thread's reads go to the primary database, because it has written to it.
+    """
+    return getattr(_local, 'pinned', False)
+
+
+def pin():
+    """
+    Send the current thread's reads to the primary database, until the request ends or the thread is unpinned.
+    """
+    _local.pinned = True
+
+
+def unpin(**kwargs):  # pylint: disable=unused-argument
+    """
+    Let the current thread read from the replicas again; connected to the request_started and request_finished signals.
+    """
+    _local.pinned = False
+
+
+class ReadReplicaRouter:
+    """
+    Send reads of {{ cookiecutter.app_name }} models to a read replica, and writes to the primary database.
+
+    Django asks for the database of a write before making it, including the reads made for
+    ``get_or_create()`` and ``select_for_update()``, so those pin the thread to the primary too.
+    """
+
+    def __init__(self):
+        """
+        Read the databases to route to from the settings.
+        """
+        self.primary = getattr(settings, '{{ cookiecutter.app_name|upper }}_PRIMARY_DATABASE', 'default')
+        self.replicas = list(getattr(settings, '{{ cookiecutter.app_name|upper }}_REPLICA_DATABASES', []))
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        """
+        Choose a replica to read the model from, or the primary if there are none or the thread is pinned to it.
+        """
+        if model._meta.app_label != '{{ cookiecutter.app_name }}':
+            return None
+        if pinned() or not self.replicas:
+            return self.primary
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        """
+        Write the model to the primary, and pin the thread's reads to it for the rest of the request.
+        """
+        if model._meta.app_label != '{{ cookiecutter.app_name }}':
+            return None
+        pin()
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        """
+        Allow relations between the app's objects wherever they were read from, since every database has the same rows.
+        """
+        if obj1._meta.app_label == obj2._meta.app_label == '{{ cookiecutter.app_name }}':
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        """
+        Migrate the app's models on the primary only, since the replicas get its tables by replication.
+        """
+        if app_label != '{{ cookiecutter.app_name }}':
+            return None
+        return db == self.primary
@@ -0,0 +1,196 @@
+"""
+Daily summaries of {{ cookiecutter.app_name }} models, kept up to date as objects are saved and deleted.
+
+Each model has a summary model with a row per day objects were created on, holding how many
+there are and the totals of their numeric fields, so that dashboards can read a row per day
+instead of grouping the whole table.  Saving or deleting an object adds the difference it made
+to the summary of its day once the surrounding transaction commits, with one update, so rolled
+back writes never count.  An object's day is the date it was created on, in the current time
+zone as for ``TruncDate``.
+
+Bulk writes like ``bulk_create()``, ``QuerySet.update()``, the write buffer, and the import
+command don't send the model signals, so they aren't counted; run the
+``{{ cookiecutter.app_name }}_rebuild_summaries`` command after them, or to repair the summaries.
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{%- set names = [] %}
+{%- for model in models %}
+{%- set _ = names.extend([model, model ~ 'DailySummary']) %}
+{%- endfor %}
+{%- set names = ['BULK_BATCH_SIZE'] + names|sort %}
+{#- The import of them, wrapped as isort wraps lines longer than 120 characters. #}
+{%- set line = 'from ' ~ cookiecutter.app_name ~ '.models import ' ~ names|join(', ') %}
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+{% if line|length > 120 %}
+from {{ cookiecutter.app_name }}.models import (
+{%- for name in names %}
+    {{ name }},
+{%- endfor %}
+)
+{%- else %}
+{{ line }}
+{%- endif %}
+
+# The summary model of each model.
+DAILY_SUMMARIES = {
+{%- for model in models %}
+    {{ model }}: {{ model }}DailySummary,
+{%- endfor %}
+}
+
+
+def summary_date(created):
+    """
+    Get the day an object created at the given time is summarized in.
+    """
+    return timezone.localdate(created) if settings.USE_TZ else created.date()
+
+
+def counted_values(instance, using):
+    """
+    Get the values of the counted fields which an object was last saved or loaded with, or None if they aren't known.
+
+    Values saved in a transaction on ``using`` count until it ends; if it's rolled back, the values
+    committed before it count again.
+    """
+    pending = getattr(instance, 'pending_counted_values', None)
+    # The callback which commits them is dropped from run_on_commit if the transaction or savepoint is rolled back.
+    if pending is not None and any(entry[1] is pending[1] for entry in connections[using].run_on_commit):
+        return pending[0]
+    values = getattr(instance, 'counted_values', None)
+    if values is None or len(values) < len(DAILY_SUMMARIES[type(instance)].counted_fields):
+        return None
+    return values
+
+
+def save_counted_values(instance, values, using):
+    """
+    Make ``values`` the values an object was counted with, once the current transaction on ``using`` commits.
+    """
+    def commit():
+        instance.counted_values = values
+        instance.pending_counted_values = None
+
+    instance.pending_counted_values = (values, commit)
+    transaction.on_commit(commit, using=using)
+
+
+def add_counts(changes, summary_model, values, sign):
+    """
+    Add an object's counted ``values`` to ``changes``, or subtract them if ``sign`` is -1.
+
+    ``changes`` is a dict of the changes to the count and totals of each day, as lists.
+    """
+    day = changes.setdefault(summary_date(values['created']), [0] * len(summary_model.counted_fields))
+    day[0] += sign
+    for index, name in enumerate(summary_model.counted_fields[1:], 1):
+        day[index] += sign * (values[name] or 0)
+
+
+def apply_changes(summary_model, changes):
+    """
+    Add the changes to the count and totals of each day to its summary, creating or deleting it as needed.
+    """
+    names = ['count'] + [name + '_sum' for name in summary_model.counted_fields[1:]]
+    with transaction.atomic(using=router.db_for_write(summary_model)):
+        for day, amounts in sorted(changes.items()):
+            updates = {name: F(name) + amount for name, amount in zip(names, amounts)}
+            if summary_model.objects.filter(date=day).update(**updates):
+                if amounts[0] < 0:
+                    summary_model.objects.filter(date=day, count=0).delete()
+                continue
+            try:
+                with transaction.atomic(using=router.db_for_write(summary_model)):
+                    summary_model.objects.create(date=day, **dict(zip(names, amounts)))
+            except IntegrityError:
+                # Another transaction created the day's summary since the update above.
+                summary_model.objects.filter(date=day).update(**updates)
+
+
+def count_changes(summary_model, changes, using):
+    """
+    Apply the changes to the summaries once the current transaction on ``using`` commits, if there are any.
+    """
+    changes = {day: amounts for day, amounts in changes.items() if any(amounts)}
+    if changes:
+        transaction.on_commit(lambda: apply_changes(summary_model, changes), using=using)
+
+
+def load_counted_values(sender, instance, raw=False, using=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Read the values an object with a primary key was counted with from the database, if it wasn't loaded from there.
+
+    Objects made with the primary key of an existing row update it, so they're looked up too.
+    """
+    if instance.pk is not None and counted_values(instance, using) is None:
+        fields = DAILY_SUMMARIES[sender].counted_fields
+        instance.counted_values = sender.objects.using(using).filter(pk=instance.pk).values(*fields).first()
+
+
+def count_saved(sender, instance, created, using, **kwargs):  # pylint: disable=unused-argument
+    """
+    Move a saved object's counts from the values it was counted with before to its new values.
+    """
+    summary_model = DAILY_SUMMARIES[sender]
+    changes = {}
+    before = None if created else counted_values(instance, using)
+    if before is not None:
+        add_counts(changes, summary_model, before, -1)
+    values = {name: getattr(instance, name) for name in summary_model.counted_fields}
+    add_counts(changes, summary_model, values, 1)
+    count_changes(summary_model, changes, using)
+    save_counted_values(instance, values, using)
+
+
+def count_deleted(sender, instance, using, **kwargs):  # pylint: disable=unused-argument
+    """
+    Subtract a deleted object from the summary of its day.
+    """
+    summary_model = DAILY_SUMMARIES[sender]
+    values = counted_values(instance, using) or {name: getattr(instance, name) for name in summary_model.counted_fields}
+    changes = {}
+    add_counts(changes, summary_model, values, -1)
+    count_changes(summary_model, changes, using)
+
+
+def full_scan(model, since=None):
+    """
+    Compute the daily summaries of ``model`` from scratch, as unsaved objects in date order.
+
+    One query groups the model's whole table by day, or just the objects created from the day
+    ``since`` on.
+    """
+    summary_model = DAILY_SUMMARIES[model]
+    queryset = model.objects.all()
+    if since is not None:
+        queryset = queryset.filter(created__date__gte=since)
+    totals = {'summary_count': Count('pk')}
+    totals.update({'summary_' + name: Sum(name) for name in summary_model.counted_fields[1:]})
+    days = queryset.annotate(summary_date=TruncDate('created')).values('summary_date').annotate(**totals)
+    for day in days.order_by('summary_date'):
+        sums = {name + '_sum': day['summary_' + name] or 0 for name in summary_model.counted_fields[1:]}
+        yield summary_model(date=day['summary_date'], count=day['summary_count'], **sums)
+
+
+def rebuild(model, since=None):
+    """
+    Replace the daily summaries of ``model``, or those from the day ``since`` on, with a full scan of its objects.
+
+    Returns:
+        int: the number of days summarized
+    """
+    summary_model = DAILY_SUMMARIES[model]
+    with transaction.atomic(using=router.db_for_write(summary_model)):
+        summaries = summary_model.objects.all()
+        if since is not None:
+            summaries = summaries.filter(date__gte=since)
+        summaries.delete()
+        return len(summary_model.objects.bulk_create(full_scan(model, since), batch_size=BULK_BATCH_SIZE))
@@ -1,9 +1,70 @@
 """
 URLs for {{ cookiecutter.app_name }}.
 """
+{%- set has_models = cookiecutter.models != "Comma-separated list of models" %}
+{%- set api = has_models and cookiecutter.model_api == "yes" %}
+{%- set async_api = api and cookiecutter.async_views == "yes" %}
+{%- set models = [] %}
+{%- for item in cookiecutter.models.replace(' ', '').split(',') if '=' not in item.split(':')[0] %}
+{%- set _ = models.append(item.split(':')[0]) %}
+{%- endfor %}
+{%- if async_api %}
+import django
+{%- endif %}
 from django.conf.urls import url
 from django.views.generic import TemplateView
+{%- if has_models %}
+
+{% if api -%}
+from {{ cookiecutter.app_name }} import {% if async_api %}async_views, {% endif %}views
+{% endif -%}
+from {{ cookiecutter.app_name }}.models import {{ models|join(', ') }}
+
+# The longest time, in seconds, that index.html serves a model's section from the cache.  Sections
+# are keyed on their model's last change, so creates, updates and deletes all show at once.
+FRAGMENT_TIMEOUT = 300
+
+# The sections of index.html, one per model, each cached as a fragment.
+SECTIONS = [
+{%- for model in models %}
+    {'key': '{{ cookiecutter.app_name }}.{{ model.lower() }}', 'title': '{{ model }}', 'objects': {{ model }}.objects},
+{%- endfor %}
+]
+{%- endif %}
 
 urlpatterns = [
+{%- if api %}
+{%- for model in models %}
+    url(r'^api/{{ model.lower() }}/$', views.object_list, {'model': {{ model }}}, name='{{ model.lower() }}-list'),
+    url(
+        r'^api/{{ model.lower() }}/(?P<pk>\d+)/$', views.object_detail, {'model': {{ model }}},
+        name='{{ model.lower() }}-detail',
+    ),
+{%- endfor %}
+{%- endif %}
+{%- if has_models %}
+    url(r'', TemplateView.as_view(
+        template_name="{{ cookiecutter.app_name }}/index.html",
+        extra_context={'fragment_timeout': FRAGMENT_TIMEOUT, 'sections': SECTIONS},
+    )),
+{%- else %}
     url(r'', TemplateView.as_view(template_name="{{ cookiecutter.app_name }}/base.html")),
+{%- endif %}
 ]
+{%- if async_api %}
+
+# Django runs async views natively from version 3.1; earlier versions would call them like synchronous views.
+if django.VERSION >= (3, 1):
+    urlpatterns[:0] = [
+{%- for model in models %}
+        url(
+            r'^api/async/{{ model.lower() }}/$', async_views.object_list, {'model': {{ model }}},
+            name='{{ model.lower() }}-async-list',
+        ),
+        url(
+            r'^api/async/{{ model.lower() }}/(?P<pk>\d+)/$', async_views.object_detail, {'model': {{ model }}},
+            name='{{ model.lower() }}-async-detail',
+        ),
+{%- endfor %}
+    ]
+{%- endif %}
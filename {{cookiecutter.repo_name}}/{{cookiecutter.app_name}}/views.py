@@ -0,0 +1,156 @@
+"""
+Read-only JSON views of {{ cookiecutter.app_name }} models.
+
+List views page through objects in ``(created, id)`` order.  Each page ends with a cursor
+holding the position of its last object, and the next page is read from that position on
+using the index on those fields, instead of skipping an offset; so every page costs the same
+however far into the table it is.  Pages are streamed to the client as they are read from the
+database.  Both views answer conditional GET requests, with validators derived from the
+``modified`` timestamps of the objects.
+"""
+
+import hashlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max, Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+# The number of objects on a page when the request doesn't give a limit, and the largest limit allowed.
+PAGE_SIZE = getattr(settings, '{{ cookiecutter.app_name|upper }}_PAGE_SIZE', 100)
+MAX_PAGE_SIZE = getattr(settings, '{{ cookiecutter.app_name|upper }}_MAX_PAGE_SIZE', 1000)
+
+_encoder = DjangoJSONEncoder()
+
+
+def encode_cursor(instance):
+    """
+    Get the cursor of the page which follows ``instance``.
+    """
+    position = '{}|{}'.format(instance.created.isoformat(), instance.pk)
+    return urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Get the ``(created, pk)`` position held by a cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    created, pk = urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+    created = parse_datetime(created)
+    if created is None:
+        raise ValueError('Invalid cursor: {}'.format(cursor))
+    return created, int(pk)
+
+
+def conditional(request, etag, last_modified, get_response):
+    """
+    Answer a possibly conditional GET request.
+
+    Returns a 304 (or 412) response if the request's preconditions say so, or else the
+    response of ``get_response()`` with ``ETag`` and ``Last-Modified`` headers.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = get_response()
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def stream_page(queryset, limit):
+    """
+    Yield the JSON of a page of at most ``limit`` objects, followed by the cursor of the next page.
+
+    The cursor is null on the last page.
+    """
+    instances = queryset[:limit + 1].iterator()
+    last = None
+    yield '{"results": ['
+    for index, instance in enumerate(islice(instances, limit)):
+        yield (', ' if index else '') + _encoder.encode(instance.serialize())
+        last = instance
+    following = next(instances, None)
+    yield '], "next": {}}}'.format(_encoder.encode(encode_cursor(last) if following else None))
+
+
+def page_start(request, model):
+    """
+    Get the objects of ``model`` from the start of the page which a list request asks for, and the page size.
+
+    Raises:
+        ValueError: if the cursor or limit is invalid, with a message for the client
+    """
+    queryset = model.objects.order_by('created', 'pk')
+    try:
+        limit = int(request.GET.get('limit', PAGE_SIZE))
+        if request.GET.get('cursor'):
+            created, pk = decode_cursor(request.GET['cursor'])
+            queryset = queryset.filter(created__gte=created).filter(Q(created__gt=created) | Q(pk__gt=pk))
+    except ValueError as error:
+        raise ValueError('Invalid cursor or limit.') from error
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError('The limit must be from 1 to {}.'.format(MAX_PAGE_SIZE))
+    return queryset, limit
+
+
+def page_validators(queryset, limit):
+    """
+    Get the ``ETag`` and last modified time of the page of ``limit`` objects from the start of ``queryset``.
+    """
+    # A page changes when an object on it is saved, deleted, or replaced by another, or when an
+    # object is added after a full last page, which gives it a next cursor.  So the state includes
+    # the object after the page, if there is one, and a count which says whether there is.
+    state = queryset[:limit + 1].aggregate(
+        count=Count('pk'), last_created=Max('created'), last_pk=Max('pk'), last_modified=Max('modified'),
+    )
+    digest = hashlib.md5(_encoder.encode(sorted(state.items())).encode('utf-8')).hexdigest()
+    return quote_etag(digest), state['last_modified']
+
+
+def detail_validators(instance):
+    """
+    Get the ``ETag`` and last modified time of an object.
+    """
+    return quote_etag('{}.{}'.format(instance.pk, instance.modified.timestamp())), instance.modified
+
+
+@require_safe
+def object_list(request, model):
+    """
+    List the objects of ``model``, one page at a time.
+
+    Query parameters:
+        cursor: the ``next`` cursor of the previous page; omitted for the first page
+        limit: the number of objects per page, from 1 to MAX_PAGE_SIZE
+    """
+    try:
+        queryset, limit = page_start(request, model)
+    except ValueError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+    etag, last_modified = page_validators(queryset, limit)
+    return conditional(
+        request, etag, last_modified,
+        lambda: StreamingHttpResponse(stream_page(queryset, limit), content_type='application/json'),
+    )
+
+
+@require_safe
+def object_detail(request, model, pk):
+    """
+    Get the object of ``model`` with primary key ``pk``.
+    """
+    instance = get_object_or_404(model, pk=pk)
+    etag, last_modified = detail_validators(instance)
+    return conditional(request, etag, last_modified, lambda: JsonResponse(instance.serialize()))
@@ -0,0 +1,189 @@
+"""
+Request-scoped coalescing of writes to {{ cookiecutter.app_name }} models.
+
+Code which saves many objects during a request can pass them to ``buffered_save()`` instead of
+calling ``save()``.  Within a ``WriteBuffer``, which ``WriteBufferMiddleware`` opens around each
+request, that only records the object; ``flush()`` then writes every object recorded in one
+transaction, with a bulk insert per model and a bulk update per model and set of fields saved,
+however many times each object was saved.  Outside a buffer, ``buffered_save()`` just saves.
+
+New objects get their ``created`` and ``modified`` timestamps as ``save()`` would give them,
+and updated objects get the time of the flush as their ``modified`` timestamp.  Queries don't
+see buffered writes until they are flushed, so call ``flush()`` before reading them back.  Bulk
+writes don't send the ``pre_save`` and ``post_save`` signals or call ``save()`` methods, and new
+objects only get primary keys on databases which return them from bulk inserts, like PostgreSQL.
+Elsewhere, like on SQLite and MySQL, a new object can't be saved again in the same buffer once
+it has been flushed, since it would be inserted twice; read it back from the database to change it.
+{%- set cache = cookiecutter.model_cache == "yes" %}
+"""
+
+from collections import OrderedDict
+
+from asgiref.local import Local
+from django.db import transaction
+from model_utils.models import TimeStampedModel
+
+{% if cache -%}
+from {{ cookiecutter.app_name }}.cache import MODEL_CACHES, invalidate_instance
+{% endif -%}
+from {{ cookiecutter.app_name }}.models import BULK_BATCH_SIZE
+
+# Local to each thread, or to each coroutine and the code it runs with sync_to_async().
+_local = Local()
+
+
+def current_buffer():
+    """
+    Get the innermost open ``WriteBuffer`` of the current request, or None if there isn't one.
+    """
+    buffers = getattr(_local, 'buffers', None)
+    return buffers[-1] if buffers else None
+
+
+def buffered_save(obj, update_fields=None):
+    """
+    Save ``obj``, with only ``update_fields`` if given, in the current request's ``WriteBuffer`` if there is one.
+    """
+    buffer = current_buffer()
+    if buffer is None:
+        obj.save(update_fields=update_fields)
+    else:
+        buffer.save(obj, update_fields)
+
+
+class WriteBuffer:
+    """
+    Creates and updates of TimeStampedModel objects, to be written together by ``flush()``.
+
+    As a context manager, it is the current buffer of the request within the with-statement,
+    and is flushed at the end of it, unless an exception is raised; then its writes are discarded.
+    """
+
+    def __init__(self, batch_size=BULK_BATCH_SIZE):
+        """
+        Start with no writes, to be made ``batch_size`` objects per query.
+        """
+        self.batch_size = batch_size
+        # New objects, keyed by model and then by id().
+        self._creates = OrderedDict()
+        # Objects to update and the names of the fields to save, keyed by model and then by primary key.
+        self._updates = OrderedDict()
+        # Objects inserted by earlier flushes without getting primary keys, keyed by id().
+        self._inserted = {}
+
+    def __enter__(self):
+        """
+        Make this the current buffer of the request.
+        """
+        # Replaced rather than appended to, since coroutines started within the buffer share the list.
+        _local.buffers = getattr(_local, 'buffers', []) + [self]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Flush the buffer, or discard it if an exception was raised, and restore the previous buffer.
+        """
+        _local.buffers = [buffer for buffer in _local.buffers if buffer is not self]
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+        return False
+
+    def __len__(self):
+        """
+        Get the number of objects waiting to be written.
+        """
+        return sum(len(objs) for objs in self._creates.values()) + sum(len(rows) for rows in self._updates.values())
+
+    def save(self, obj, update_fields=None):
+        """
+        Record that ``obj`` is to be created if it has no primary key, or else updated.
+
+        Only ``update_fields`` are updated if given, combined with those of any earlier saves of
+        the object; if different instances of one row are saved, the last one's values are written.
+
+        Raises:
+            TypeError: if ``obj`` isn't a TimeStampedModel of this app, whose querysets make the bulk writes
+            ValueError: if ``obj`` was inserted by an earlier flush, but didn't get a primary key
+        """
+        if not isinstance(obj, TimeStampedModel) or obj._meta.app_label != '{{ cookiecutter.app_name }}':
+            raise TypeError(
+                'Only timestamped {{ cookiecutter.app_name }} models can be buffered, not {!r}'.format(obj)
+            )
+        if id(obj) in self._inserted:
+            raise ValueError(
+                '{!r} was inserted without getting a primary key; read it back to save it again'.format(obj)
+            )
+        model = type(obj)
+        if obj.pk is None:
+            self._creates.setdefault(model, OrderedDict())[id(obj)] = obj
+            return
+        if update_fields is None:
+            update_fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+        rows = self._updates.setdefault(model, OrderedDict())
+        _, fields = rows.get(obj.pk, (obj, set()))
+        rows[obj.pk] = (obj, fields | set(update_fields))
+
+    def discard(self):
+        """
+        Forget every write recorded, without making it.
+        """
+        self._creates = OrderedDict()
+        self._updates = OrderedDict()
+
+    def flush(self):
+        """
+        Make every write recorded, in one transaction, and forget them.
+
+        Returns:
+            int: the number of objects written
+        """
+        creates, updates = self._creates, self._updates
+        self.discard()
+        written = 0
+        with transaction.atomic():
+            for model, objs in creates.items():
+                written += model.objects.bulk_create_chunked(objs.values(), batch_size=self.batch_size)
+            for model, rows in updates.items():
+                by_fields = OrderedDict()
+                for obj, fields in rows.values():
+                    by_fields.setdefault(tuple(sorted(fields)), []).append(obj)
+                for fields, objs in by_fields.items():
+                    written += model.objects.bulk_update_chunked(objs, fields, batch_size=self.batch_size)
+{%- if cache %}
+                # Bulk updates don't send post_save, which keeps the model caches up to date.
+                if model in MODEL_CACHES:
+                    for obj, _ in rows.values():
+                        invalidate_instance(model, obj)
+{%- endif %}
+        for objs in creates.values():
+            self._inserted.update((key, obj) for key, obj in objs.items() if obj.pk is None)
+        return written
+
+
+class WriteBufferMiddleware:
+    """
+    Buffer the writes made with ``buffered_save()`` during each request, and make them at its end.
+
+    Add ``'{{ cookiecutter.app_name }}.write_buffer.WriteBufferMiddleware'`` to ``MIDDLEWARE``; the
+    buffer of a request is its ``write_buffer`` attribute.  Like ``ATOMIC_REQUESTS``, the writes
+    of a request answered with a server error are discarded.
+    """
+
+    def __init__(self, get_response):
+        """
+        Wrap the next middleware or view.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Answer a request within a write buffer.
+        """
+        with WriteBuffer() as buffer:
+            request.write_buffer = buffer
+            response = self.get_response(request)
+            if response.status_code >= 500:
+                buffer.discard()
+        return response